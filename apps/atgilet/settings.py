@@ -54,6 +54,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    "siteconfig.middleware.MaintenanceModeMiddleware",
+    "siteconfig.middleware.ContextUsageMiddleware",
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
     "siteconfig.middleware.ForceDefaultLanguageMiddleware",
@@ -160,3 +162,22 @@ MEDIA_ROOT = BASE_DIR / "media"
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Дисковый кеш страниц FFCV (conditional GET) для parse_ffcv_results
+FFCV_CACHE_DIR = BASE_DIR / "var" / "ffcv_cache"
+
+# id_temp FFCV -> год начала сезона (2025 = сезон 2025-2026), для дат календаря без года.
+# Если id_temp здесь нет — год берём из CompetitionContext.season_name, иначе считаем сезон текущим.
+FFCV_SEASON_YEARS = {}
+
+# Архив сырых страниц FFCV (по sha256 содержимого) для reparse_ffcv_archive
+FFCV_ARCHIVE_DIR = BASE_DIR / "var" / "ffcv_archive"
+
+# Общий для всех воркеров кеш (меню, настройки сайта). Файловый — без внешних сервисов;
+# при переезде на Redis/Memcached меняется только BACKEND/LOCATION.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR / "var" / "django_cache",
+    }
+}
@@ -11,9 +11,8 @@ def front_router(request):
     Если режим разработчика выключен, всем показываем основной сайт.
     """
 
-    settings = SettingsConfig.objects.first()
-    # если настроек нет — считаем, что сайт в разработке (как у тебя было)
-    maintenance = settings.maintenance_mode if settings else True
+    # из кеша; обычно сюда не доходит — раньше отвечает MaintenanceModeMiddleware
+    maintenance = SettingsConfig.maintenance_enabled()
 
     user = request.user
     is_admin = user.is_authenticated and user.is_staff
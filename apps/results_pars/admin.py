@@ -1,23 +1,41 @@
 # apps/results_pars/admin.py
 from django.contrib import admin
+from django.utils.html import format_html_join
+from django.utils.safestring import mark_safe
+
 from .models import (
-    TargetConfig, Team, CompetitionContext, Round, Venue, Match,
-    StandingsSnapshot, StandingsRow, IngestionRun
+    TargetConfig, TargetTeam, Team, CompetitionContext, Round, Venue, Match,
+    StandingsSnapshot, StandingsRow, IngestionRun, ArchivedPage, BackfillCheckpoint, MatchChange,
+    TeamAlias,
 )
 
 
+class TargetTeamInline(admin.TabularInline):
+    model = TargetTeam
+    extra = 0
+
+
 @admin.register(TargetConfig)
 class TargetConfigAdmin(admin.ModelAdmin):
     list_display = ("is_active", "target_team_name", "target_ffcv_team_id", "poll_interval_minutes")
+    inlines = [TargetTeamInline]
     def has_add_permission(self, request):
         return not TargetConfig.objects.exists()
 
 
+class TeamAliasInline(admin.TabularInline):
+    model = TeamAlias
+    extra = 1
+    fields = ("name", "normalized")
+    readonly_fields = ("normalized",)
+
+
 @admin.register(Team)
 class TeamAdmin(admin.ModelAdmin):
     list_display = ("name", "ffcv_team_id", "is_target")
     list_filter = ("is_target",)
-    search_fields = ("name", "ffcv_team_id")
+    search_fields = ("name", "ffcv_team_id", "aliases__name")
+    inlines = [TeamAliasInline]
 
 
 @admin.register(CompetitionContext)
@@ -40,11 +58,32 @@ class VenueAdmin(admin.ModelAdmin):
     search_fields = ("name", "address")
 
 
+class MatchChangeInline(admin.TabularInline):
+    model = MatchChange
+    extra = 0
+    can_delete = False
+    fields = readonly_fields = ("changed_at", "kind", "source", "fields", "run")
+    ordering = ("-changed_at",)
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(Match)
 class MatchAdmin(admin.ModelAdmin):
     list_display = ("kickoff_at", "competition", "home_team", "away_team", "home_score", "away_score", "status", "is_target_match")
     list_filter = ("competition", "status", "is_target_match")
     search_fields = ("home_team__name", "away_team__name", "external_key")
+    readonly_fields = ("content_hash",)
+    inlines = [MatchChangeInline]
+
+
+@admin.register(MatchChange)
+class MatchChangeAdmin(admin.ModelAdmin):
+    list_display = ("changed_at", "match", "kind", "source", "fields", "run")
+    list_filter = ("kind", "source")
+    raw_id_fields = ("match", "run")
+    list_select_related = ("match__home_team", "match__away_team")
 
 
 class StandingsRowInline(admin.TabularInline):
@@ -61,8 +100,82 @@ class StandingsSnapshotAdmin(admin.ModelAdmin):
 
 @admin.register(IngestionRun)
 class IngestionRunAdmin(admin.ModelAdmin):
-    list_display = ("started_at", "finished_at", "status", "parsed_matches", "updated_matches")
-    readonly_fields = ("started_at", "finished_at", "status", "parsed_matches", "updated_matches", "errors")
+    list_display = (
+        "started_at", "finished_at", "target", "status", "parsed_matches", "updated_matches",
+        "skipped_matches", "changed_matches", "unchanged_matches",
+        "duration", "http_requests", "downloaded_kib", "fetch_ms", "wait_ms", "parse_ms", "db_ms",
+    )
+    list_filter = ("status", "target")
+    readonly_fields = (
+        "started_at", "finished_at", "target", "status", "parsed_matches", "updated_matches",
+        "skipped_matches", "changed_matches", "unchanged_matches",
+        "http_requests", "bytes_downloaded", "fetch_ms", "wait_ms", "parse_ms", "db_ms", "db_queries",
+        "archived_pages", "slowest_urls_table", "errors",
+    )
+    exclude = ("slowest_urls",)
+
+    # графики трендов над списком: последние N прогонов
+    TREND_RUNS = 60
+    TREND_WIDTH, TREND_HEIGHT = 240, 48
+    TRENDS = (
+        ("Duration, s", lambda r: r.duration.total_seconds() if r.duration else 0),
+        ("HTTP requests", lambda r: r.http_requests),
+        ("Downloaded, KiB", lambda r: r.bytes_downloaded / 1024),
+        ("Fetch, ms", lambda r: r.fetch_ms),
+        ("Wait, ms", lambda r: r.wait_ms),
+        ("Parse, ms", lambda r: r.parse_ms),
+        ("DB, ms", lambda r: r.db_ms),
+    )
 
     def has_add_permission(self, request):
         return False
+
+    @admin.display(description="KiB", ordering="bytes_downloaded")
+    def downloaded_kib(self, obj):
+        return round(obj.bytes_downloaded / 1024, 1)
+
+    @admin.display(description="Slowest URLs")
+    def slowest_urls_table(self, obj):
+        if not obj.slowest_urls:
+            return "-"
+        return format_html_join(
+            mark_safe("<br>"), "{} ms — {}", ((row["ms"], row["url"]) for row in obj.slowest_urls)
+        )
+
+    def changelist_view(self, request, extra_context=None):
+        extra_context = extra_context or {}
+        extra_context["trend_charts"] = self.trend_charts()
+        return super().changelist_view(request, extra_context=extra_context)
+
+    def trend_charts(self):
+        runs = list(IngestionRun.objects.exclude(finished_at=None).order_by("-started_at")[:self.TREND_RUNS])[::-1]
+        if len(runs) < 2:
+            return []
+
+        charts = []
+        step = self.TREND_WIDTH / (len(runs) - 1)
+        for title, value_of in self.TRENDS:
+            values = [float(value_of(r)) for r in runs]
+            top = max(values) or 1.0
+            points = " ".join(
+                f"{i * step:.1f},{self.TREND_HEIGHT - v / top * self.TREND_HEIGHT:.1f}" for i, v in enumerate(values)
+            )
+            charts.append({"title": title, "points": points, "last": round(values[-1], 1), "max": round(top, 1)})
+        return charts
+
+
+@admin.register(ArchivedPage)
+class ArchivedPageAdmin(admin.ModelAdmin):
+    list_display = ("fetched_at", "kind", "url", "run", "size", "body_sha256")
+    list_filter = ("kind",)
+    search_fields = ("url", "body_sha256")
+    raw_id_fields = ("run",)
+
+
+@admin.register(BackfillCheckpoint)
+class BackfillCheckpointAdmin(admin.ModelAdmin):
+    list_display = (
+        "team_ffcv_id", "ffcv_temp_id", "state", "next_row", "total_rows",
+        "written_matches", "skipped_matches", "requests_used", "updated_at",
+    )
+    list_filter = ("state",)
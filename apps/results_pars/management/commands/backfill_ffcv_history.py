@@ -0,0 +1,222 @@
+# apps/results_pars/management/commands/backfill_ffcv_history.py
+from datetime import timedelta
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from results_pars.models import BackfillCheckpoint, Match, TargetConfig
+from results_pars.services.calendar import season_label, season_year_for_temp
+from results_pars.services.ffcv_parser import FFCVParser
+from results_pars.services.match_writer import MatchWriter
+from results_pars.services.page_cache import CachePolicy, PageCache
+
+
+class BudgetExhausted(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfill past seasons (FFCV id_temp values) of the target team. Progress is checkpointed per season "
+        "in BackfillCheckpoint, so an interrupted or budget-limited run resumes where it stopped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("seasons", help='id_temp values: "18,19,20" or "15-20".')
+        parser.add_argument("--team", help="FFCV id of the target team (default: the first one).")
+        parser.add_argument(
+            "--url-template",
+            help="Team page for a season, with {team_id} and {temp_id} "
+                 "(default: TargetConfig.team_matches_url_template + &id_temp={temp_id}).",
+        )
+        parser.add_argument(
+            "--max-requests", type=int, default=300,
+            help=(
+                "HTTP request budget for this invocation: network attempts including retries, cache hits are "
+                "free. The run stops cleanly when it is spent."
+            ),
+        )
+        parser.add_argument(
+            "--rate", type=float, default=1.0,
+            help="Max requests per second per host; keep it low when the live poller is running.",
+        )
+        parser.add_argument("--workers", type=int, default=2, help="Max concurrent partido.php requests.")
+        parser.add_argument("--batch-size", type=int, default=20, help="Team page rows per checkpointed transaction.")
+        parser.add_argument(
+            "--cache-dir", default=getattr(settings, "FFCV_CACHE_DIR", None),
+            help="Page cache; historical pages are never revalidated, so resuming costs no repeat requests.",
+        )
+        parser.add_argument("--no-cache", action="store_true")
+        parser.add_argument("--restart", action="store_true", help="Forget checkpoints of these seasons first.")
+
+    def handle(self, *args, **options):
+        seasons = self.parse_seasons(options["seasons"])
+
+        cfg = TargetConfig.objects.first()
+        targets = cfg.targets() if cfg else []
+        if options["team"]:
+            targets = [t for t in targets if str(t.ffcv_team_id) == options["team"]]
+        if not targets:
+            raise CommandError("No matching target team in TargetConfig.")
+        target = targets[0]
+
+        cache = None
+        if options["cache_dir"] and not options["no_cache"]:
+            # прошлые сезоны не меняются: страницу из кеша не перепроверяем
+            cache = PageCache(options["cache_dir"], CachePolicy(revalidate_after=timedelta(days=3650).total_seconds()))
+
+        parser = FFCVParser(
+            base_url=cfg.base_url,
+            team_matches_url_template=cfg.team_matches_url_template,
+            target_team_id=str(target.ffcv_team_id),
+            target_team_name=target.name,
+            max_workers=options["workers"],
+            rate_limit=options["rate"],
+            cache=cache,
+        )
+        writer = MatchWriter.for_target(target)
+        parser.target_aliases = writer.index.keys_for(writer.target_team)
+        template = options["url_template"] or self.default_template(cfg.team_matches_url_template)
+        self.budget = options["max_requests"]
+
+        try:
+            for temp_id in seasons:
+                cp, _ = BackfillCheckpoint.objects.get_or_create(
+                    team_ffcv_id=str(target.ffcv_team_id), ffcv_temp_id=temp_id,
+                )
+                if options["restart"]:
+                    self.reset(cp)
+                if cp.state == BackfillCheckpoint.State.DONE:
+                    self.stdout.write(f"{cp}: already done")
+                    continue
+
+                path = template.format(team_id=target.ffcv_team_id, temp_id=temp_id)
+                url = urljoin(parser.base_url + "/", path.lstrip("/"))
+                try:
+                    self.backfill_season(parser, writer, cp, url, options["batch_size"])
+                except BudgetExhausted:
+                    raise
+                except Exception as e:
+                    # сезон с ошибкой отмечаем и идём дальше; при следующем запуске продолжим с next_row
+                    cp.state = BackfillCheckpoint.State.ERROR
+                    cp.last_error = f"{type(e).__name__}: {e}"
+                    cp.save()
+                    self.stderr.write(f"{cp}: {cp.last_error}")
+                    continue
+                self.stdout.write(f"{cp}: {cp.written_matches} written, {cp.skipped_matches} already known")
+        except BudgetExhausted:
+            self.stdout.write(f"Request budget of {options['max_requests']} spent; run again to resume.")
+        finally:
+            parser.close()
+
+        self.stdout.write(f"HTTP: {parser.http.stats.requests} requests")
+
+    def backfill_season(self, parser, writer, cp, url, batch_size):
+        year = season_year_for_temp(cp.ffcv_temp_id)
+        season_name = season_label(year) if year else f"id_temp {cp.ffcv_temp_id}"
+
+        self.spend(parser)
+        before = parser.http.stats.requests
+        rows = parser.team_rows(url)
+        cp.requests_used += parser.http.stats.requests - before
+        cp.total_rows = len(rows)
+        cp.state = BackfillCheckpoint.State.IN_PROGRESS
+        cp.last_error = None
+        cp.save()
+
+        # по batch_size строк: в памяти только строки страницы сезона и текущая пачка
+        while cp.next_row < len(rows):
+            chunk = rows[cp.next_row:cp.next_row + batch_size]
+            known = set(
+                Match.objects.filter(external_key__in=[pm.external_key for pm, _ in chunk])
+                .values_list("external_key", flat=True)
+            )
+            new_rows = [(pm, pu) for pm, pu in chunk if pm.external_key not in known]
+
+            # partido.php волнами: бюджет списывается по реальным сетевым запросам (повторы — тоже,
+            # страницы из кеша — бесплатно), поэтому остаток пересчитываем после каждой волны
+            before = parser.http.stats.requests
+            details = []
+            while len(details) < len(new_rows):
+                wave = self.wave_size(parser)
+                if not wave:
+                    break
+                urls = [pu for _, pu in new_rows[len(details):len(details) + wave]]
+                details += parser.fetch_match_details(urls, [None] * len(urls))
+
+            exhausted = len(details) < len(new_rows)
+            if exhausted:
+                # пачку режем перед первым новым матчем без детали
+                first_missing = new_rows[len(details)][0].external_key
+                chunk = chunk[:next(i for i, (pm, _) in enumerate(chunk) if pm.external_key == first_missing)]
+                new_rows = new_rows[:len(details)]
+
+            for (pm, _), (kickoff_at, venue_name) in zip(new_rows, details):
+                pm.season_name = season_name
+                pm.kickoff_at = kickoff_at or pm.kickoff_at
+                pm.venue_name = pm.venue_name or venue_name
+
+            with transaction.atomic():
+                writer.write(pm for pm, _ in new_rows)
+                cp.next_row += len(chunk)
+                cp.written_matches += len(new_rows)
+                cp.skipped_matches += len(chunk) - len(new_rows)
+                cp.requests_used += parser.http.stats.requests - before
+                cp.save()
+            if exhausted:
+                raise BudgetExhausted()
+
+        cp.state = BackfillCheckpoint.State.DONE
+        cp.save()
+
+    def remaining(self, parser) -> int:
+        # stats.requests — реальные попытки по сети, включая повторы HttpClient; ответы из кеша не считаются
+        return max(0, self.budget - parser.http.stats.requests)
+
+    def wave_size(self, parser) -> int:
+        """
+        Сколько partido.php запросить следующей волной: чтобы даже при всех повторах волна
+        уложилась в остаток бюджета. Последний запрос идёт и при остатке меньше худшего случая.
+        """
+        remaining = self.remaining(parser)
+        per_request = 1 + getattr(parser.http, "max_retries", 0)
+        return max(remaining // per_request, 1) if remaining else 0
+
+    def spend(self, parser) -> None:
+        if not self.remaining(parser):
+            raise BudgetExhausted()
+
+    @staticmethod
+    def reset(cp):
+        cp.state = BackfillCheckpoint.State.PENDING
+        cp.next_row = 0
+        cp.total_rows = None
+        cp.written_matches = cp.skipped_matches = cp.requests_used = 0
+        cp.last_error = None
+        cp.save()
+
+    @staticmethod
+    def default_template(team_template: str) -> str:
+        if "{temp_id}" in team_template:
+            return team_template
+        return team_template + ("&" if "?" in team_template else "?") + "id_temp={temp_id}"
+
+    @staticmethod
+    def parse_seasons(value: str):
+        seasons = []
+        for part in value.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            if "-" in part:
+                lo, hi = part.split("-", 1)
+                if not (lo.strip().isdigit() and hi.strip().isdigit()):
+                    raise CommandError(f"Bad season range {part!r}.")
+                seasons.extend(str(n) for n in range(int(lo), int(hi) + 1))
+            else:
+                seasons.append(part)
+        if not seasons:
+            raise CommandError("No seasons given.")
+        return seasons
@@ -0,0 +1,91 @@
+# apps/results_pars/management/commands/bench_ffcv_detail_fetch.py
+import re
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+
+from results_pars.services.ffcv_parser import FFCVParser
+from results_pars.services.synthetic_pages import team_matches_html, partido_html
+
+
+class LatencyParser(FFCVParser):
+    """FFCVParser без сети: синтетические страницы + искусственная задержка на запрос."""
+
+    def __init__(self, *args, fixtures: int, latency: float, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fixtures = fixtures
+        self.latency = latency
+        self.requests_made = 0
+        self._count_lock = threading.Lock()
+
+    def fetch(self, url: str) -> str:
+        self.rate_limiter.wait(url)
+        time.sleep(self.latency)
+        # fetch зовут из потоков пула: += без блокировки теряет инкременты
+        with self._count_lock:
+            self.requests_made += 1
+
+        if "partido.php" in url:
+            id_partido = int(re.search(r"id_partido=(\d+)", url).group(1))
+            return partido_html(id_partido)
+        return team_matches_html(self.target_team_name, self.fixtures)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare serial vs pooled partido.php fetching in FFCVParser.parse_team_matches (offline, synthetic latency). "
+        "The pooled run honours the per-host rate limit (--rate req/s) and the serial baseline does not, so when "
+        "--latency-ms is below 1000/--rate the pool is capped by the limiter and can be slower than serial."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fixtures", type=int, default=30)
+        parser.add_argument("--latency-ms", type=float, default=250.0, help="Simulated round trip per request.")
+        parser.add_argument("--workers", type=int, default=FFCVParser.DEFAULT_MAX_WORKERS)
+        parser.add_argument("--rate", type=float, default=FFCVParser.DEFAULT_RATE_LIMIT)
+
+    def handle(self, *args, **options):
+        timings = {}
+        results = {}
+        # serial — прежний путь: по одному запросу, без лимитера
+        for label, workers, rate in (("serial", 1, 0), ("pooled", options["workers"], options["rate"])):
+            parser = LatencyParser(
+                base_url="https://www.ffcv.es",
+                team_matches_url_template="/equipo_p_partidos.php?id_equipo={team_id}",
+                target_team_id="1",
+                target_team_name="AT Gilet",
+                max_workers=workers,
+                rate_limit=rate,
+                fixtures=options["fixtures"],
+                latency=options["latency_ms"] / 1000.0,
+            )
+            t0 = time.perf_counter()
+            results[label] = parser.parse_team_matches()
+            timings[label] = time.perf_counter() - t0
+
+            self.stdout.write(
+                f"{label:>7}: workers={workers:<3} requests={parser.requests_made:<4} "
+                f"matches={len(results[label]):<4} {timings[label]:.2f}s"
+            )
+
+        same_order = [
+            (pm.external_key, pm.kickoff_at, pm.venue_name) for pm in results["serial"]
+        ] == [
+            (pm.external_key, pm.kickoff_at, pm.venue_name) for pm in results["pooled"]
+        ]
+        if not same_order:
+            self.stderr.write(self.style.ERROR("Pooled results differ from serial results."))
+            return
+
+        speedup = timings["serial"] / timings["pooled"] if timings["pooled"] else 0.0
+        self.stdout.write(self.style.SUCCESS(f"Results identical and in table order; speedup x{speedup:.1f}"))
+
+        # пул упирается в вежливый лимит хоста, а serial идёт без лимитера
+        serial_rate = 1000.0 / options["latency_ms"] if options["latency_ms"] > 0 else float("inf")
+        if 0 < options["rate"] < serial_rate * options["workers"]:
+            self.stdout.write(
+                f"Note: pooled fetching is capped at {options['rate']:g} req/s by the per-host rate limit "
+                f"(serial without limiter: {serial_rate:.1f} req/s, {options['workers']} workers could do "
+                f"{serial_rate * options['workers']:.1f} req/s). Raise --rate to measure the pool alone."
+            )
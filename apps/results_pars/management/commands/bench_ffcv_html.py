@@ -0,0 +1,89 @@
+# apps/results_pars/management/commands/bench_ffcv_html.py
+import multiprocessing
+import resource
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from results_pars.services.ffcv_html import backend_names, get_backend
+from results_pars.services.synthetic_pages import team_matches_html, partido_html
+
+
+def measure_backend(name: str, kind: str, pages: list, repeat: int) -> dict:
+    """
+    Выполняется в отдельном процессе (spawn), чтобы RSS одного бэкенда не влиял на другой.
+    tracemalloc видит только Python-кучу; память libxml2 (lxml) видна лишь в росте RSS.
+    """
+    backend = get_backend(name)
+    parse = (lambda html: list(backend.team_rows(html))) if kind == "team" else backend.match_detail
+
+    parse(pages[0])  # прогрев: импорты, кеши селекторов
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages:
+            result = parse(html)
+    elapsed = time.perf_counter() - t0
+
+    # память — отдельным проходом: под tracemalloc время искажается в разы
+    peak = 0
+    for html in pages:
+        tracemalloc.start()
+        parse(html)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "ms_per_page": elapsed * 1000 / (repeat * len(pages)),
+        "py_peak_kib": peak / 1024,
+        "rss_growth_kib": rss_after - rss_before,  # ru_maxrss в KiB на Linux
+        "result": repr(result),
+    }
+
+
+class Command(BaseCommand):
+    help = "Compare FFCV HTML backends: parse time and peak memory per page (team list and partido.php)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--backends", default=",".join(backend_names()))
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--fixtures", type=int, default=30, help="Rows in the synthetic team page.")
+        parser.add_argument("--filler-kb", type=int, default=120, help="Unrelated markup per synthetic page.")
+        parser.add_argument("--team-file", action="append", default=[], help="Saved equipo_p_partidos.php page(s).")
+        parser.add_argument("--detail-file", action="append", default=[], help="Saved partido.php page(s).")
+
+    def handle(self, *args, **options):
+        names = [n.strip() for n in options["backends"].split(",") if n.strip()]
+        for name in names:
+            if name not in backend_names():
+                raise CommandError(f"Unknown backend {name!r}; choose from {', '.join(backend_names())}.")
+
+        team_pages = [Path(f).read_text(encoding="utf-8") for f in options["team_file"]] or [
+            team_matches_html("AT Gilet", options["fixtures"], filler_kb=options["filler_kb"])
+        ]
+        detail_pages = [Path(f).read_text(encoding="utf-8") for f in options["detail_file"]] or [
+            partido_html(1000 + i, filler_kb=options["filler_kb"]) for i in range(5)
+        ]
+
+        ctx = multiprocessing.get_context("spawn")
+        for kind, pages in (("team", team_pages), ("detail", detail_pages)):
+            avg_kib = sum(len(p.encode("utf-8")) for p in pages) / len(pages) / 1024
+            self.stdout.write(f"{kind} pages: {len(pages)} x ~{avg_kib:.0f} KiB")
+
+            results = {}
+            for name in names:
+                with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                    results[name] = pool.submit(measure_backend, name, kind, pages, options["repeat"]).result()
+                r = results[name]
+                self.stdout.write(
+                    f"  {name:>9}: {r['ms_per_page']:8.2f} ms/page  "
+                    f"py peak {r['py_peak_kib']:9.1f} KiB  rss +{r['rss_growth_kib']} KiB"
+                )
+
+            if len({r["result"] for r in results.values()}) > 1:
+                self.stderr.write(self.style.ERROR(f"  backends disagree on {kind} pages"))
@@ -0,0 +1,137 @@
+# apps/results_pars/management/commands/bench_ffcv_parser.py
+import json
+import time
+import tracemalloc
+
+import lxml.html
+from django.core.management.base import BaseCommand, CommandError
+
+from results_pars.services.ffcv_html import DEFAULT_BACKEND, backend_names
+from results_pars.services.ffcv_parser import FFCVParser
+from results_pars.services.replay import DEFAULT_CORPUS_DIR, Corpus, ReplayHttpClient
+from results_pars.services.synthetic_pages import team_matches_html
+
+CALIBRATION_HTML = team_matches_html("Calibration", 30, filler_kb=8)
+
+
+def calibration_rate(seconds: float = 0.5) -> float:
+    """
+    Скорость машины на работе того же рода (lxml-разбор + обход текста на Python), итераций/с.
+    Скорости бенчмарка хранятся в долях от неё, так что базовая линия не привязана к хосту.
+    """
+    count = 0
+    t0 = time.perf_counter()
+    while (elapsed := time.perf_counter() - t0) < seconds:
+        doc = lxml.html.fromstring(CALIBRATION_HTML)
+        sum(len(text) for text in doc.itertext())
+        count += 1
+    return count / elapsed
+
+
+class Command(BaseCommand):
+    help = (
+        "Offline throughput/allocation benchmark of parse_team_matches and fetch_match_detail "
+        "against the replay corpus, compared with the stored baseline. Throughput is stored relative to a "
+        "calibration loop run in the same process, so the baseline holds across machines; parse output "
+        "itself is checked by the results_pars tests against expected.json."
+    )
+
+    BASELINE = "baseline.json"
+    # метрика -> True, если больше = лучше; *_rel — в долях от calibration_rate()
+    METRICS = {"pages_rel": True, "rows_rel": True, "peak_kib": False}
+
+    def add_arguments(self, parser):
+        parser.add_argument("--corpus", default=str(DEFAULT_CORPUS_DIR))
+        parser.add_argument("--html-backend", choices=backend_names(), default=DEFAULT_BACKEND)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression.")
+        parser.add_argument("--update-baseline", action="store_true")
+
+    def handle(self, *args, **options):
+        corpus = Corpus(options["corpus"])
+        if not corpus.pages:
+            raise CommandError(f"Corpus {corpus.root} is empty; run record_ffcv_corpus first.")
+
+        parser = FFCVParser(
+            **corpus.target,
+            max_workers=1,
+            rate_limit=0,
+            http=ReplayHttpClient(corpus),
+            html_backend=options["html_backend"],
+        )
+        detail_urls = list(corpus.pages_of_kind("detail"))
+        repeat = options["repeat"]
+
+        calibration_before = calibration_rate()
+        results = {
+            "parse_team_matches": self._measure(
+                lambda: len(parser.parse_team_matches()), parser, repeat,
+            ),
+            "fetch_match_detail": self._measure(
+                lambda: sum(1 for u in detail_urls if any(parser.fetch_match_detail(u))), parser, repeat,
+            ),
+        }
+        # калибровка до и после: сглаживает турбо-частоты и фоновую нагрузку за время замера
+        calibration = (calibration_before + calibration_rate()) / 2
+        for m in results.values():
+            m["pages_rel"] = m.pop("pages_per_sec") / calibration
+            m["rows_rel"] = m.pop("rows_per_sec") / calibration
+
+        self.stdout.write(f"{'calibration':>20}: {calibration:9.1f} loops/s")
+        for name, m in results.items():
+            self.stdout.write(
+                f"{name:>20}: {m['pages_rel'] * calibration:9.1f} pages/s  {m['rows_rel'] * calibration:9.1f} rows/s  "
+                f"({m['pages_rel']:.3f} / {m['rows_rel']:.3f} of calibration)  peak {m['peak_kib']:8.1f} KiB"
+            )
+
+        baseline_path = corpus.root / self.BASELINE
+        baselines = json.loads(baseline_path.read_text(encoding="utf-8")) if baseline_path.exists() else {}
+        backend = options["html_backend"]
+
+        if options["update_baseline"]:
+            baselines[backend] = results
+            baseline_path.write_text(json.dumps(baselines, indent=2, sort_keys=True), encoding="utf-8")
+            self.stdout.write(self.style.SUCCESS(f"Baseline for {backend!r} saved to {baseline_path}."))
+            return
+
+        if backend not in baselines:
+            self.stdout.write(self.style.WARNING(f"No baseline for {backend!r}; run with --update-baseline."))
+            return
+
+        regressions = []
+        tol = options["tolerance"]
+        for name, m in results.items():
+            for metric, higher_is_better in self.METRICS.items():
+                base = baselines[backend].get(name, {}).get(metric)
+                if not base:
+                    continue
+                change = (m[metric] - base) / base
+                if (higher_is_better and change < -tol) or (not higher_is_better and change > tol):
+                    regressions.append(f"{name}.{metric}: {base:.3f} -> {m[metric]:.3f} ({change:+.0%})")
+
+        if regressions:
+            raise CommandError("Performance regression vs baseline:\n  " + "\n  ".join(regressions))
+        self.stdout.write(self.style.SUCCESS(f"Within {tol:.0%} of baseline for {backend!r}."))
+
+    @staticmethod
+    def _measure(run, parser, repeat: int) -> dict:
+        """run() возвращает число разобранных строк; страницы считаем по запросам транспорта."""
+        run()  # прогрев
+        requests_before = parser.http.stats.requests
+        rows = 0
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            rows += run()
+        elapsed = time.perf_counter() - t0
+        pages = parser.http.stats.requests - requests_before
+
+        tracemalloc.start()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return {
+            "pages_per_sec": pages / elapsed if elapsed else 0.0,
+            "rows_per_sec": rows / elapsed if elapsed else 0.0,
+            "peak_kib": peak / 1024,
+        }
@@ -0,0 +1,74 @@
+# apps/results_pars/management/commands/merge_duplicate_teams.py
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import IntegrityError, transaction
+from django.db.models import ProtectedError
+
+from results_pars.models import StandingsRow, Team, TeamAlias
+from results_pars.services.team_index import TeamIndex
+from results_pars.services.team_names import normalize_team_name
+
+
+class Command(BaseCommand):
+    help = (
+        "Merge Team rows that are spelling variants of one team (same normalized name or a TeamAlias): "
+        "matches and standings move to the kept team, the duplicates are deleted and their names kept as TeamAlias."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only print what would be merged.")
+
+    def handle(self, *args, **options):
+        index = TeamIndex.load()
+        groups = defaultdict(list)
+        for team in Team.objects.order_by("pk"):
+            # алиас указывает, к какой команде относится написание; иначе — ключ имени
+            canonical = index.get(team.name)
+            groups[canonical.pk if canonical else normalize_team_name(team.name)].append(team)
+
+        found = merged = 0
+        for teams in groups.values():
+            if len(teams) < 2:
+                continue
+            keep, *duplicates = sorted(teams, key=TeamIndex.preference)
+            if sum(t.is_target for t in teams) > 1:
+                self.stderr.write(f"Skip {keep.name!r}: several target teams share the name {[t.name for t in teams]}")
+                continue
+
+            self.stdout.write(f"{keep.name} (#{keep.pk}) <- " + ", ".join(f"{t.name} (#{t.pk})" for t in duplicates))
+            found += len(duplicates)
+            if options["dry_run"]:
+                continue
+            try:
+                with transaction.atomic():
+                    self.merge(keep, duplicates)
+            except (IntegrityError, ProtectedError) as e:
+                self.stderr.write(f"  failed: {e}")
+                continue
+            merged += len(duplicates)
+
+        if options["dry_run"]:
+            self.stdout.write(f"Dry run: {found} duplicate teams would be merged")
+        else:
+            self.stdout.write(f"Merged {merged} of {found} duplicate teams")
+
+    @staticmethod
+    def merge(keep: Team, duplicates: list) -> None:
+        ids = [t.pk for t in duplicates]
+        # в одном снимке таблицы могли оказаться обе записи — строку дубля убираем
+        StandingsRow.objects.filter(
+            team_id__in=ids, snapshot__in=StandingsRow.objects.filter(team=keep).values("snapshot")
+        ).delete()
+        # все FK на Team (матчи, таблицы, алиасы), включая будущие
+        for rel in Team._meta.related_objects:
+            if rel.one_to_many or rel.one_to_one:
+                rel.related_model._base_manager.filter(**{f"{rel.field.name}__in": ids}).update(**{rel.field.name: keep})
+        # написания дублей — алиасами: после переименования keep строки со старым именем всё равно найдутся
+        aliased = set(TeamAlias.objects.filter(team=keep).values_list("normalized", flat=True))
+        for team in duplicates:
+            key = normalize_team_name(team.name)
+            if key not in aliased:
+                TeamAlias.objects.create(team=keep, name=team.name)
+                aliased.add(key)
+        Team.objects.filter(pk__in=ids).delete()
@@ -1,126 +1,371 @@
 # apps/results_pars/management/commands/parse_ffcv_results.py
-from django.core.management.base import BaseCommand
-from django.db import transaction
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+from django.db.models import Q
 from django.utils import timezone
 
-from results_pars.models import (
-    TargetConfig, Team, CompetitionContext, Round, Venue, Match, IngestionRun
-)
+from results_pars.models import TargetConfig, CompetitionContext, Match, IngestionRun
+from results_pars.services.archive import PageArchive, RunArchive
+from results_pars.services.calendar import CalendarWriter, season_start_year
+from results_pars.services.ffcv_html import DEFAULT_BACKEND, backend_names
 from results_pars.services.ffcv_parser import FFCVParser
+from results_pars.services.http_client import HttpClient
+from results_pars.services.lease import DEFAULT_TTL, LeaseHeartbeat, LeaseHeld, acquire_run
+from results_pars.services.match_writer import MatchWriter, load_known_matches
+from results_pars.services.metrics import RunMetrics
+from results_pars.services.page_cache import CachePolicy, PageCache
+from results_pars.services.rate_limit import HostRateLimiter
+from results_pars.services.replay import Corpus, ReplayHttpClient
+from results_pars.services.standings import StandingsWriter
+from results_pars.services.team_index import TeamIndex
+
+
+class MatchClaims:
+    """external_key, уже взятые в работу одной из целевых команд прогона (потокобезопасно)."""
+
+    def __init__(self):
+        self._keys = set()
+        self._lock = threading.Lock()
+
+    def claim(self, key: str) -> bool:
+        with self._lock:
+            if key in self._keys:
+                return False
+            self._keys.add(key)
+            return True
 
 
 class Command(BaseCommand):
-    help = "Parse FFCV schedules/results for AT Gilet only and upsert into DB."
+    help = "Parse FFCV schedules/results for the club's target teams and upsert into DB."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers", type=int, default=FFCVParser.DEFAULT_MAX_WORKERS,
+            help="Max concurrent partido.php requests (1 = serial).",
+        )
+        parser.add_argument(
+            "--rate", type=float, default=FFCVParser.DEFAULT_RATE_LIMIT,
+            help="Max requests per second per host, shared by all target teams (0 = unlimited).",
+        )
+        parser.add_argument(
+            "--teams-parallel", type=int, default=4,
+            help="Target teams ingested concurrently.",
+        )
+        parser.add_argument(
+            "--cache-dir", default=getattr(settings, "FFCV_CACHE_DIR", None),
+            help="On-disk conditional-GET cache for FFCV pages (default: settings.FFCV_CACHE_DIR).",
+        )
+        parser.add_argument("--no-cache", action="store_true", help="Always download every page.")
+        parser.add_argument(
+            "--archive-dir", default=getattr(settings, "FFCV_ARCHIVE_DIR", None),
+            help="Content-addressed archive of every page a run uses, for reparse_ffcv_archive "
+                 "(default: settings.FFCV_ARCHIVE_DIR).",
+        )
+        parser.add_argument("--no-archive", action="store_true", help="Do not archive fetched pages.")
+        parser.add_argument(
+            "--revalidate-after", type=float, default=CachePolicy.revalidate_after,
+            help="Seconds a cached page is served without any request (0 = always conditional GET).",
+        )
+        parser.add_argument(
+            "--settled-days", type=int, default=CachePolicy.settled_after.days,
+            help="partido.php of matches played more than this many days ago is never refetched.",
+        )
+        parser.add_argument(
+            "--html-backend", choices=backend_names(), default=DEFAULT_BACKEND,
+            help="HTML parsing backend for FFCV pages.",
+        )
+        parser.add_argument(
+            "--replay", metavar="CORPUS_DIR",
+            help="Serve pages from a recorded corpus (see record_ffcv_corpus) instead of the network.",
+        )
+        parser.add_argument(
+            "--skip-calendar", action="store_true",
+            help="Do not fetch TargetConfig.calendar_url_template (dates come from partido.php only).",
+        )
+        parser.add_argument(
+            "--skip-standings", action="store_true",
+            help="Do not fetch TargetConfig.standings_url_template.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=25,
+            help="Matches written (and committed) per transaction while details are still being fetched. "
+                 "Each batch is one MatchWriter.write(), so writer queries per run are "
+                 "ceil(matches / batch size) x the per-write budget; 0 = a single write after the stream.",
+        )
+        parser.add_argument(
+            "--lease-ttl", type=float, default=DEFAULT_TTL.total_seconds(),
+            help="Seconds without a heartbeat after which a running ingestion of the same team is "
+                 "considered dead and its lease is taken over.",
+        )
+        parser.add_argument(
+            "--full", action="store_true",
+            help="Disable incremental mode: fetch every partido.php, even for settled matches.",
+        )
 
     def handle(self, *args, **options):
-        run = IngestionRun.objects.create(status=IngestionRun.RunStatus.SKIPPED, started_at=timezone.now())
-        try:
-            cfg = TargetConfig.objects.first()
+        cfg = TargetConfig.objects.first()
+        targets = cfg.targets() if cfg and cfg.is_active else []
+        if not targets:
+            run = IngestionRun(status=IngestionRun.RunStatus.SKIPPED, finished_at=timezone.now())
             if not cfg or not cfg.is_active:
-                run.status = IngestionRun.RunStatus.SKIPPED
                 run.errors = "TargetConfig missing or inactive."
-                return
-
-            if not cfg.target_ffcv_team_id:
+            else:
                 run.status = IngestionRun.RunStatus.ERROR
-                run.errors = "TargetConfig.target_ffcv_team_id is empty."
-                return
-
-            parser = FFCVParser(
-                base_url=cfg.base_url,
-                team_matches_url_template=cfg.team_matches_url_template,
-                target_team_id=str(cfg.target_ffcv_team_id),
-                target_team_name=cfg.target_team_name,
+                run.errors = "TargetConfig has no target team (TargetTeam or target_ffcv_team_id)."
+            run.save()
+            return
+
+        cache = None
+        if options["cache_dir"] and not options["no_cache"]:
+            cache = PageCache(
+                options["cache_dir"],
+                CachePolicy(
+                    revalidate_after=options["revalidate_after"],
+                    settled_after=timedelta(days=options["settled_days"]),
+                ),
             )
 
-            parsed = parser.parse_team_matches()
+        # один HttpClient на все команды: общий пул соединений и общий лимит запросов на хост
+        if options["replay"]:
+            http = ReplayHttpClient(Corpus(options["replay"]))
+        else:
+            http = HttpClient(
+                user_agent=FFCVParser.USER_AGENT,
+                pool_size=max(options["workers"], 4) * min(len(targets), options["teams_parallel"]),
+                rate_limiter=HostRateLimiter(options["rate"]),
+            )
 
-            parsed_count = 0
-            updated_count = 0
+        # Team целевых команд заранее: в матче двух наших команд соперник — тоже целевой Team
+        target_teams = {t.ffcv_team_id: MatchWriter.target_team_for(t) for t in targets}
+        # индекс названий команд — один на прогон и на все целевые команды (два запроса)
+        index = TeamIndex.load()
+        shared = {
+            "cfg": cfg,
+            "cache": cache,
+            "http": http,
+            "known": load_known_matches(),
+            "claims": MatchClaims(),
+            "index": index,
+            "target_teams": target_teams,
+        }
 
-            with transaction.atomic():
-                # Ensure target team exists (ffcv id from config)
-                target_team, _ = Team.objects.get_or_create(
-                    ffcv_team_id=str(cfg.target_ffcv_team_id),
-                    defaults={"name": cfg.target_team_name, "is_target": True},
-                )
-                if not target_team.is_target:
-                    target_team.is_target = True
-                    target_team.save(update_fields=["is_target"])
-
-                for pm in parsed:
-                    parsed_count += 1
-
-                    # competition
-                    comp, _ = CompetitionContext.objects.get_or_create(
-                        name=pm.competition_name,
-                        season_name=pm.season_name,
-                        defaults={"source_url": pm.source_url, "is_active": True},
-                    )
-
-                    # round
-                    rnd = None
-                    if pm.round_number is not None:
-                        rnd, _ = Round.objects.get_or_create(
-                            competition=comp,
-                            round_number=pm.round_number,
-                            defaults={"round_date": pm.kickoff_at.date() if pm.kickoff_at else None},
-                        )
-
-                    # teams (opponent auto)
-                    home_team = target_team if pm.home_name.lower().find(cfg.target_team_name.lower()) >= 0 else None
-                    away_team = target_team if pm.away_name.lower().find(cfg.target_team_name.lower()) >= 0 else None
-
-                    if home_team is None:
-                        home_team, _ = Team.objects.get_or_create(
-                            ffcv_team_id=f"auto:{pm.home_name}",
-                            defaults={"name": pm.home_name, "is_target": False},
-                        )
-                    else:
-                        home_team.name = pm.home_name
-                        home_team.save(update_fields=["name"])
-
-                    if away_team is None:
-                        away_team, _ = Team.objects.get_or_create(
-                            ffcv_team_id=f"auto:{pm.away_name}",
-                            defaults={"name": pm.away_name, "is_target": False},
-                        )
-                    else:
-                        away_team.name = pm.away_name
-                        away_team.save(update_fields=["name"])
-
-                    venue = None
-                    if pm.venue_name:
-                        venue, _ = Venue.objects.get_or_create(name=pm.venue_name)
-
-                    obj, created = Match.objects.update_or_create(
-                        external_key=pm.external_key,
-                        defaults={
-                            "competition": comp,
-                            "round": rnd,
-                            "kickoff_at": pm.kickoff_at,
-                            "home_team": home_team,
-                            "away_team": away_team,
-                            "home_score": pm.home_score,
-                            "away_score": pm.away_score,
-                            "status": pm.status,
-                            "result_note": pm.result_note,
-                            "venue": venue,
-                            "source_url": pm.source_url,
-                            "is_target_match": True,
-                        },
-                    )
-                    if not created:
-                        updated_count += 1
+        failed = []
+        try:
+            if len(targets) == 1:
+                self.ingest_target(targets[0], shared, options)
+            else:
+                with ThreadPoolExecutor(max_workers=options["teams_parallel"], thread_name_prefix="ffcv-team") as pool:
+                    futures = {pool.submit(self.ingest_target_in_thread, t, shared, options): t for t in targets}
+                    for future in as_completed(futures):
+                        if future.exception() is not None:
+                            failed.append(futures[future])
+        finally:
+            http.close()
 
-            run.status = IngestionRun.RunStatus.SUCCESS
-            run.parsed_matches = parsed_count
-            run.updated_matches = updated_count
+        if len(targets) > 1:
+            self.stdout.write(
+                f"HTTP total: {http.stats.requests} requests, {http.stats.retries} retries, "
+                f"{http.stats.bytes_downloaded / 1024:.1f} KiB"
+            )
+        if cache:
+            cs = cache.stats
+            self.stdout.write(
+                f"Cache: {cs.fresh_hits} fresh, {cs.not_modified} not modified, "
+                f"{cs.unchanged} unchanged, {cs.changed} changed"
+            )
+        if failed:
+            raise CommandError(f"Ingestion failed for {', '.join(t.name for t in failed)} (see IngestionRun.errors).")
 
+    def ingest_target_in_thread(self, target, shared, options):
+        try:
+            self.ingest_target(target, shared, options)
         except Exception as e:
-            run.status = IngestionRun.RunStatus.ERROR
-            run.errors = f"{type(e).__name__}: {e}"
+            self.stderr.write(f"[{target.name}] {type(e).__name__}: {e}")
             raise
         finally:
-            run.finished_at = timezone.now()
-            run.save()
+            # у каждого потока своё соединение с БД
+            connections.close_all()
+
+    def ingest_target(self, target, shared, options):
+        """Один прогон (IngestionRun) по одной целевой команде."""
+        cfg = shared["cfg"]
+        known = shared["known"]
+        log = lambda msg: self.stdout.write(f"[{target.name}] {msg}")
+
+        # одна команда — один прогон за раз: второй (cron запустил, пока идёт медленный) пропускается
+        try:
+            run = acquire_run(
+                f"ffcv:{target.ffcv_team_id}",
+                timedelta(seconds=options["lease_ttl"]),
+                started_at=timezone.now(),
+                target=target if target.pk else None,
+            )
+        except LeaseHeld as e:
+            IngestionRun.objects.create(
+                status=IngestionRun.RunStatus.SKIPPED,
+                finished_at=timezone.now(),
+                target=target if target.pk else None,
+                errors=f"Skipped: {e}.",
+            )
+            log(f"Skipped: {e}")
+            return
+
+        metrics = RunMetrics()
+        archive = None
+        heartbeat = LeaseHeartbeat(run, timedelta(seconds=options["lease_ttl"]))
+        # время и число SQL-запросов прогона — через execute_wrapper, без правок в коде записи
+        with heartbeat, connection.execute_wrapper(metrics.db_wrapper):
+            try:
+                if options["archive_dir"] and not options["no_archive"] and not options["replay"]:
+                    archive = RunArchive(PageArchive(options["archive_dir"]), run)
+
+                parser = FFCVParser(
+                    base_url=cfg.base_url,
+                    team_matches_url_template=cfg.team_matches_url_template,
+                    target_team_id=str(target.ffcv_team_id),
+                    target_team_name=target.name,
+                    max_workers=options["workers"],
+                    cache=shared["cache"],
+                    html_backend=options["html_backend"],
+                    metrics=metrics,
+                    archive=archive,
+                    http=shared["http"],
+                )
+                team = shared["target_teams"][target.ffcv_team_id]
+                parser.target_aliases = shared["index"].keys_for(team)
+
+                # календарь первым: туры и даты пишутся сразу, partido.php остаётся для того, чего в нём нет
+                calendar = {}
+                if cfg.calendar_url_template and not options["skip_calendar"]:
+                    calendar = self.ingest_calendar(cfg, parser, team, run, log)
+
+                writer = MatchWriter(
+                    target_team=team,
+                    target_team_name=target.name,
+                    index=shared["index"],
+                    run=run,
+                )
+
+                # матчи пишутся пачками по мере готовности partido.php, каждая пачка — своя транзакция:
+                # при ошибке на середине уже записанное остаётся, счётчики прогона — по записанному
+                shared_count = 0
+                stream = parser.iter_team_matches(known=None if options["full"] else known, calendar=calendar)
+                for batch in iter(lambda: list(islice(stream, options["batch_size"] or None)), []):
+                    heartbeat.check()
+                    to_write = []
+                    for pm in batch:
+                        # матч двух наших команд есть на обеих страницах — пишет тот, кто первым его увидел
+                        if not shared["claims"].claim(pm.external_key):
+                            shared_count += 1
+                            continue
+                        run.parsed_matches += 1
+                        if pm.detail_skipped:
+                            run.skipped_matches += 1
+                        to_write.append(pm)
+
+                    # что изменилось, решает writer по content_hash всех полей матча;
+                    # совпавшие строки он не пишет, так что счётчики — по реально записанному
+                    with transaction.atomic():
+                        created, updated = writer.write(to_write)
+                    run.updated_matches += updated
+                    run.changed_matches += created + updated
+                    run.unchanged_matches += len(to_write) - created - updated
+
+                if shared_count:
+                    log(f"{shared_count} matches shared with another target team, written once")
+                if not run.parsed_matches and not shared_count:
+                    # целевую строку ищем по точному ключу имени: пустой результат чаще всего значит,
+                    # что FFCV переименовал команду
+                    run.errors = (
+                        f"No rows of {target.name!r} on the team page. If FFCV renamed the team, "
+                        "add the new spelling as a TeamAlias."
+                    )
+                    self.stderr.write(f"[{target.name}] Warning: {run.errors}")
+
+                if cfg.standings_url_template and not options["skip_standings"]:
+                    self.ingest_standings(cfg, parser, writer, team, log)
+
+                log(f"HTTP: {metrics.http_requests} requests, {metrics.bytes_downloaded / 1024:.1f} KiB")
+                log(
+                    f"Time: fetch {metrics.ms['fetch']:.0f} ms, wait {metrics.ms['wait']:.0f} ms, parse {metrics.ms['parse']:.0f} ms, "
+                    f"db {metrics.ms['db']:.0f} ms ({metrics.db_queries} queries)"
+                )
+
+                run.status = IngestionRun.RunStatus.SUCCESS
+
+            except Exception as e:
+                run.status = IngestionRun.RunStatus.ERROR
+                run.errors = f"{type(e).__name__}: {e}"
+                raise
+            finally:
+                run.http_requests = metrics.http_requests
+                run.bytes_downloaded = metrics.bytes_downloaded
+                run.fetch_ms = round(metrics.ms["fetch"])
+                run.wait_ms = round(metrics.ms["wait"])
+                run.parse_ms = round(metrics.ms["parse"])
+                run.db_ms = round(metrics.ms["db"])
+                run.db_queries = metrics.db_queries
+                run.slowest_urls = metrics.slowest
+                if archive:
+                    run.archived_pages = archive.flush()
+                run.finished_at = timezone.now()
+                run.lease_key = None
+                run.save()
+
+    def target_competitions(self, team):
+        return CompetitionContext.objects.filter(
+            Q(matches__home_team=team) | Q(matches__away_team=team),
+            is_active=True,
+        ).distinct()
+
+    def ingest_calendar(self, cfg, parser, team, run, log):
+        """
+        Календарь каждого активного соревнования команды: Round.round_date для всех jornadas
+        и kickoff_at известных матчей. Возвращает external_key -> CalendarEntry для parse_team_matches.
+        """
+        writer = CalendarWriter(run)
+        calendar = {}
+
+        seen_urls = set()
+        for comp in self.target_competitions(team):
+            url = parser.build_competition_url(cfg.calendar_url_template, comp)
+            if not url or url in seen_urls:
+                continue
+            seen_urls.add(url)
+
+            entries = parser.parse_calendar(url, season_year=season_start_year(comp))
+            if not entries:
+                log(f"Calendar: no matches at {url}")
+                continue
+
+            with transaction.atomic():
+                rounds, matches = writer.write(comp, entries)
+            calendar.update((e.external_key, e) for e in entries)
+            log(f"Calendar {comp}: {len(entries)} matches, {rounds} rounds written, {matches} matches dated")
+        return calendar
+
+    def ingest_standings(self, cfg, parser, writer, team, log):
+        """Таблица по каждому активному соревнованию команды; снимок — только если она изменилась."""
+        standings = StandingsWriter(writer)
+
+        seen_urls = set()
+        for comp in self.target_competitions(team):
+            url = parser.build_competition_url(cfg.standings_url_template, comp)
+            if not url or url in seen_urls:
+                continue
+            seen_urls.add(url)
+
+            rows = parser.parse_standings(url)
+            if not rows:
+                log(f"Standings: no table at {url}")
+                continue
+
+            snapshot, created = standings.write(comp, url, rows)
+            state = "new snapshot" if created else "unchanged"
+            log(f"Standings {comp}: {len(rows)} rows, {state}")
@@ -0,0 +1,87 @@
+# apps/results_pars/management/commands/record_ffcv_corpus.py
+from django.core.management.base import BaseCommand, CommandError
+
+from results_pars.models import TargetConfig
+from results_pars.services.ffcv_parser import FFCVParser
+from results_pars.services.replay import (
+    DEFAULT_CORPUS_DIR, Corpus, RecordingHttpClient, ReplayHttpClient, parse_snapshot,
+)
+from results_pars.services.synthetic_pages import team_matches_html, partido_html
+
+
+class Command(BaseCommand):
+    help = (
+        "Save FFCV team-list and partido.php pages into a replay corpus "
+        "(live from TargetConfig, or --synthetic pages in FFCV markup), together with expected.json, "
+        "the parse output the tests compare against. Record live pages into their own subdirectory, "
+        "e.g. --corpus results_pars/corpus/recorded/<team id>."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--corpus", default=str(DEFAULT_CORPUS_DIR))
+        parser.add_argument("--synthetic", action="store_true", help="Generate pages instead of downloading them.")
+        parser.add_argument("--fixtures", type=int, default=12, help="Synthetic only: rows in the team page.")
+        parser.add_argument("--filler-kb", type=int, default=8, help="Synthetic only: unrelated markup per page.")
+        parser.add_argument("--rate", type=float, default=2.0, help="Live only: requests per second.")
+        parser.add_argument(
+            "--update-expected", action="store_true",
+            help="Do not record; re-parse the existing corpus and rewrite expected.json (after an intended parser change).",
+        )
+
+    def handle(self, *args, **options):
+        corpus = Corpus(options["corpus"])
+
+        if options["update_expected"]:
+            if not corpus.pages:
+                raise CommandError(f"Corpus {corpus.root} is empty.")
+            self.save_expected(corpus)
+            return
+
+        if options["synthetic"]:
+            target = {
+                "base_url": "https://www.ffcv.es",
+                "team_matches_url_template": "/equipo_p_partidos.php?id_equipo={team_id}",
+                "target_team_id": "synthetic",
+                "target_team_name": "AT Gilet",
+            }
+            parser = FFCVParser(**target, max_workers=1, rate_limit=0)
+            team_url = parser.build_team_matches_url()
+            html = team_matches_html(target["target_team_name"], options["fixtures"], filler_kb=options["filler_kb"])
+            corpus.add(team_url, html)
+            for pm, partido_url in parser._parse_team_rows(html, team_url):
+                id_partido = int(parser._extract_query_param(partido_url, "id_partido"))
+                corpus.add(partido_url, partido_html(id_partido, filler_kb=options["filler_kb"]))
+        else:
+            cfg = TargetConfig.objects.first()
+            targets = cfg.targets() if cfg else []
+            if not targets:
+                raise CommandError("TargetConfig with a target team is required for a live recording.")
+            target = {
+                "base_url": cfg.base_url,
+                "team_matches_url_template": cfg.team_matches_url_template,
+                "target_team_id": str(targets[0].ffcv_team_id),
+                "target_team_name": targets[0].name,
+            }
+            parser = FFCVParser(**target, max_workers=1, rate_limit=options["rate"])
+            parser.http = RecordingHttpClient(
+                user_agent=FFCVParser.USER_AGENT,
+                rate_limiter=parser.rate_limiter,
+                corpus=corpus,
+            )
+            try:
+                parser.parse_team_matches()
+            finally:
+                parser.close()
+
+        corpus.save(target=target)
+        self.save_expected(corpus)
+
+    def save_expected(self, corpus: Corpus) -> None:
+        # эталон — разбор офлайн, тем же путём, что и в тестах
+        parser = FFCVParser(**corpus.target, max_workers=1, rate_limit=0, http=ReplayHttpClient(corpus))
+        snapshot = parse_snapshot(parser)
+        corpus.save_expected(snapshot)
+        self.stdout.write(self.style.SUCCESS(
+            f"Corpus {corpus.root}: {len(corpus.pages)} pages, "
+            f"expected.json with {len(snapshot['team_matches'])} matches and {len(snapshot['details'])} details."
+        ))
@@ -0,0 +1,213 @@
+# apps/results_pars/management/commands/reparse_ffcv_archive.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from results_pars.models import CompetitionContext, TargetConfig, Team
+from results_pars.services.archive import ArchiveHttpClient, PageArchive, latest_pages
+from results_pars.services.ffcv_html import DEFAULT_BACKEND, backend_names
+from results_pars.services.calendar import season_start_year
+from results_pars.services.ffcv_parser import CalendarEntry, FFCVParser, ParsedMatch
+from results_pars.services.match_writer import MatchWriter, load_known_matches
+from results_pars.services.team_index import TeamIndex
+
+# состояние процесса-воркера (задаётся в _init_worker)
+_parser = None
+_archive = None
+
+
+def _init_worker(parser_kwargs: dict, archive_root: str) -> None:
+    """
+    Воркер разбирает только HTML: сети нет (ArchiveHttpClient без страниц), БД не трогаем.
+    parser_kwargs — без целевой команды: она своя у каждой страницы команды.
+    """
+    import django
+    from django.apps import apps
+
+    if not apps.ready:  # spawn: процесс стартует с нуля
+        django.setup()
+
+    global _parser, _archive
+    _archive = PageArchive(archive_root)
+    _parser = FFCVParser(**parser_kwargs, target_team_id="", target_team_name="", http=ArchiveHttpClient(_archive, {}))
+
+
+def _parse_team_page(item: tuple[str, str, str, str, tuple]) -> tuple[str, list]:
+    url, sha, team_id, team_name, aliases = item
+    _parser.target_team_id, _parser.target_team_name = team_id, team_name
+    _parser.target_aliases = set(aliases)
+    rows = _parser._parse_team_rows(_archive.read(sha), url)
+    return team_id, [({**pm.__dict__, "kickoff_at": None}, pu) for pm, pu in rows]
+
+
+def _parse_calendar_page(item: tuple[str, str, int | None]) -> list:
+    url, sha, season_year = item
+    return [e.to_json() for e in _parser.parse_calendar_html(_archive.read(sha), season_year)]
+
+
+def _parse_detail_page(item: tuple[str, str]) -> tuple[str, str | None, str | None]:
+    url, sha = item
+    kickoff_at, venue_name = _parser.parse_match_detail(_archive.read(sha))
+    return url, kickoff_at.isoformat() if kickoff_at else None, venue_name
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild target matches from archived FFCV pages (see parse_ffcv_results --archive-dir) "
+        "in parallel worker processes, without network access. Dates come from settled matches in the DB, "
+        "archived calendars and partido.php pages, in the same order as parse_ffcv_results."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--archive-dir", default=getattr(settings, "FFCV_ARCHIVE_DIR", None),
+            help="Archive root (default: settings.FFCV_ARCHIVE_DIR).",
+        )
+        parser.add_argument("--run", type=int, help="Use page versions as of this IngestionRun id (default: latest).")
+        parser.add_argument("--processes", type=int, default=os.cpu_count() or 2)
+        parser.add_argument("--html-backend", choices=backend_names(), default=DEFAULT_BACKEND)
+        parser.add_argument("--batch-size", type=int, default=500, help="Matches per write transaction.")
+        parser.add_argument("--dry-run", action="store_true", help="Parse only, do not write.")
+
+    def handle(self, *args, **options):
+        if not options["archive_dir"]:
+            raise CommandError("No archive directory configured.")
+
+        cfg = TargetConfig.objects.first()
+        targets = {str(t.ffcv_team_id): t for t in (cfg.targets() if cfg else [])}
+        if not targets:
+            raise CommandError("TargetConfig has no target team.")
+
+        parser_kwargs = {
+            "base_url": cfg.base_url,
+            "team_matches_url_template": cfg.team_matches_url_template,
+            "html_backend": options["html_backend"],
+        }
+
+        # страница команды -> её целевая команда (по URL из team_matches_url_template)
+        url_to_team = {
+            FFCVParser(**parser_kwargs, target_team_id=team_id, target_team_name=t.name).build_team_matches_url(): t
+            for team_id, t in targets.items()
+        }
+        # другие написания целевых команд (алиасы) — воркерам, БД там не трогаем
+        index = TeamIndex.load()
+        aliases = {
+            team.ffcv_team_id: tuple(index.keys_for(team))
+            for team in Team.objects.filter(ffcv_team_id__in=list(targets))
+        }
+        pages = latest_pages(options["run"])
+        team_pages = [
+            (url, sha, str(t.ffcv_team_id), t.name, aliases.get(str(t.ffcv_team_id), ()))
+            for url, (kind, sha) in pages.items() if kind == "team" and url in url_to_team
+            for t in [url_to_team[url]]
+        ]
+        if not team_pages:
+            raise CommandError("No archived team pages of the target teams.")
+        # год сезона календаря — по соревнованию, чей URL совпал (как в ingest_calendar)
+        calendar_years = self.calendar_years(cfg, parser_kwargs, targets)
+        calendar_pages = [
+            (url, sha, calendar_years.get(url)) for url, (kind, sha) in pages.items() if kind == "calendar"
+        ]
+        self.stdout.write(f"Archive: {len(team_pages)} team pages, {len(calendar_pages)} calendar pages")
+
+        started = datetime.now()
+        with ProcessPoolExecutor(
+            max_workers=max(1, options["processes"]),
+            initializer=_init_worker,
+            initargs=(parser_kwargs, str(options["archive_dir"])),
+        ) as pool:
+            rows = [
+                (team_id, row)
+                for team_id, page_rows in pool.map(_parse_team_page, team_pages)
+                for row in page_rows
+            ]
+            calendar = {
+                entry["external_key"]: CalendarEntry.from_json(entry)
+                for entries in pool.map(_parse_calendar_page, calendar_pages)
+                for entry in entries
+            }
+
+            # тот же порядок, что у parse_ffcv_results: финальный матч из БД, календарь,
+            # partido.php — только для строк, которым больше неоткуда взять дату и поле
+            known = load_known_matches()
+            merger = FFCVParser(
+                **parser_kwargs, target_team_id="", target_team_name="",
+                http=ArchiveHttpClient(PageArchive(options["archive_dir"]), {}),
+            )
+            # одна строка на матч (матч двух наших команд — у первой из них)
+            matches, owners, need_detail = {}, {}, {}
+            for team_id, (data, partido_url) in rows:
+                pm = ParsedMatch(**data)
+                if pm.external_key in matches:
+                    continue
+                matches[pm.external_key] = pm
+                owners[pm.external_key] = team_id
+                if not merger.fill_without_detail(pm, known.get(pm.external_key), calendar.get(pm.external_key)):
+                    need_detail[pm.external_key] = partido_url
+
+            detail_pages = sorted(
+                (url, pages[url][1]) for url in set(need_detail.values()) if pages.get(url, ("",))[0] == "detail"
+            )
+            chunksize = max(1, len(detail_pages) // (options["processes"] * 4) or 1)
+            details = {
+                url: (datetime.fromisoformat(kickoff) if kickoff else None, venue)
+                for url, kickoff, venue in pool.map(_parse_detail_page, detail_pages, chunksize=chunksize)
+            }
+        self.stdout.write(
+            f"Parsed {len(rows)} match rows, {len(calendar)} calendar entries, {len(details)} partido.php pages "
+            f"in {(datetime.now() - started).total_seconds():.2f}s"
+        )
+
+        missing = []
+        for key, partido_url in need_detail.items():
+            if partido_url in details:
+                merger.fill_from_detail(matches[key], *details[partido_url])
+            elif matches[key].kickoff_at is None:
+                missing.append(partido_url)
+        if missing:
+            # дату из БД не подставляем: без неё матч не восстановить из архива — останавливаемся
+            raise CommandError(
+                f"{len(missing)} matches have no date in the archive: no settled row, calendar entry or "
+                f"partido.php page (e.g. {min(missing)}). Run parse_ffcv_results with the archive enabled, "
+                "then run this command again."
+            )
+
+        if options["dry_run"]:
+            self.stdout.write(f"Dry run: {len(matches)} matches not written")
+            return
+
+        target_teams = {team_id: MatchWriter.target_team_for(t) for team_id, t in targets.items()}
+        created = updated = 0
+        for team_id, target in targets.items():
+            writer = MatchWriter(
+                target_team=target_teams[team_id],
+                target_team_name=target.name,
+                index=index,
+            )
+            stream = (pm for key, pm in matches.items() if owners[key] == team_id)
+            for batch in iter(lambda: list(islice(stream, options["batch_size"])), []):
+                with transaction.atomic():
+                    c, u = writer.write(batch)
+                created += c
+                updated += u
+        self.stdout.write(f"Written: {created} created, {updated} updated")
+
+    @staticmethod
+    def calendar_years(cfg, parser_kwargs: dict, targets: dict) -> dict:
+        """URL календаря -> год начала сезона его соревнования."""
+        if not cfg.calendar_url_template:
+            return {}
+        years = {}
+        competitions = list(CompetitionContext.objects.all())
+        for team_id, t in targets.items():
+            parser = FFCVParser(**parser_kwargs, target_team_id=team_id, target_team_name=t.name)
+            for comp in competitions:
+                url = parser.build_competition_url(cfg.calendar_url_template, comp)
+                if url:
+                    years.setdefault(url, season_start_year(comp))
+        return years
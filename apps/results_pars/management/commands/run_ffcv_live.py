@@ -0,0 +1,132 @@
+# apps/results_pars/management/commands/run_ffcv_live.py
+import signal
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from results_pars.models import TargetConfig
+from results_pars.services.ffcv_parser import FFCVParser
+from results_pars.services.live import LivePoller, live_matches
+from results_pars.services.match_writer import MatchWriter
+from results_pars.services.page_cache import PageCache
+from results_pars.services.scheduler import PollPolicy, next_pending_kickoff
+
+
+class Command(BaseCommand):
+    help = (
+        "Live fast lane: while target matches are in play, poll only their match pages "
+        "at a short interval and write score changes straight to the DB."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=60, help="Seconds between polls of live matches.")
+        parser.add_argument(
+            "--lead-minutes", type=float, default=PollPolicy.lead.total_seconds() / 60,
+            help="Start polling a match this long before kickoff.",
+        )
+        parser.add_argument(
+            "--window-minutes", type=float, default=PollPolicy.window.total_seconds() / 60,
+            help="Stop polling a match this long after kickoff.",
+        )
+        parser.add_argument(
+            "--max-sleep-minutes", type=float, default=60,
+            help="Longest wait when no match is in play (the next kickoff is re-checked after it).",
+        )
+        parser.add_argument("--workers", type=int, default=4, help="Concurrent match page requests.")
+        parser.add_argument(
+            "--rate", type=float, default=FFCVParser.DEFAULT_RATE_LIMIT,
+            help="Max requests per second per host (0 = unlimited).",
+        )
+        parser.add_argument(
+            "--cache-dir", default=getattr(settings, "FFCV_CACHE_DIR", None),
+            help="Page cache shared with parse_ffcv_results: match pages are revalidated, "
+                 "team pages showing a changed score are dropped.",
+        )
+        parser.add_argument("--no-cache", action="store_true", help="Do not use the page cache.")
+        parser.add_argument("--once", action="store_true", help="Poll live matches once and exit.")
+
+    def handle(self, *args, **options):
+        policy = PollPolicy(
+            lead=timedelta(minutes=options["lead_minutes"]),
+            window=timedelta(minutes=options["window_minutes"]),
+        )
+        interval = max(1.0, options["interval"])
+        max_sleep = timedelta(minutes=options["max_sleep_minutes"])
+
+        stop = threading.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: stop.set())
+
+        cfg = TargetConfig.objects.first()
+        targets = cfg.targets() if cfg else []
+        if not targets:
+            self.stdout.write("TargetConfig has no target team, nothing to poll.")
+            return
+
+        cache = None
+        if options["cache_dir"] and not options["no_cache"]:
+            cache = PageCache(options["cache_dir"])
+
+        parser = FFCVParser(
+            base_url=cfg.base_url,
+            team_matches_url_template=cfg.team_matches_url_template,
+            target_team_id=str(targets[0].ffcv_team_id),
+            target_team_name=targets[0].name,
+            max_workers=options["workers"],
+            rate_limit=options["rate"],
+            cache=cache,
+        )
+        # страницы команд, на которых виден счёт их матчей: их сбрасываем из кеша при новом счёте
+        team_pages = {}
+        for target in targets:
+            url = FFCVParser(
+                base_url=cfg.base_url,
+                team_matches_url_template=cfg.team_matches_url_template,
+                target_team_id=str(target.ffcv_team_id),
+                target_team_name=target.name,
+                http=parser.http,
+            ).build_team_matches_url()
+            team_pages.setdefault(MatchWriter.target_team_for(target).pk, []).append(url)
+        poller = LivePoller(parser, team_pages)
+
+        try:
+            while not stop.is_set():
+                close_old_connections()
+                now = timezone.now()
+                matches = live_matches(now, policy)
+
+                if matches:
+                    try:
+                        changes = poller.poll(matches)
+                        dropped = poller.apply(changes)
+                    except Exception as e:
+                        # сеть/FFCV — следующий проход через interval
+                        self.stderr.write(f"Live poll failed: {type(e).__name__}: {e}")
+                    else:
+                        for c in changes:
+                            self.stdout.write(
+                                f"{timezone.localtime(now):%H:%M:%S} {c.match.source_url}: "
+                                f"{c.old[0]}-{c.old[1]} -> {c.new.home_score}-{c.new.away_score}"
+                                + (" (final)" if c.new.finished else "")
+                            )
+                        self.stdout.write(
+                            f"Polled {len(matches)} live matches: {len(changes)} score changes, "
+                            f"{dropped} cached team pages dropped, {parser.metrics.http_requests} requests so far"
+                        )
+                    delay = timedelta(seconds=interval)
+                else:
+                    kickoff_at = next_pending_kickoff(now, policy)
+                    delay = max_sleep
+                    if kickoff_at is not None:
+                        delay = min(delay, max(kickoff_at - policy.lead - now, timedelta(seconds=interval)))
+                    self.stdout.write(f"No live matches, sleeping {delay.total_seconds() / 60:.1f} min")
+
+                if options["once"]:
+                    break
+                stop.wait(delay.total_seconds())
+        finally:
+            parser.close()
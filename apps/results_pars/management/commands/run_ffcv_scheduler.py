@@ -0,0 +1,84 @@
+# apps/results_pars/management/commands/run_ffcv_scheduler.py
+import shlex
+import signal
+import threading
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from results_pars.models import TargetConfig
+from results_pars.services.scheduler import PollPolicy, next_pending_kickoff, plan_next_poll
+
+
+class Command(BaseCommand):
+    help = (
+        "Run parse_ffcv_results in a loop: every TargetConfig.poll_interval_minutes on match days, "
+        "every few minutes while a target match is in play, rarely otherwise."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--live-minutes", type=float, default=PollPolicy.live_interval.total_seconds() / 60,
+            help="Poll interval while a target match is in play.",
+        )
+        parser.add_argument(
+            "--idle-minutes", type=float, default=PollPolicy.idle_interval.total_seconds() / 60,
+            help="Poll interval on days without target matches.",
+        )
+        parser.add_argument(
+            "--lead-minutes", type=float, default=PollPolicy.lead.total_seconds() / 60,
+            help="Switch to the live interval this long before kickoff.",
+        )
+        parser.add_argument(
+            "--window-minutes", type=float, default=PollPolicy.window.total_seconds() / 60,
+            help="Stop live polling this long after kickoff even if no final score appeared.",
+        )
+        parser.add_argument(
+            "--parse-args", default="",
+            help='Extra arguments for parse_ffcv_results, e.g. "--workers 4 --skip-standings".',
+        )
+        parser.add_argument("--once", action="store_true", help="Run one ingestion, print the next plan and exit.")
+
+    def handle(self, *args, **options):
+        policy = PollPolicy(
+            live_interval=timedelta(minutes=options["live_minutes"]),
+            idle_interval=timedelta(minutes=options["idle_minutes"]),
+            lead=timedelta(minutes=options["lead_minutes"]),
+            window=timedelta(minutes=options["window_minutes"]),
+        )
+        parse_args = shlex.split(options["parse_args"])
+
+        stop = threading.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: stop.set())
+
+        while not stop.is_set():
+            # между итерациями соединение простаивает часами — не держим протухшее
+            close_old_connections()
+
+            cfg = TargetConfig.objects.first()
+            if cfg and cfg.is_active:
+                try:
+                    call_command("parse_ffcv_results", *parse_args, stdout=self.stdout, stderr=self.stderr)
+                except Exception as e:
+                    # ошибка уже записана в IngestionRun; планировщик продолжает
+                    self.stderr.write(f"parse_ffcv_results failed: {type(e).__name__}: {e}")
+                base_interval = timedelta(minutes=cfg.poll_interval_minutes)
+            else:
+                base_interval = policy.idle_interval
+                self.stdout.write("TargetConfig missing or inactive, waiting.")
+
+            now = timezone.now()
+            plan = plan_next_poll(now, next_pending_kickoff(now, policy), base_interval, policy)
+            wake_at = timezone.localtime(now + plan.delay)
+            self.stdout.write(
+                f"Next poll in {plan.seconds / 60:.1f} min ({plan.mode}) at {wake_at:%Y-%m-%d %H:%M}"
+                + (f", kickoff {timezone.localtime(plan.kickoff_at):%Y-%m-%d %H:%M}" if plan.kickoff_at else "")
+            )
+
+            if options["once"]:
+                break
+            stop.wait(plan.seconds)
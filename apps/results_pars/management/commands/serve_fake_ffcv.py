@@ -0,0 +1,56 @@
+# apps/results_pars/management/commands/serve_fake_ffcv.py
+from django.core.management.base import BaseCommand
+
+from results_pars.services.fake_ffcv import FakeFFCVConfig, FakeFFCVServer
+
+
+def add_fake_ffcv_arguments(parser):
+    """Параметры подменного сервера — общие с soak_ffcv_ingestion."""
+    parser.add_argument("--fixtures", type=int, default=30, help="Matches per team page.")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Delay before every response.")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Random +- added to the latency.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of responses that are 503 (0..1).")
+    parser.add_argument("--no-etag", action="store_true", help="Do not send ETag (no 304 responses).")
+    parser.add_argument("--filler-kb", type=int, default=0, help="Extra markup per page, like the live site.")
+    parser.add_argument("--seed", type=int, help="Seed for latency jitter and errors.")
+
+
+def fake_ffcv_config(options, teams) -> FakeFFCVConfig:
+    return FakeFFCVConfig(
+        teams=teams,
+        fixtures=options["fixtures"],
+        latency=options["latency_ms"] / 1000.0,
+        jitter=options["jitter_ms"] / 1000.0,
+        error_rate=options["error_rate"],
+        etag=not options["no_etag"],
+        filler_kb=options["filler_kb"],
+        seed=options["seed"],
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve synthetic FFCV pages (equipo_p_partidos.php, partido.php, partido_estadisticas.php) "
+        "for load testing; point TargetConfig.base_url at the printed address."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument(
+            "--team", action="append", metavar="ID=NAME",
+            help='Team served on equipo_p_partidos.php?id_equipo=ID (repeatable; default "1=AT Gilet").',
+        )
+        add_fake_ffcv_arguments(parser)
+
+    def handle(self, *args, **options):
+        teams = dict(t.split("=", 1) for t in options["team"] or ["1=AT Gilet"])
+        server = FakeFFCVServer(fake_ffcv_config(options, teams), host=options["host"], port=options["port"])
+        self.stdout.write(f"Fake FFCV at {server.base_url} serving {', '.join(f'{i}={n}' for i, n in teams.items())}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            s = server.stats
+            self.stdout.write(f"Served {s.requests} requests ({s.errors} errors, {s.not_modified} not modified)")
@@ -0,0 +1,157 @@
+# apps/results_pars/management/commands/soak_ffcv_ingestion.py
+import gc
+import io
+import resource
+import shlex
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from results_pars.models import (
+    ArchivedPage, CompetitionContext, IngestionRun, Match, Round, StandingsRow, StandingsSnapshot,
+    TargetConfig, Team, Venue,
+)
+from results_pars.services.fake_ffcv import FakeFFCVServer
+
+from .serve_fake_ffcv import add_fake_ffcv_arguments, fake_ffcv_config
+
+COUNTED_MODELS = (Match, Team, Venue, Round, CompetitionContext, StandingsSnapshot, StandingsRow, IngestionRun, ArchivedPage)
+
+
+def rss_kib() -> int:
+    """Текущий RSS процесса (Linux /proc), иначе пиковый из getrusage."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def percentile(values, p: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Soak test: run parse_ffcv_results repeatedly against a local fake FFCV server and report "
+        "throughput, p95 run time, memory growth and DB row counts. Use a scratch database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=20)
+        parser.add_argument(
+            "--advance-every", type=int, default=0,
+            help="Play the next round on the fake site every N runs (0 = pages never change).",
+        )
+        parser.add_argument(
+            "--parse-args", default="",
+            help='Arguments for parse_ffcv_results, e.g. "--workers 8 --batch-size 50 --no-cache".',
+        )
+        parser.add_argument(
+            "--force", action="store_true",
+            help="Run even with DEBUG off (the harness rewrites TargetConfig and writes synthetic matches).",
+        )
+        add_fake_ffcv_arguments(parser)
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options["force"]:
+            raise CommandError("Soak runs write synthetic data; run them on a scratch DB with DEBUG=True or --force.")
+
+        cfg = TargetConfig.objects.first()
+        created_cfg = cfg is None
+        if created_cfg:
+            cfg = TargetConfig.objects.create(target_ffcv_team_id="1")
+        saved = {f: getattr(cfg, f) for f in ("is_active", "base_url", "calendar_url_template", "standings_url_template")}
+        teams = {str(t.ffcv_team_id): t.name for t in cfg.targets()}
+        if not teams:
+            raise CommandError("TargetConfig has no target team.")
+
+        parse_args = shlex.split(options["parse_args"])
+        server = FakeFFCVServer(fake_ffcv_config(options, teams)).start()
+        try:
+            # сайт-подмена отдаёт только страницы команд и матчей
+            cfg.is_active, cfg.base_url = True, server.base_url
+            cfg.calendar_url_template = cfg.standings_url_template = None
+            cfg.save()
+            self.soak(server, parse_args, options)
+        finally:
+            server.stop()
+            if created_cfg:
+                cfg.delete()
+            else:
+                for field, value in saved.items():
+                    setattr(cfg, field, value)
+                cfg.save()
+
+    def soak(self, server: FakeFFCVServer, parse_args, options):
+        rows_before = self.row_counts()
+        durations, matches, failures = [], 0, 0
+        gc.collect()
+        rss = [rss_kib()]
+
+        self.stdout.write(
+            f"Fake FFCV at {server.base_url}: {len(server.config.teams)} teams x {server.config.fixtures} fixtures, "
+            f"latency {server.config.latency * 1000:.0f} ms, error rate {server.config.error_rate:.0%}"
+        )
+        started = time.perf_counter()
+        for i in range(1, options["runs"] + 1):
+            if options["advance_every"] and i > 1 and (i - 1) % options["advance_every"] == 0:
+                server.advance()
+
+            last_id = IngestionRun.objects.order_by("-id").values_list("id", flat=True).first() or 0
+            requests_before = server.stats.requests
+            t0 = time.perf_counter()
+            error = ""
+            try:
+                call_command("parse_ffcv_results", *parse_args, stdout=io.StringIO(), stderr=io.StringIO())
+            except Exception as e:
+                # с одной целевой командой parse_ffcv_results пробрасывает исходную ошибку
+                # (HTTPError после всех повторов и т.п.) — это упавший прогон, а не конец замера
+                failures += 1
+                error = f"  {type(e).__name__}"
+            durations.append(time.perf_counter() - t0)
+
+            runs = list(IngestionRun.objects.filter(id__gt=last_id))
+            matches += sum(r.parsed_matches for r in runs)
+            gc.collect()
+            rss.append(rss_kib())
+            self.stdout.write(
+                f"run {i:>3}: {durations[-1]:6.2f}s  {server.stats.requests - requests_before:>4} requests  "
+                f"{sum(r.parsed_matches for r in runs):>4} matches  "
+                f"{', '.join(sorted({r.status for r in runs})) or '-'}  rss {rss[-1] / 1024:.1f} MiB{error}"
+            )
+        elapsed = time.perf_counter() - started
+
+        s = server.stats
+        self.stdout.write("")
+        self.stdout.write(
+            f"Throughput: {matches / elapsed:.1f} matches/s, {s.requests / elapsed:.1f} requests/s "
+            f"({s.errors} injected errors, {s.not_modified} not modified)"
+        )
+        self.stdout.write(
+            f"Run time: median {statistics.median(durations):.2f}s, p95 {percentile(durations, 95):.2f}s, "
+            f"max {max(durations):.2f}s; {failures} failed runs"
+        )
+        # первый прогон прогревает импорты и кеши — рост считаем от него
+        base = rss[1] if len(rss) > 2 else rss[0]
+        self.stdout.write(
+            f"Memory: RSS {rss[0] / 1024:.1f} -> {rss[-1] / 1024:.1f} MiB, "
+            f"growth after first run {(rss[-1] - base) / 1024:+.1f} MiB"
+        )
+        rows_after = self.row_counts()
+        self.stdout.write("DB rows: " + ", ".join(
+            f"{name} {rows_after[name]} ({rows_after[name] - rows_before[name]:+d})" for name in rows_after
+        ))
+
+    @staticmethod
+    def row_counts():
+        return {model.__name__: model.objects.count() for model in COUNTED_MODELS}
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.9 on 2026-10-18 14:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('results_pars', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ingestionrun',
+            name='changed_matches',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='ingestionrun',
+            name='skipped_matches',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='ingestionrun',
+            name='unchanged_matches',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
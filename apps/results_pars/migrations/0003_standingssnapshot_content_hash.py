@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-18 15:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('results_pars', '0002_ingestionrun_incremental_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='standingssnapshot',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=64),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.9 on 2026-10-18 15:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('results_pars', '0004_ingestionrun_metrics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BackfillCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('team_ffcv_id', models.CharField(max_length=64)),
+                ('ffcv_temp_id', models.CharField(max_length=64)),
+                ('state', models.CharField(choices=[('PENDING', 'PENDING'), ('IN_PROGRESS', 'IN_PROGRESS'), ('DONE', 'DONE'), ('ERROR', 'ERROR')], default='PENDING', max_length=12)),
+                ('next_row', models.PositiveIntegerField(default=0)),
+                ('total_rows', models.PositiveIntegerField(blank=True, null=True)),
+                ('written_matches', models.PositiveIntegerField(default=0)),
+                ('skipped_matches', models.PositiveIntegerField(default=0)),
+                ('requests_used', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='backfillcheckpoint',
+            constraint=models.UniqueConstraint(fields=('team_ffcv_id', 'ffcv_temp_id'), name='uniq_backfill_team_season'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.9 on 2026-10-18 15:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('results_pars', '0005_backfillcheckpoint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ingestionrun',
+            name='archived_pages',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='ArchivedPage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField(max_length=500)),
+                ('kind', models.CharField(choices=[('team', 'team'), ('detail', 'detail'), ('calendar', 'calendar'), ('standings', 'standings')], max_length=10)),
+                ('body_sha256', models.CharField(db_index=True, max_length=64)),
+                ('size', models.PositiveIntegerField(default=0)),
+                ('fetched_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('run', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='pages', to='results_pars.ingestionrun')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['url', '-id'], name='archivedpage_url_latest')],
+            },
+        ),
+    ]
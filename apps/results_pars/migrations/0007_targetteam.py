@@ -0,0 +1,41 @@
+# Generated by Django 5.2.9 on 2026-10-18 15:18
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def copy_legacy_target(apps, schema_editor):
+    # единственная команда из TargetConfig -> первая TargetTeam
+    TargetConfig = apps.get_model("results_pars", "TargetConfig")
+    TargetTeam = apps.get_model("results_pars", "TargetTeam")
+    for cfg in TargetConfig.objects.exclude(target_ffcv_team_id__isnull=True).exclude(target_ffcv_team_id=""):
+        TargetTeam.objects.get_or_create(
+            ffcv_team_id=cfg.target_ffcv_team_id,
+            defaults={"config": cfg, "name": cfg.target_team_name},
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('results_pars', '0006_archivedpage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TargetTeam',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('ffcv_team_id', models.CharField(max_length=64, unique=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('config', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='teams', to='results_pars.targetconfig')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='ingestionrun',
+            name='target',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='runs', to='results_pars.targetteam'),
+        ),
+        migrations.RunPython(copy_legacy_target, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.9 on 2026-10-18 15:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('results_pars', '0007_targetteam'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='match',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.CreateModel(
+            name='MatchChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('changed_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('kind', models.CharField(choices=[('CREATED', 'CREATED'), ('UPDATED', 'UPDATED')], default='UPDATED', max_length=10)),
+                ('source', models.CharField(max_length=20)),
+                ('fields', models.JSONField(default=dict)),
+                ('match', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='changes', to='results_pars.match')),
+                ('run', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='match_changes', to='results_pars.ingestionrun')),
+            ],
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.9 on 2026-10-18 15:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('results_pars', '0009_ingestionrun_lease'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('normalized', models.CharField(editable=False, max_length=255, unique=True)),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='results_pars.team')),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-18 15:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('results_pars', '0010_teamalias'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='match',
+            name='status',
+            field=models.CharField(choices=[('SCHEDULED', 'SCHEDULED'), ('LIVE', 'LIVE'), ('PLAYED', 'PLAYED'), ('POSTPONED', 'POSTPONED'), ('CANCELLED', 'CANCELLED'), ('UNKNOWN', 'UNKNOWN')], default='UNKNOWN', max_length=20),
+        ),
+    ]
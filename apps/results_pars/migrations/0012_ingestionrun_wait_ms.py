@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-18 16:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('results_pars', '0011_match_status_live'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ingestionrun',
+            name='wait_ms',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
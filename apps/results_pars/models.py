@@ -1,7 +1,11 @@
 # apps/results_pars/models.py
 from django.db import models
+from django.db.models import Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
+from results_pars.services.team_names import normalize_team_name
+
 
 class TargetConfig(models.Model):
     is_active = models.BooleanField(default=True)
@@ -28,10 +32,31 @@ class TargetConfig(models.Model):
             raise ValueError("Only one TargetConfig record is allowed.")
         return super().save(*args, **kwargs)
 
+    def targets(self):
+        """
+        Активные целевые команды. Пока TargetTeam не заведены — одна команда из
+        target_team_name/target_ffcv_team_id (несохранённый объект).
+        """
+        teams = list(self.teams.filter(is_active=True).order_by("pk")) if self.pk else []
+        if not teams and self.target_ffcv_team_id:
+            teams = [TargetTeam(config=self, name=self.target_team_name, ffcv_team_id=self.target_ffcv_team_id)]
+        return teams
+
     def __str__(self):
         return f"TargetConfig(active={self.is_active}, team={self.target_team_name})"
 
 
+class TargetTeam(models.Model):
+    """Команда клуба, которую парсим (alevín, infantil, cadete...). Общие настройки — в TargetConfig."""
+    config = models.ForeignKey(TargetConfig, on_delete=models.CASCADE, related_name="teams")
+    name = models.CharField(max_length=255)
+    ffcv_team_id = models.CharField(max_length=64, unique=True)
+    is_active = models.BooleanField(default=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.ffcv_team_id})"
+
+
 class Team(models.Model):
     ffcv_team_id = models.CharField(max_length=64, unique=True)
     name = models.CharField(max_length=255)
@@ -42,6 +67,20 @@ class Team(models.Model):
         return self.name
 
 
+class TeamAlias(models.Model):
+    """Другое написание команды на FFCV; normalized — ключ services.team_names.normalize_team_name."""
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="aliases")
+    name = models.CharField(max_length=255)
+    normalized = models.CharField(max_length=255, unique=True, editable=False)
+
+    def save(self, *args, **kwargs):
+        self.normalized = normalize_team_name(self.name)
+        return super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.name} -> {self.team}"
+
+
 class CompetitionContext(models.Model):
     name = models.CharField(max_length=255)
     season_name = models.CharField(max_length=255, blank=True, null=True)
@@ -83,6 +122,7 @@ class Venue(models.Model):
 class Match(models.Model):
     class Status(models.TextChoices):
         SCHEDULED = "SCHEDULED", "SCHEDULED"
+        LIVE = "LIVE", "LIVE"  # идёт: счёт с табло run_ffcv_live, ещё не финальный
         PLAYED = "PLAYED", "PLAYED"
         POSTPONED = "POSTPONED", "POSTPONED"
         CANCELLED = "CANCELLED", "CANCELLED"
@@ -109,6 +149,9 @@ class Match(models.Model):
 
     is_target_match = models.BooleanField(default=False)
 
+    # sha256 полей матча на момент последней записи (services.match_changes): совпал — не пишем
+    content_hash = models.CharField(max_length=64, blank=True, default="")
+
     def __str__(self):
         return f"{self.home_team} - {self.away_team} ({self.kickoff_at})"
 
@@ -119,10 +162,29 @@ class StandingsSnapshot(models.Model):
     captured_at = models.DateTimeField(default=timezone.now)
     source_url = models.URLField()
     is_current = models.BooleanField(default=True)
+    # sha256 по строкам таблицы: новый снимок пишем только при реальном изменении
+    content_hash = models.CharField(max_length=64, blank=True, default="", db_index=True)
 
     def __str__(self):
         return f"Standings {self.competition} @ {self.captured_at:%Y-%m-%d %H:%M}"
 
+    @classmethod
+    def current_for_main_team(cls) -> "StandingsSnapshot | None":
+        """
+        Актуальная таблица соревнования главной команды клуба: TargetConfig.target_ffcv_team_id,
+        иначе первая активная TargetTeam. У каждой команды клуба своя таблица — берём ту,
+        где есть строка главной. Один запрос (id команды — подзапросами).
+        """
+        main_team_id = Coalesce(
+            Subquery(TargetConfig.objects.exclude(target_ffcv_team_id="").values("target_ffcv_team_id")[:1]),
+            Subquery(TargetTeam.objects.filter(is_active=True).order_by("pk").values("ffcv_team_id")[:1]),
+        )
+        return (
+            cls.objects.filter(is_current=True, rows__team__ffcv_team_id=main_team_id)
+            .order_by("-captured_at")
+            .first()
+        )
+
 
 class StandingsRow(models.Model):
     snapshot = models.ForeignKey(StandingsSnapshot, on_delete=models.CASCADE, related_name="rows")
@@ -147,10 +209,13 @@ class StandingsRow(models.Model):
 
 class IngestionRun(models.Model):
     class RunStatus(models.TextChoices):
+        RUNNING = "RUNNING", "RUNNING"
         SUCCESS = "SUCCESS", "SUCCESS"
         ERROR = "ERROR", "ERROR"
         SKIPPED = "SKIPPED", "SKIPPED"
 
+    target = models.ForeignKey(TargetTeam, on_delete=models.SET_NULL, related_name="runs", blank=True, null=True)
+
     started_at = models.DateTimeField(default=timezone.now)
     finished_at = models.DateTimeField(blank=True, null=True)
     status = models.CharField(max_length=10, choices=RunStatus.choices, default=RunStatus.SKIPPED)
@@ -158,7 +223,105 @@ class IngestionRun(models.Model):
     parsed_matches = models.PositiveIntegerField(default=0)
     updated_matches = models.PositiveIntegerField(default=0)
 
+    # инкрементальный режим: skipped — partido.php не запрашивали (финальный матч без изменений);
+    # changed — MatchWriter создал/изменил строку, unchanged — отпечаток (content_hash) совпал с БД
+    skipped_matches = models.PositiveIntegerField(default=0)
+    changed_matches = models.PositiveIntegerField(default=0)
+    unchanged_matches = models.PositiveIntegerField(default=0)
+
+    # замеры прогона (RunMetrics): время стадий — сумма по потокам, мс
+    http_requests = models.PositiveIntegerField(default=0)
+    bytes_downloaded = models.PositiveBigIntegerField(default=0)
+    fetch_ms = models.PositiveIntegerField(default=0)  # запросы по сети
+    wait_ms = models.PositiveIntegerField(default=0)  # rate limiter и паузы между повторами
+    parse_ms = models.PositiveIntegerField(default=0)
+    db_ms = models.PositiveIntegerField(default=0)
+    db_queries = models.PositiveIntegerField(default=0)
+    slowest_urls = models.JSONField(default=list, blank=True)  # [{"url": ..., "ms": ...}], по убыванию
+    archived_pages = models.PositiveIntegerField(default=0)  # страниц, отмеченных в архиве за прогон
+
     errors = models.TextField(blank=True, null=True)
 
+    # аренда (services.lease): пока прогон идёт, lease_key = "ffcv:<id команды>" — второй прогон
+    # той же команды не создастся (unique); heartbeat_at обновляется, по нему находим упавшие прогоны
+    lease_key = models.CharField(max_length=64, unique=True, blank=True, null=True)
+    heartbeat_at = models.DateTimeField(blank=True, null=True)
+
+    @property
+    def duration(self):
+        return self.finished_at - self.started_at if self.finished_at else None
+
     def __str__(self):
         return f"IngestionRun({self.status}) {self.started_at:%Y-%m-%d %H:%M}"
+
+
+class MatchChange(models.Model):
+    """Журнал реальных изменений матчей: какие поля поменялись (старое и новое значение), когда и чем."""
+
+    class Kind(models.TextChoices):
+        CREATED = "CREATED", "CREATED"
+        UPDATED = "UPDATED", "UPDATED"
+
+    match = models.ForeignKey(Match, on_delete=models.CASCADE, related_name="changes")
+    run = models.ForeignKey(IngestionRun, on_delete=models.SET_NULL, related_name="match_changes", blank=True, null=True)
+    changed_at = models.DateTimeField(default=timezone.now, db_index=True)
+    kind = models.CharField(max_length=10, choices=Kind.choices, default=Kind.UPDATED)
+    source = models.CharField(max_length=20)  # ingest / calendar / live
+    fields = models.JSONField(default=dict)  # {"home_score": [null, 2], ...}, FK — id
+
+    def __str__(self):
+        return f"{self.match_id} {self.kind} {', '.join(self.fields)} ({self.changed_at:%Y-%m-%d %H:%M})"
+
+
+class ArchivedPage(models.Model):
+    """Версия страницы FFCV, использованная прогоном; тело — в FFCV_ARCHIVE_DIR по body_sha256."""
+
+    class Kind(models.TextChoices):
+        TEAM = "team", "team"
+        DETAIL = "detail", "detail"
+        CALENDAR = "calendar", "calendar"
+        STANDINGS = "standings", "standings"
+
+    run = models.ForeignKey(IngestionRun, on_delete=models.SET_NULL, related_name="pages", blank=True, null=True)
+    url = models.URLField(max_length=500)
+    kind = models.CharField(max_length=10, choices=Kind.choices)
+    body_sha256 = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveIntegerField(default=0)
+    fetched_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [models.Index(fields=["url", "-id"], name="archivedpage_url_latest")]
+
+    def __str__(self):
+        return f"{self.kind} {self.url} @ {self.body_sha256[:12]}"
+
+
+class BackfillCheckpoint(models.Model):
+    """Прогресс backfill_ffcv_history по сезону (id_temp) команды: с какой строки продолжать."""
+
+    class State(models.TextChoices):
+        PENDING = "PENDING", "PENDING"
+        IN_PROGRESS = "IN_PROGRESS", "IN_PROGRESS"
+        DONE = "DONE", "DONE"
+        ERROR = "ERROR", "ERROR"
+
+    team_ffcv_id = models.CharField(max_length=64)
+    ffcv_temp_id = models.CharField(max_length=64)
+    state = models.CharField(max_length=12, choices=State.choices, default=State.PENDING)
+
+    next_row = models.PositiveIntegerField(default=0)  # строк страницы команды уже обработано
+    total_rows = models.PositiveIntegerField(blank=True, null=True)
+    written_matches = models.PositiveIntegerField(default=0)
+    skipped_matches = models.PositiveIntegerField(default=0)  # уже были в БД
+    requests_used = models.PositiveIntegerField(default=0)
+
+    last_error = models.TextField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["team_ffcv_id", "ffcv_temp_id"], name="uniq_backfill_team_season")
+        ]
+
+    def __str__(self):
+        return f"Backfill {self.team_ffcv_id}/{self.ffcv_temp_id}: {self.state} {self.next_row}/{self.total_rows or '?'}"
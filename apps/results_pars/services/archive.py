@@ -0,0 +1,115 @@
+# results_pars/services/archive.py
+"""
+Архив сырых страниц FFCV для повторного разбора без сети (reparse_ffcv_archive).
+Тела лежат на диске по sha256 содержимого (root/<xx>/<sha>.html.gz): одна версия страницы —
+один файл на все прогоны. В БД (ArchivedPage) — какие версии каких URL использовал прогон,
+в том числе неизменные и взятые из кеша.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import requests
+
+from results_pars.models import ArchivedPage, IngestionRun
+
+from .http_client import HttpStats
+from .metrics import RunMetrics
+from .page_cache import PageCache
+
+
+class PageArchive:
+    def __init__(self, root: Path | str):
+        self.root = Path(root)
+
+    @staticmethod
+    def body_hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def store(self, text: str) -> str:
+        """Сохраняет тело (если такого ещё нет) и возвращает его sha256."""
+        sha = self.body_hash(text)
+        path = self.path(sha)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            PageCache._atomic_write(path, gzip.compress(text.encode("utf-8")))
+        return sha
+
+    def read(self, sha: str) -> str:
+        return gzip.decompress(self.path(sha).read_bytes()).decode("utf-8")
+
+    def path(self, sha: str) -> Path:
+        return self.root / sha[:2] / f"{sha}.html.gz"
+
+
+class RunArchive:
+    """
+    Хук FFCVParser(archive=...): тело пишется в PageArchive сразу (из любого потока),
+    строки ArchivedPage копятся в памяти и пишутся одним bulk_create в flush().
+    Один URL — одна строка на прогон.
+    """
+
+    def __init__(self, archive: PageArchive, run: IngestionRun):
+        self.archive = archive
+        self.run = run
+        self._pending: List[ArchivedPage] = []
+        self._urls: set = set()
+        self._lock = threading.Lock()
+
+    def record(self, url: str, kind: str, text: str) -> None:
+        with self._lock:
+            if url in self._urls:
+                return
+            self._urls.add(url)
+        sha = self.archive.store(text)
+        page = ArchivedPage(run=self.run, url=url, kind=kind, body_sha256=sha, size=len(text.encode("utf-8")))
+        with self._lock:
+            self._pending.append(page)
+
+    def flush(self) -> int:
+        with self._lock:
+            pending, self._pending = self._pending, []
+        ArchivedPage.objects.bulk_create(pending)
+        return len(pending)
+
+
+def latest_pages(up_to_run: Optional[int] = None) -> Dict[str, tuple[str, str]]:
+    """url -> (kind, sha256) последней архивной версии каждой страницы (на момент прогона up_to_run)."""
+    qs = ArchivedPage.objects.all()
+    if up_to_run is not None:
+        qs = qs.filter(run_id__lte=up_to_run)
+
+    latest: Dict[str, tuple[str, str]] = {}
+    for url, kind, sha in qs.order_by("url", "-id").values_list("url", "kind", "body_sha256").iterator():
+        latest.setdefault(url, (kind, sha))
+    return latest
+
+
+class ArchiveHttpClient:
+    """HttpClient без сети: отдаёт архивные версии страниц; URL, которого нет в архиве, — 404."""
+
+    def __init__(self, archive: PageArchive, pages: Dict[str, tuple[str, str]]):
+        self.archive = archive
+        self.pages = pages
+        self.stats = HttpStats()
+
+    def get(self, url: str, headers: Optional[dict] = None, timing: Optional[RunMetrics] = None) -> requests.Response:
+        entry = self.pages.get(url)
+        r = requests.Response()
+        r.url = url
+        r.encoding = "utf-8"
+        r.status_code = 200 if entry else 404
+        r._content = self.archive.read(entry[1]).encode("utf-8") if entry else b""
+        self.stats.requests += 1
+        r.raise_for_status()
+        return r
+
+    def get_text(self, url: str, headers: Optional[dict] = None) -> str:
+        return self.get(url, headers=headers).text
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,115 @@
+# results_pars/services/calendar.py
+from __future__ import annotations
+
+import re
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+
+from results_pars.models import CompetitionContext, IngestionRun, Match, Round
+
+from .ffcv_parser import CalendarEntry, FFCVParser
+from .match_changes import MatchChangeLog
+
+
+def season_year_for_temp(temp_id) -> Optional[int]:
+    """Год начала сезона по id_temp FFCV из settings.FFCV_SEASON_YEARS (ключи — строки или числа)."""
+    if temp_id in (None, ""):
+        return None
+    years = getattr(settings, "FFCV_SEASON_YEARS", {}) or {}
+    year = years.get(str(temp_id), years.get(temp_id))
+    if year is None and str(temp_id).isdigit():
+        year = years.get(int(temp_id))
+    return int(year) if year is not None else None
+
+
+def season_label(year: int) -> str:
+    return f"{year}-{year + 1}"
+
+
+def season_start_year(competition: CompetitionContext, today: Optional[date] = None) -> int:
+    """
+    Год начала сезона соревнования:
+    1) settings.FFCV_SEASON_YEARS[ffcv_temp_id];
+    2) первый год из season_name ("2025-2026", "2025/26");
+    3) текущий сезон (с августа — этот год, раньше — прошлый).
+    """
+    year = season_year_for_temp(competition.ffcv_temp_id)
+    if year is not None:
+        return year
+
+    m = re.search(r"\b(19|20)\d{2}\b", competition.season_name or "")
+    if m:
+        return int(m.group(0))
+
+    today = today or date.today()
+    return today.year if today.month >= FFCVParser.SEASON_FIRST_MONTH else today.year - 1
+
+
+class CalendarWriter:
+    """
+    Календарь соревнования -> БД пачкой: Round (тур + дата тура) для всех jornadas
+    и kickoff_at/round у уже известных матчей. Запросов — константа на соревнование.
+    """
+
+    def __init__(self, run: Optional[IngestionRun] = None):
+        self.run = run
+
+    def write(self, competition: CompetitionContext, entries: Iterable[CalendarEntry]) -> tuple[int, int]:
+        """Возвращает (туров создано/обновлено, матчей обновлено)."""
+        entries = list(entries)
+        rounds, rounds_written = self._rounds(competition, entries)
+
+        by_key = {e.external_key: e for e in entries}
+        matches = Match.objects.filter(competition=competition, external_key__in=list(by_key))
+
+        log = MatchChangeLog("calendar", self.run)
+        to_update: List[Match] = []
+        for match in matches:
+            e = by_key[match.external_key]
+            kickoff_at = e.kickoff_at or match.kickoff_at
+            round_ = rounds.get(e.round_number) or match.round
+            if (kickoff_at, getattr(round_, "pk", None)) != (match.kickoff_at, match.round_id):
+                before = log.before(match)
+                match.kickoff_at = kickoff_at
+                match.round = round_
+                if log.track(match, before):
+                    to_update.append(match)
+        if to_update:
+            Match.objects.bulk_update(to_update, ["kickoff_at", "round", "content_hash"])
+        log.flush()
+
+        return rounds_written, len(to_update)
+
+    def _rounds(self, competition: CompetitionContext, entries: List[CalendarEntry]) -> tuple[Dict[int, Round], int]:
+        # дата тура — самая ранняя дата среди его матчей (заголовок jornada или первый матч)
+        dates: Dict[int, Optional[date]] = {}
+        for e in entries:
+            if e.round_number is None:
+                continue
+            d = e.round_date or (e.kickoff_at.date() if e.kickoff_at else None)
+            current = dates.get(e.round_number)
+            dates[e.round_number] = min(filter(None, (current, d)), default=None)
+
+        existing = {r.round_number: r for r in Round.objects.filter(competition=competition, round_number__in=list(dates))}
+
+        to_create = [
+            Round(competition=competition, round_number=number, round_date=d)
+            for number, d in dates.items() if number not in existing
+        ]
+        to_update = []
+        for number, d in dates.items():
+            r = existing.get(number)
+            if r is not None and d and r.round_date != d:
+                r.round_date = d
+                to_update.append(r)
+
+        if to_create:
+            Round.objects.bulk_create(to_create)
+            # MySQL не возвращает pk из bulk_create — перечитываем
+            existing = {r.round_number: r for r in Round.objects.filter(competition=competition, round_number__in=list(dates))}
+        if to_update:
+            Round.objects.bulk_update(to_update, ["round_date"])
+
+        return existing, len(to_create) + len(to_update)
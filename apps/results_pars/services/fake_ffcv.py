@@ -0,0 +1,179 @@
+# results_pars/services/fake_ffcv.py
+"""
+Локальная подмена ffcv.es для нагрузочных и soak-прогонов: HTTP-сервер отдаёт синтетические
+equipo_p_partidos.php / partido.php / partido_estadisticas.php (services.synthetic_pages)
+с настраиваемой задержкой, долей ошибок 503 и числом матчей. Поддерживает ETag/304, как живой сайт.
+"""
+from __future__ import annotations
+
+import hashlib
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+from .synthetic_pages import partido_estadisticas_html, partido_html, team_matches_html
+
+
+@dataclass
+class FakeFFCVConfig:
+    teams: Dict[str, str] = field(default_factory=lambda: {"1": "AT Gilet"})  # id_equipo -> имя
+    fixtures: int = 30
+    latency: float = 0.05       # секунд на ответ
+    jitter: float = 0.0         # +- к latency, равномерно
+    error_rate: float = 0.0     # доля ответов 503 (HttpClient их повторяет)
+    etag: bool = True
+    filler_kb: int = 0
+    seed: Optional[int] = None
+
+
+@dataclass
+class FakeFFCVStats:
+    requests: int = 0
+    errors: int = 0
+    not_modified: int = 0
+    bytes_sent: int = 0
+    by_page: Dict[str, int] = field(default_factory=dict)
+
+
+class FakeFFCVServer:
+    """
+    ThreadingHTTPServer в фоновом потоке. У каждой команды свой диапазон id_partido,
+    так что матчи разных целевых команд не пересекаются.
+    advance() «играет» следующий тур: меняются страницы команд (как у живого сайта по выходным).
+    """
+
+    def __init__(self, config: Optional[FakeFFCVConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or FakeFFCVConfig()
+        self.stats = FakeFFCVStats()
+        self.played = self.config.fixtures // 2
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeFFCVServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-ffcv", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeFFCVServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def advance(self, rounds: int = 1) -> None:
+        with self._lock:
+            self.played = min(self.config.fixtures, self.played + rounds)
+
+    def render(self, path: str) -> tuple[int, Optional[str], str]:
+        """(status, тело, тип страницы) для пути запроса."""
+        url = urlparse(path)
+        qs = parse_qs(url.query)
+        page = url.path.rsplit("/", 1)[-1]
+        cfg = self.config
+
+        if page == "equipo_p_partidos.php":
+            team_id = (qs.get("id_equipo") or [""])[0]
+            if team_id not in cfg.teams:
+                return 404, None, page
+            index = list(cfg.teams).index(team_id)
+            return 200, team_matches_html(
+                cfg.teams[team_id], cfg.fixtures,
+                played=self.played, filler_kb=cfg.filler_kb, id_base=self.id_base(index),
+            ), page
+
+        id_partido = (qs.get("id_partido") or [""])[0]
+        if not re.fullmatch(r"\d+", id_partido):
+            return 404, None, page
+        id_partido = int(id_partido)
+        if page == "partido.php":
+            return 200, partido_html(id_partido, filler_kb=cfg.filler_kb), page
+        if page == "partido_estadisticas.php":
+            number = id_partido % 1000
+            played = number <= self.played
+            return 200, partido_estadisticas_html(
+                id_partido,
+                number % 4 if played else None,
+                number % 3 if played else None,
+                finished=played,
+                filler_kb=cfg.filler_kb,
+            ), page
+        return 404, None, page
+
+    @staticmethod
+    def id_base(team_index: int) -> int:
+        return 1000 * (team_index + 1)
+
+    def _delay(self) -> float:
+        cfg = self.config
+        with self._lock:
+            return max(0.0, cfg.latency + self._random.uniform(-cfg.jitter, cfg.jitter))
+
+    def _fails(self) -> bool:
+        with self._lock:
+            return self._random.random() < self.config.error_rate
+
+    def _count(self, page: str, nbytes: int = 0, error: bool = False, not_modified: bool = False) -> None:
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.bytes_sent += nbytes
+            self.stats.errors += error
+            self.stats.not_modified += not_modified
+            self.stats.by_page[page] = self.stats.by_page.get(page, 0) + 1
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                time.sleep(server._delay())
+                status, text, page = server.render(self.path)
+
+                if status == 200 and server._fails():
+                    status, text = 503, None
+                if status != 200:
+                    server._count(page, error=status >= 500)
+                    return self._reply(status, b"")
+
+                body = text.encode("utf-8")
+                etag = '"%s"' % hashlib.md5(body).hexdigest()
+                if server.config.etag and self.headers.get("If-None-Match") == etag:
+                    server._count(page, not_modified=True)
+                    return self._reply(304, b"", etag)
+                server._count(page, len(body))
+                self._reply(200, body, etag if server.config.etag else None)
+
+            def _reply(self, status: int, body: bytes, etag: Optional[str] = None):
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                if etag:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,376 @@
+# results_pars/services/ffcv_html.py
+"""
+HTML-бэкенды для страниц FFCV: достают из equipo_p_partidos.php / partido.php только нужные
+фрагменты (table.sobrestante, input#fecha/#hora, p.nombre_campo, таблицы классификации
+и календаря) в сыром виде.
+Вся логика (счёт, статус, ключи) остаётся в FFCVParser, так что бэкенды взаимозаменяемы:
+- "soup"     — BeautifulSoup(html.parser), полное дерево (как было изначально);
+- "strainer" — BeautifulSoup(lxml) + SoupStrainer: строятся только нужные теги;
+- "lxml"     — lxml.html + XPath по вырезанному фрагменту table.sobrestante, без объектов bs4 (по умолчанию).
+"""
+from __future__ import annotations
+
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+
+import lxml.html
+from bs4 import BeautifulSoup, SoupStrainer
+
+
+@dataclass
+class RawRow:
+    """Строка-матч из table.sobrestante, тексты как в get_text(" ", strip=True)."""
+    home_name: str
+    away_name: str
+    match_href: str
+    time_text: Optional[str]
+    row_text: str
+    venue_name: Optional[str]
+    date_text: Optional[str]  # последняя строка-дата (div.fecha) над матчем
+
+
+@dataclass
+class RawStandingRow:
+    """Строка турнирной таблицы: заголовок столбца (в нижнем регистре) -> текст ячейки."""
+    team_name: str
+    team_href: Optional[str]
+    cells: Dict[str, str]
+
+
+@dataclass
+class RawCalendarRow:
+    """Матч из календаря соревнования (calendario.php), под заголовком своей jornada."""
+    round_number: Optional[int]
+    round_text: Optional[str]   # текст заголовка jornada, в нём обычно дата тура
+    home_name: str
+    away_name: str
+    match_href: str
+    row_text: str
+    venue_name: Optional[str]
+
+
+@dataclass
+class RawScore:
+    """Табло страницы матча (partido_estadisticas.php): текст блока со счётом."""
+    score_text: Optional[str]
+    finished: bool  # на странице есть отметка о завершении матча
+
+
+@dataclass
+class RawDetail:
+    fecha: Optional[str]
+    hora: Optional[str]
+    campo: Optional[str]  # текст первого p.nombre_campo
+
+
+def _has_class(cls: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')"
+
+
+class HtmlBackend(ABC):
+    name = ""
+
+    @abstractmethod
+    def team_rows(self, html: str) -> Iterator[RawRow]:
+        """Строки-матчи table.sobrestante страницы команды."""
+
+    @abstractmethod
+    def match_detail(self, html: str) -> RawDetail:
+        """Дата, время и поле со страницы partido.php."""
+
+    # заголовки, по которым узнаём турнирную таблицу среди прочих <table> на странице
+    STANDINGS_MARKERS = frozenset({"pts", "ptos", "puntos", "pt"})
+
+    def standings_rows(self, html: str) -> Iterator[RawStandingRow]:
+        """
+        Таблица классификации: первая <table>, у которой в строке заголовков есть столбец очков.
+        Страница редкая и маленькая, поэтому одна реализация (lxml) на все бэкенды.
+        """
+        doc = _doc(html)
+        if doc is None:
+            return
+
+        for table in doc.xpath("//table"):
+            header = table.xpath(".//tr[th][1]/th")
+            headers = [_text(th).lower().rstrip(".") for th in header]
+            if not self.STANDINGS_MARKERS.intersection(headers):
+                continue
+
+            for tr in table.xpath(".//tr[td]"):
+                tds = tr.xpath("./td")
+                team_a = tr.xpath(".//a[normalize-space()]")
+                if len(tds) != len(headers) or not team_a:
+                    continue
+                yield RawStandingRow(
+                    team_name=_text(team_a[0]),
+                    team_href=team_a[0].get("href"),
+                    cells={h: _text(td) for h, td in zip(headers, tds)},
+                )
+            return
+
+    JORNADA_RE = re.compile(r"jornada\s*(\d+)", re.IGNORECASE)
+    XP_CALENDAR = (
+        "//tr | //caption | //h2 | //h3 | //h4"
+        f" | //div[{_has_class('jornada')} or {_has_class('fecha')}]"
+    )
+
+    def calendar_rows(self, html: str) -> Iterator[RawCalendarRow]:
+        """
+        Календарь: идём по документу сверху вниз; заголовок с "Jornada N" (th/caption/h*/div.jornada)
+        задаёт текущий тур, строка со ссылкой на partido(_estadisticas).php — матч этого тура.
+        Команды — ссылки в строке кроме ссылки на матч (первая и последняя). Как и классификация,
+        страница редкая — одна реализация (lxml) на все бэкенды.
+        """
+        doc = _doc(html)
+        if doc is None:
+            return
+
+        round_number, round_text = None, None
+        for el in doc.xpath(self.XP_CALENDAR):
+            match_a = el.xpath(".//a[contains(@href, 'partido')][contains(@href, 'id_partido=')]") if el.tag == "tr" else []
+            if not match_a:
+                text = _text(el)
+                m = self.JORNADA_RE.search(text)
+                # у tr-заголовка не должно быть вложенных матчей; div.fecha без "Jornada" — просто дата тура
+                if m:
+                    round_number, round_text = int(m.group(1)), text
+                elif el.tag == "div" and text:
+                    round_text = text
+                continue
+
+            teams = [a for a in el.xpath(".//a[normalize-space()]") if "id_partido=" not in (a.get("href") or "")]
+            if len(teams) < 2:
+                continue
+            venue_td = el.xpath(f".//td[{_has_class('estadio')}]")
+            yield RawCalendarRow(
+                round_number=round_number,
+                round_text=round_text,
+                home_name=_text(teams[0]),
+                away_name=_text(teams[-1]),
+                match_href=match_a[0].get("href"),
+                row_text=_text(el),
+                venue_name=_text(venue_td[0]) if venue_td else None,
+            )
+
+    XP_SCORE = (
+        f"//*[{_has_class('marcador')} or {_has_class('resultado')} or {_has_class('hora_marcador')}]"
+    )
+    FINISHED_RE = re.compile(r"\b(finalizado|final del partido|acta cerrada)\b", re.IGNORECASE)
+
+    def match_score(self, html: str) -> RawScore:
+        """
+        Счёт на странице матча: первый блок табло (.marcador/.resultado/.hora_marcador) вида "N - M".
+        Страницу опрашивает только live-режим, поэтому одна реализация (lxml) на все бэкенды.
+        """
+        doc = _doc(html)
+        if doc is None:
+            return RawScore(score_text=None, finished=False)
+
+        score_text = None
+        for el in doc.xpath(self.XP_SCORE):
+            text = _text(el)
+            if re.search(r"\d+\s*-\s*\d+", text):
+                score_text = text
+                break
+        return RawScore(score_text=score_text, finished=bool(self.FINISHED_RE.search(_text(doc))))
+
+
+class SoupBackend(HtmlBackend):
+    name = "soup"
+
+    def _team_soup(self, html: str) -> BeautifulSoup:
+        return BeautifulSoup(html, "html.parser")
+
+    def _detail_soup(self, html: str) -> BeautifulSoup:
+        return BeautifulSoup(html, "html.parser")
+
+    def team_rows(self, html: str) -> Iterator[RawRow]:
+        table = self._team_soup(html).select_one("table.sobrestante")
+        if not table:
+            return
+
+        current_date = None
+        for tr in table.select("tbody > tr"):
+            # Строка-разделитель даты
+            fecha = tr.select_one("div.fecha")
+            if fecha:
+                current_date = fecha.get_text(" ", strip=True)
+                continue
+
+            tds = tr.find_all("td")
+            if len(tds) < 5:
+                continue
+
+            # Команды: обычно 1-й и 5-й td с классом td_nombre_partidos
+            home_a = tds[0].find("a")
+            away_a = tds[4].find("a")
+            match_a = tr.select_one("a[href*='partido_estadisticas.php']")
+            if not home_a or not away_a or not match_a or not match_a.get("href"):
+                continue
+
+            hora_span = tr.select_one("span.hora_marcador")
+            venue_td = tr.select_one("td.estadio")
+
+            yield RawRow(
+                home_name=home_a.get_text(" ", strip=True),
+                away_name=away_a.get_text(" ", strip=True),
+                match_href=match_a["href"],
+                time_text=hora_span.get_text(" ", strip=True) if hora_span else None,
+                row_text=tr.get_text(" ", strip=True),
+                venue_name=venue_td.get_text(" ", strip=True) if venue_td else None,
+                date_text=current_date,
+            )
+
+    def match_detail(self, html: str) -> RawDetail:
+        soup = self._detail_soup(html)
+        fecha = soup.select_one("input#fecha")
+        hora = soup.select_one("input#hora")
+        campo = soup.select_one("p.nombre_campo")
+        return RawDetail(
+            fecha=fecha.get("value") if fecha else None,
+            hora=hora.get("value") if hora else None,
+            campo=campo.get_text(" ", strip=True) if campo else None,
+        )
+
+
+class StrainerBackend(SoupBackend):
+    """Тот же обход bs4, но дерево строится только из нужных тегов (парсер lxml)."""
+    name = "strainer"
+
+    TEAM_STRAINER = SoupStrainer("table", class_="sobrestante")
+    DETAIL_STRAINER = SoupStrainer(["input", "p"])
+
+    def _team_soup(self, html: str) -> BeautifulSoup:
+        return BeautifulSoup(html, "lxml", parse_only=self.TEAM_STRAINER)
+
+    def _detail_soup(self, html: str) -> BeautifulSoup:
+        return BeautifulSoup(html, "lxml", parse_only=self.DETAIL_STRAINER)
+
+
+def _doc(html: str):
+    if not html or not html.strip():
+        return None
+    try:
+        return lxml.html.fromstring(html)
+    except ValueError:
+        # строка с <?xml encoding=...?> — lxml принимает такое только байтами
+        return lxml.html.fromstring(html.encode("utf-8"))
+
+
+_TABLE_TAG_RE = re.compile(r"<(/?)table\b[^>]*>", re.IGNORECASE)
+_SOBRESTANTE_RE = re.compile(
+    r"""<table\b[^>]*\bclass\s*=\s*["']?[^"'>]*(?<![\w-])sobrestante(?![\w-])""", re.IGNORECASE
+)
+
+
+def _table_fragment(html: str, open_re: re.Pattern = _SOBRESTANTE_RE) -> Optional[str]:
+    """
+    Вырезает из страницы первую таблицу, чей открывающий тег совпал с open_re (с учётом вложенных <table>).
+    None — такой таблицы нет. Незакрытая таблица — до конца документа, как её закрыл бы парсер.
+    """
+    start = open_re.search(html)
+    if not start:
+        return None
+    depth = 0
+    for tag in _TABLE_TAG_RE.finditer(html, start.start()):
+        depth += -1 if tag.group(1) else 1
+        if depth == 0:
+            return html[start.start():tag.end()]
+    return html[start.start():]
+
+
+def _text(el) -> str:
+    # аналог bs4 get_text(" ", strip=True)
+    return " ".join(t.strip() for t in el.itertext() if t.strip())
+
+
+class LxmlBackend(HtmlBackend):
+    name = "lxml"
+
+    XP_TABLE = f"//table[{_has_class('sobrestante')}]"
+    XP_FECHA = f".//div[{_has_class('fecha')}]"
+    XP_MATCH_A = ".//a[contains(@href, 'partido_estadisticas.php')]"
+    XP_HORA = f".//span[{_has_class('hora_marcador')}]"
+    XP_ESTADIO = f".//td[{_has_class('estadio')}]"
+    XP_CAMPO = f"//p[{_has_class('nombre_campo')}]"
+
+    def team_rows(self, html: str) -> Iterator[RawRow]:
+        table = self._results_table(html)
+        if table is None:
+            return
+
+        current_date = None
+        for tr in table.xpath("./tbody/tr"):
+            fecha = tr.xpath(self.XP_FECHA)
+            if fecha:
+                current_date = _text(fecha[0])
+                continue
+
+            tds = tr.xpath(".//td")
+            if len(tds) < 5:
+                continue
+
+            home_a = tds[0].xpath(".//a")
+            away_a = tds[4].xpath(".//a")
+            match_a = tr.xpath(self.XP_MATCH_A)
+            if not home_a or not away_a or not match_a or not match_a[0].get("href"):
+                continue
+
+            hora_span = tr.xpath(self.XP_HORA)
+            venue_td = tr.xpath(self.XP_ESTADIO)
+
+            yield RawRow(
+                home_name=_text(home_a[0]),
+                away_name=_text(away_a[0]),
+                match_href=match_a[0].get("href"),
+                time_text=_text(hora_span[0]) if hora_span else None,
+                row_text=_text(tr),
+                venue_name=_text(venue_td[0]) if venue_td else None,
+                date_text=current_date,
+            )
+
+    def _results_table(self, html: str):
+        """
+        table.sobrestante: lxml разбирает только вырезанный фрагмент, а не всю страницу
+        (меню, скрипты, подвал FFCV). Не нашли по тегу (необычная разметка) — разбираем целиком.
+        """
+        fragment = _table_fragment(html) if html else None
+        if fragment is not None:
+            table = lxml.html.fragment_fromstring(fragment)
+            if table.tag == "table":
+                return table
+        doc = _doc(html)
+        tables = doc.xpath(self.XP_TABLE) if doc is not None else []
+        return tables[0] if tables else None
+
+    def match_detail(self, html: str) -> RawDetail:
+        doc = _doc(html)
+        if doc is None:
+            return RawDetail(fecha=None, hora=None, campo=None)
+        fecha = doc.xpath("//input[@id='fecha']")
+        hora = doc.xpath("//input[@id='hora']")
+        campo = doc.xpath(self.XP_CAMPO)
+        return RawDetail(
+            fecha=fecha[0].get("value") if fecha else None,
+            hora=hora[0].get("value") if hora else None,
+            campo=_text(campo[0]) if campo else None,
+        )
+
+
+BACKENDS: Dict[str, type] = {b.name: b for b in (SoupBackend, StrainerBackend, LxmlBackend)}
+DEFAULT_BACKEND = LxmlBackend.name
+
+
+def get_backend(backend: str | HtmlBackend | None = None) -> HtmlBackend:
+    if isinstance(backend, HtmlBackend):
+        return backend
+    name = backend or DEFAULT_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown FFCV HTML backend {name!r}; choose from {', '.join(BACKENDS)}.")
+    return BACKENDS[name]()
+
+
+def backend_names() -> List[str]:
+    return list(BACKENDS)
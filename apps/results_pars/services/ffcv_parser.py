@@ -2,15 +2,22 @@
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
-from datetime import datetime
-from typing import Optional, List
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, asdict
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, Optional, List, Set
 from urllib.parse import urlparse, parse_qs, urlencode, urljoin
 
-import requests
-from bs4 import BeautifulSoup
 from django.utils import timezone
 
+from .ffcv_html import DEFAULT_BACKEND, HtmlBackend, get_backend
+from .http_client import HttpClient
+from .metrics import RunMetrics
+from .page_cache import CachedPage, PageCache
+from .rate_limit import HostRateLimiter
+from .team_names import normalize_team_name
+
 
 @dataclass
 class ParsedMatch:
@@ -32,24 +39,211 @@ class ParsedMatch:
 
     venue_name: Optional[str]
 
+    # True — дата/поле взяты из БД (KnownMatch), partido.php не запрашивался
+    detail_skipped: bool = False
+
+
+@dataclass
+class ParsedStanding:
+    position: int
+    team_name: str
+    played: int
+    wins: int
+    draws: int
+    losses: int
+    goals_for: int
+    goals_against: int
+    goal_diff: int
+    points: int
+
+
+@dataclass(frozen=True)
+class KnownMatch:
+    """
+    То, что уже лежит в БД по матчу (для инкрементального режима): решает только, нужен ли partido.php.
+    Изменилось ли что-то ещё, решает MatchWriter по content_hash.
+    """
+    status: str
+    kickoff_at: Optional[datetime]
+    venue_name: Optional[str]
+    home_score: Optional[int]
+    away_score: Optional[int]
+    round_number: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class LiveScore:
+    """Счёт с табло страницы матча (live-режим)."""
+    home_score: int
+    away_score: int
+    finished: bool
+
+
+@dataclass
+class CalendarEntry:
+    """Матч из календаря соревнования: тур, дата тура и (если есть время) начало матча."""
+    external_key: str
+    round_number: Optional[int]
+    round_date: Optional[date]
+    kickoff_at: Optional[datetime]
+    venue_name: Optional[str]
+    home_name: str
+    away_name: str
+
+    def to_json(self) -> dict:
+        data = asdict(self)
+        data["round_date"] = self.round_date.isoformat() if self.round_date else None
+        data["kickoff_at"] = self.kickoff_at.isoformat() if self.kickoff_at else None
+        return data
+
+    @classmethod
+    def from_json(cls, data: dict) -> "CalendarEntry":
+        data = dict(data)
+        data["round_date"] = date.fromisoformat(data["round_date"]) if data.get("round_date") else None
+        data["kickoff_at"] = datetime.fromisoformat(data["kickoff_at"]) if data.get("kickoff_at") else None
+        return cls(**data)
+
+
+@dataclass
+class FetchedPage:
+    url: str
+    text: str
+    body_sha256: Optional[str] = None
+    changed: bool = True  # False — тело то же, что и в прошлый раз (304 / тот же хеш / свежий кеш)
+    parsed: Any = None    # сохранённый ранее разбор именно этой версии тела
+
 
 class FFCVParser:
     USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120 Safari/537.36"
 
-    def __init__(self, base_url: str, team_matches_url_template: str, target_team_id: str, target_team_name: str):
+    # partido.php тянем пулом потоков; лимит — на хост, чтобы не долбить ffcv.es
+    DEFAULT_MAX_WORKERS = 6
+    DEFAULT_RATE_LIMIT = 10.0  # запросов в секунду на хост
+
+    # статусы, после которых данные матча на FFCV уже не меняются
+    FINAL_STATUSES = frozenset({"PLAYED", "CANCELLED"})
+
+    def __init__(
+        self,
+        base_url: str,
+        team_matches_url_template: str,
+        target_team_id: str,
+        target_team_name: str,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limit: float = DEFAULT_RATE_LIMIT,
+        http: Optional[HttpClient] = None,
+        cache: Optional[PageCache] = None,
+        html_backend: str | HtmlBackend = DEFAULT_BACKEND,
+        metrics: Optional[RunMetrics] = None,
+        archive=None,
+    ):
         self.base_url = base_url.rstrip("/")
         self.team_matches_url_template = team_matches_url_template
         self.target_team_id = str(target_team_id)
         self.target_team_name = target_team_name.strip()
+        # нормализованные алиасы целевой команды (TeamIndex.keys_for) — другие её написания на FFCV
+        self.target_aliases: Set[str] = set()
+        self.max_workers = max(1, int(max_workers))
+        self.rate_limiter = HostRateLimiter(rate_limit)
+        # один клиент (пул keep-alive соединений) на весь прогон; пул не меньше числа потоков
+        self._owns_http = http is None
+        self.http = http or HttpClient(
+            user_agent=self.USER_AGENT,
+            pool_size=max(self.max_workers, 4),
+            rate_limiter=self.rate_limiter,
+        )
+        self.cache = cache
+        self.html = get_backend(html_backend)
+        self.metrics = metrics or RunMetrics()
+        self.archive = archive  # RunArchive (services.archive) или None
 
     def build_team_matches_url(self) -> str:
         path = self.team_matches_url_template.format(team_id=self.target_team_id)
         return urljoin(self.base_url + "/", path.lstrip("/"))
 
     def fetch(self, url: str) -> str:
-        r = requests.get(url, headers={"User-Agent": self.USER_AGENT}, timeout=30)
-        r.raise_for_status()
-        return r.text
+        return self._get(url).text
+
+    def _get(self, url: str, headers: Optional[dict] = None):
+        r = self.http.get(url, headers=headers, timing=self.metrics)
+        self.metrics.response(HttpClient.wire_bytes(r))
+        return r
+
+    def close(self) -> None:
+        # общий HttpClient, переданный снаружи, закрывает владелец
+        if self._owns_http:
+            self.http.close()
+
+    def fetch_page(self, url: str, max_age: Optional[float] = 0.0, kind: str = "team") -> FetchedPage:
+        """
+        fetch() через дисковый кеш (если он задан):
+        - max_age=None — если страница есть в кеше, не запрашиваем её вовсе;
+        - иначе кеш моложе max_age секунд отдаём без запроса, старше — conditional GET
+          (If-None-Match / If-Modified-Since). 304 или тот же хеш тела => changed=False.
+        Каждое использованное прогоном тело (и из кеша тоже) отмечается в архиве, если он задан:
+        иначе страница, полученная до включения архива, в нём так и не появится.
+        kind — team/detail/calendar/standings.
+        """
+        page = self._fetch_page(url, max_age)
+        if self.archive is not None:
+            self.archive.record(url, kind, page.text)
+        return page
+
+    def _fetch_page(self, url: str, max_age: Optional[float]) -> FetchedPage:
+        if self.cache is None:
+            return FetchedPage(url=url, text=self.fetch(url))
+
+        cached = self.cache.get(url)
+        if cached and (max_age is None or (max_age and cached.age <= max_age)):
+            self.cache.count("fresh_hits")
+            return self._page_from_cache(cached)
+
+        headers = {}
+        if cached and cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached and cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+
+        r = self._get(url, headers=headers or None)
+        now = time.time()
+
+        if r.status_code == 304 and cached:
+            self.cache.count("not_modified")
+            self.cache.touch(url, fetched_at=now)
+            return self._page_from_cache(cached)
+
+        body_sha256 = PageCache.body_hash(r.content)
+        unchanged = cached is not None and cached.body_sha256 == body_sha256
+        page = CachedPage(
+            url=url,
+            text=r.text,
+            body_sha256=body_sha256,
+            etag=r.headers.get("ETag"),
+            last_modified=r.headers.get("Last-Modified"),
+            fetched_at=now,
+            parsed=cached.parsed if unchanged else None,
+            parsed_sha256=cached.parsed_sha256 if unchanged else None,
+        )
+        self.cache.put(page)
+        self.cache.count("unchanged" if unchanged else "changed")
+
+        if unchanged:
+            return self._page_from_cache(page)
+        return FetchedPage(url=url, text=page.text, body_sha256=body_sha256)
+
+    def _page_from_cache(self, cached: CachedPage) -> FetchedPage:
+        return FetchedPage(
+            url=cached.url,
+            text=cached.text,
+            body_sha256=cached.body_sha256,
+            changed=False,
+            parsed=cached.parsed_for_body(),
+        )
+
+    def _remember_parsed(self, page: FetchedPage, payload: Any) -> None:
+        """Сохраняем разбор рядом с телом: при неизменном теле в следующий раз парсить не придётся."""
+        if self.cache is not None and page.body_sha256:
+            self.cache.set_parsed(page.url, page.body_sha256, payload)
     
     def build_partido_url(self, any_match_url: str) -> str:
         qs = parse_qs(urlparse(any_match_url).query)
@@ -57,70 +251,231 @@ class FFCVParser:
         return urljoin(self.base_url + "/", "partido.php?" + urlencode(flat))
 
 
-    def fetch_match_detail(self, partido_url: str) -> tuple[Optional[datetime], Optional[str]]:
-        html = self.fetch(partido_url)
-        soup = BeautifulSoup(html, "html.parser")
+    def fetch_match_detail(self, partido_url: str, max_age: Optional[float] = 0.0) -> tuple[Optional[datetime], Optional[str]]:
+        page = self.fetch_page(partido_url, max_age=max_age, kind="detail")
+        if page.parsed is not None:
+            return self._detail_from_json(page.parsed)
+
+        kickoff_at, venue_name = self.parse_match_detail(page.text)
+        self._remember_parsed(page, {
+            "kickoff_at": kickoff_at.isoformat() if kickoff_at else None,
+            "venue_name": venue_name,
+        })
+        return kickoff_at, venue_name
 
-        fecha = soup.select_one("input#fecha")
-        hora = soup.select_one("input#hora")
+    def parse_match_detail(self, html: str) -> tuple[Optional[datetime], Optional[str]]:
+        """Разбор partido.php без сети: (kickoff_at, venue_name)."""
+        with self.metrics.stage("parse"):
+            raw = self.html.match_detail(html)
 
         kickoff_at = None
-        if fecha and hora and fecha.get("value") and hora.get("value"):
+        if raw.fecha and raw.hora:
             # fecha: dd-mm-yyyy, hora: HH:MM
-            d, m, y = map(int, fecha["value"].strip().split("-"))
-            hh, mm = map(int, hora["value"].strip().split(":"))
+            d, m, y = map(int, raw.fecha.strip().split("-"))
+            hh, mm = map(int, raw.hora.strip().split(":"))
             kickoff_at = timezone.make_aware(
                 datetime(y, m, d, hh, mm),
                 timezone.get_current_timezone()
             )
 
-        # venue: первый p.nombre_campo обычно содержит поле
+        # venue: первый p.nombre_campo обычно содержит поле; режем хвостовой |
         venue_name = None
-        ps = soup.select("p.nombre_campo")
-        if ps:
-            # берём первый, режем хвостовой |
-            v = ps[0].get_text(" ", strip=True)
-            venue_name = v.replace("|", "").strip() or None
+        if raw.campo:
+            venue_name = raw.campo.replace("|", "").strip() or None
 
         return kickoff_at, venue_name
 
-    def parse_team_matches(self) -> List[ParsedMatch]:
-        url = self.build_team_matches_url()
-        html = self.fetch(url)
-        soup = BeautifulSoup(html, "html.parser")
+    @staticmethod
+    def _detail_from_json(data: dict) -> tuple[Optional[datetime], Optional[str]]:
+        kickoff_at = datetime.fromisoformat(data["kickoff_at"]) if data.get("kickoff_at") else None
+        return kickoff_at, data.get("venue_name")
 
-        table = soup.select_one("table.sobrestante")
-        if not table:
-            return []
+    def _detail_max_age(self, pm: ParsedMatch, partido_url: str) -> Optional[float]:
+        """
+        TTL для partido.php: матч сыгран и по кешу известно, что давно (старше settled_after) —
+        страница уже не поменяется, не запрашиваем её (None). Остальные — по revalidate_after.
+        """
+        if self.cache is None:
+            return 0.0
+
+        policy = self.cache.policy
+        if pm.status == "PLAYED":
+            cached = self.cache.get(partido_url)
+            data = cached.parsed_for_body() if cached else None
+            if data is not None:
+                kickoff_at, _ = self._detail_from_json(data)
+                if kickoff_at and kickoff_at < timezone.now() - policy.settled_after:
+                    return None
+        return policy.revalidate_after
+
+    def fetch_live_score(self, match_url: str) -> Optional[LiveScore]:
+        """
+        Табло идущего матча (partido_estadisticas.php / partido.php) — всегда conditional GET.
+        None — счёта на странице нет (матч ещё не начался) или страница не менялась с прошлого опроса.
+        """
+        page = self.fetch_page(match_url, max_age=0.0, kind="detail")
+        if not page.changed:
+            return None
+        return self.parse_live_score(page.text)
 
-        current_date = None  # текстовая дата (isquad), дату в datetime соберём позже при наличии года
-        parsed: List[ParsedMatch] = []
+    def parse_live_score(self, html: str) -> Optional[LiveScore]:
+        with self.metrics.stage("parse"):
+            raw = self.html.match_score(html)
+        m = re.search(r"(\d+)\s*-\s*(\d+)", raw.score_text or "")
+        if not m:
+            return None
+        return LiveScore(home_score=int(m.group(1)), away_score=int(m.group(2)), finished=raw.finished)
 
-        for tr in table.select("tbody > tr"):
-            # Строка-разделитель даты
-            fecha = tr.select_one("div.fecha")
-            if fecha:
-                current_date = fecha.get_text(" ", strip=True)
-                continue
+    def fetch_match_details(
+        self,
+        partido_urls: List[str],
+        max_ages: Optional[List[Optional[float]]] = None,
+    ) -> List[tuple[Optional[datetime], Optional[str]]]:
+        """
+        fetch_match_detail для списка url через пул потоков (max_workers).
+        Порядок результатов совпадает с порядком partido_urls.
+        """
+        if max_ages is None:
+            max_ages = [0.0] * len(partido_urls)
 
-            tds = tr.find_all("td")
-            if len(tds) < 5:
-                continue
+        if self.max_workers <= 1 or len(partido_urls) <= 1:
+            return [self.fetch_match_detail(u, a) for u, a in zip(partido_urls, max_ages)]
 
-            # Команды: обычно 1-й и 5-й td с классом td_nombre_partidos
-            home_a = tds[0].find("a")
-            away_a = tds[4].find("a")
-            if not home_a or not away_a:
-                continue
+        workers = min(self.max_workers, len(partido_urls))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ffcv-detail") as pool:
+            return list(pool.map(self.fetch_match_detail, partido_urls, max_ages))
+
+    def parse_team_matches(
+        self,
+        known: Optional[Dict[str, KnownMatch]] = None,
+        calendar: Optional[Dict[str, CalendarEntry]] = None,
+    ) -> List[ParsedMatch]:
+        """
+        known — снимок БД (external_key -> KnownMatch). Для завершённых матчей, у которых
+        в списке ничего не поменялось, partido.php не запрашиваем: дата и поле берутся из known.
+        calendar — разобранные календари соревнований (external_key -> CalendarEntry): тур и дата
+        берутся оттуда, partido.php — только если в календаре нет времени матча или поля.
+        Список в порядке строк страницы команды.
+        """
+        return [pm for _, pm in sorted(self._iter_team_matches(known, calendar), key=lambda item: item[0])]
+
+    def iter_team_matches(
+        self,
+        known: Optional[Dict[str, KnownMatch]] = None,
+        calendar: Optional[Dict[str, CalendarEntry]] = None,
+    ) -> Iterator[ParsedMatch]:
+        """
+        То же, что parse_team_matches, но потоком: матчи, которым partido.php не нужен, отдаются сразу,
+        остальные — по мере готовности деталей (порядок не сохраняется).
+        Если потребитель бросил генератор, ещё не начатые запросы отменяются.
+        """
+        for _, pm in self._iter_team_matches(known, calendar):
+            yield pm
+
+    def _iter_team_matches(
+        self,
+        known: Optional[Dict[str, KnownMatch]],
+        calendar: Optional[Dict[str, CalendarEntry]],
+    ) -> Iterator[tuple[int, ParsedMatch]]:
+        """(номер строки на странице, ParsedMatch) по мере готовности."""
+        known = known or {}
+        calendar = calendar or {}
+        rows = self.team_rows()
+
+        detail_rows = []
+        for index, (pm, pu) in enumerate(rows):
+            if self.fill_without_detail(pm, known.get(pm.external_key), calendar.get(pm.external_key)):
+                yield index, pm
+            else:
+                detail_rows.append((index, pm, pu))
+
+        if not detail_rows:
+            return
+
+        def with_detail(index: int, pm: ParsedMatch, partido_url: str) -> tuple[int, ParsedMatch]:
+            self.fill_from_detail(pm, *self.fetch_match_detail(partido_url, self._detail_max_age(pm, partido_url)))
+            return index, pm
+
+        if self.max_workers <= 1 or len(detail_rows) <= 1:
+            for row in detail_rows:
+                yield with_detail(*row)
+            return
+
+        pool = ThreadPoolExecutor(max_workers=min(self.max_workers, len(detail_rows)), thread_name_prefix="ffcv-detail")
+        try:
+            futures = [pool.submit(with_detail, *row) for row in detail_rows]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # исключение или брошенный генератор: ждём только уже идущие запросы
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def team_rows(self, url: Optional[str] = None) -> List[tuple[ParsedMatch, str]]:
+        """
+        Строки страницы команды (по умолчанию — build_team_matches_url()) без деталей:
+        (ParsedMatch без даты, partido_url), в порядке страницы. Разбор кешируется вместе с телом.
+        """
+        url = url or self.build_team_matches_url()
+        page = self.fetch_page(url, max_age=self.cache.policy.revalidate_after if self.cache else 0.0)
+
+        if page.parsed is not None:
+            # страница не поменялась — берём строки из прошлого разбора
+            return [(ParsedMatch(**r["match"]), r["partido_url"]) for r in page.parsed]
 
-            home_name = home_a.get_text(" ", strip=True)
-            away_name = away_a.get_text(" ", strip=True)
+        with self.metrics.stage("parse"):
+            rows = self._parse_team_rows(page.text, url)
+        self._remember_parsed(page, [{"match": asdict(pm), "partido_url": pu} for pm, pu in rows])
+        return rows
+
+    def fill_without_detail(
+        self, pm: ParsedMatch, k: Optional[KnownMatch], entry: Optional[CalendarEntry]
+    ) -> bool:
+        """
+        Дата, поле и тур строки из БД (финальный матч) или календаря. True — partido.php не нужен.
+        Тот же порядок у reparse_ffcv_archive: архив разбирается так же, как его получил прогон.
+        """
+        if k and self._is_settled(pm, k):
+            pm.kickoff_at = k.kickoff_at
+            pm.venue_name = pm.venue_name or k.venue_name
+            # тур мог прийти из календаря, а не со страницы команды — не теряем его
+            pm.round_number = pm.round_number or k.round_number
+            pm.detail_skipped = True
+            return True
+
+        if entry:
+            pm.round_number = pm.round_number or entry.round_number
+            pm.kickoff_at = entry.kickoff_at
+            pm.venue_name = pm.venue_name or entry.venue_name or (k.venue_name if k else None)
+        return bool(pm.kickoff_at and pm.venue_name)
+
+    @staticmethod
+    def fill_from_detail(pm: ParsedMatch, detail_kickoff: Optional[datetime], detail_venue: Optional[str]) -> None:
+        if detail_kickoff:
+            pm.kickoff_at = detail_kickoff
+        if (not pm.venue_name) and detail_venue:
+            pm.venue_name = detail_venue
+
+    def _is_settled(self, pm: ParsedMatch, k: KnownMatch) -> bool:
+        """Матч в БД уже финальный и строка списка с ним совпадает — деталь не нужна."""
+        return (
+            k.status in self.FINAL_STATUSES
+            and k.kickoff_at is not None
+            and pm.status == k.status
+            and (pm.home_score, pm.away_score) == (k.home_score, k.away_score)
+            and (not pm.venue_name or pm.venue_name == k.venue_name)
+        )
+
+    def _parse_team_rows(self, html: str, url: str) -> List[tuple[ParsedMatch, str]]:
+        """Строки table.sobrestante -> (ParsedMatch без даты, partido_url)."""
+        rows: List[tuple[ParsedMatch, str]] = []
+
+        # текстовая дата строки (raw.date_text, isquad) без года — дату в datetime берём из partido.php
+        for raw in self.html.team_rows(html):
+            home_name = raw.home_name
+            away_name = raw.away_name
 
             # Ссылка на матч и id_partido
-            match_a = tr.select_one("a[href*='partido_estadisticas.php']")
-            if not match_a:
-                continue
-            href = match_a.get("href")
+            href = raw.match_href
             source_url = urljoin(self.base_url + "/", href)
 
             id_partido = self._extract_query_param(source_url, "id_partido")
@@ -130,33 +485,15 @@ class FFCVParser:
             if not id_partido:
                 continue
 
-            # Время / маркер (может быть hora_marcador или marcador)
-            hora_span = tr.select_one("span.hora_marcador")
-            time_text = hora_span.get_text(" ", strip=True) if hora_span else None
-
             # Счёт (если сыгран): иногда отдельный span, подхватим общим regex по строке tr
-            tr_text = tr.get_text(" ", strip=True)
-            m_score = re.search(r"(\d+)\s*-\s*(\d+)", tr_text)
+            m_score = re.search(r"(\d+)\s*-\s*(\d+)", raw.row_text)
             home_score = int(m_score.group(1)) if m_score else None
             away_score = int(m_score.group(2)) if m_score else None
 
             status = "PLAYED" if (home_score is not None and away_score is not None) else "SCHEDULED"
 
             # Стадион (иногда пусто в списке)
-            venue_td = tr.select_one("td.estadio")
-            venue_name = venue_td.get_text(" ", strip=True) if venue_td else None
-
-            # дату/время и поле ВСЕГДА берём из partido.php (там есть год)
-            kickoff_at = None
-
-            partido_url = self.build_partido_url(source_url)
-            detail_kickoff, detail_venue = self.fetch_match_detail(partido_url)
-
-            if detail_kickoff:
-                kickoff_at = detail_kickoff
-
-            if (not venue_name) and detail_venue:
-                venue_name = detail_venue
+            venue_name = raw.venue_name
 
             # Jornada иногда есть в URL исходной страницы как jornada=...
             round_number = self._extract_query_param(url, "jornada")
@@ -168,18 +505,19 @@ class FFCVParser:
 
             external_key = f"isquad:{id_partido}"
 
-            # Фильтр на целевую команду (на всякий случай)
+            # Фильтр на целевую команду (на всякий случай) — до запроса partido.php
             if not self._is_target_match(home_name, away_name):
                 continue
 
-            parsed.append(
+            # дату/время и поле — из календаря или partido.php (там есть год), в _iter_team_matches
+            rows.append((
                 ParsedMatch(
                     external_key=external_key,
                     source_url=source_url,
                     competition_name=competition_name,
                     season_name=season_name,
                     round_number=round_number,
-                    kickoff_at=kickoff_at,
+                    kickoff_at=None,
                     home_name=home_name,
                     away_name=away_name,
                     home_score=home_score,
@@ -187,14 +525,121 @@ class FFCVParser:
                     status=status,
                     result_note=None,
                     venue_name=venue_name,
-                )
-            )
+                ),
+                self.build_partido_url(source_url),
+            ))
+
+        return rows
+
+    # заголовки столбцов классификации isquad -> поле ParsedStanding
+    STANDINGS_COLUMNS = {
+        "pos": "position", "#": "position", "posición": "position",
+        "pts": "points", "ptos": "points", "puntos": "points", "pt": "points",
+        "j": "played", "pj": "played", "jug": "played",
+        "g": "wins", "pg": "wins",
+        "e": "draws", "pe": "draws",
+        "p": "losses", "pp": "losses",
+        "gf": "goals_for", "f": "goals_for",
+        "gc": "goals_against", "c": "goals_against",
+        "dg": "goal_diff", "dif": "goal_diff",
+    }
+
+    def build_competition_url(self, template: str, competition) -> Optional[str]:
+        """
+        standings_url_template / calendar_url_template с плейсхолдерами {team_id}, {temp_id},
+        {modalidad_id}, {competicion_id}, {torneo_id}. Если у соревнования нет нужного id — None.
+        """
+        ids = {
+            "team_id": self.target_team_id,
+            "temp_id": competition.ffcv_temp_id,
+            "modalidad_id": competition.ffcv_modalidad_id,
+            "competicion_id": competition.ffcv_competicion_id,
+            "torneo_id": competition.ffcv_torneo_id,
+        }
+        try:
+            path = template.format(**{k: v for k, v in ids.items() if v})
+        except KeyError:
+            return None
+        return urljoin(self.base_url + "/", path.lstrip("/"))
 
-        return parsed
+    def parse_standings(self, url: str) -> List[ParsedStanding]:
+        page = self.fetch_page(url, max_age=self.cache.policy.revalidate_after if self.cache else 0.0, kind="standings")
+        if page.parsed is not None:
+            return [ParsedStanding(**r) for r in page.parsed]
+
+        rows: List[ParsedStanding] = []
+        with self.metrics.stage("parse"):
+            raws = list(self.html.standings_rows(page.text))
+        for index, raw in enumerate(raws, start=1):
+            values = {}
+            for header, text in raw.cells.items():
+                field = self.STANDINGS_COLUMNS.get(header)
+                m = re.search(r"-?\d+", text)
+                if field and m and field not in values:
+                    values[field] = int(m.group(0))
+
+            goals_for = values.get("goals_for", 0)
+            goals_against = values.get("goals_against", 0)
+            rows.append(ParsedStanding(
+                position=values.get("position", index),
+                team_name=raw.team_name,
+                played=values.get("played", 0),
+                wins=values.get("wins", 0),
+                draws=values.get("draws", 0),
+                losses=values.get("losses", 0),
+                goals_for=goals_for,
+                goals_against=goals_against,
+                goal_diff=values.get("goal_diff", goals_for - goals_against),
+                points=values.get("points", 0),
+            ))
+
+        self._remember_parsed(page, [asdict(r) for r in rows])
+        return rows
+
+    def parse_calendar(self, url: str, season_year: Optional[int] = None) -> List[CalendarEntry]:
+        """
+        Календарь соревнования целиком (все jornadas одним запросом).
+        season_year — год начала сезона: нужен, если даты в календаре без года ("12 De octubre").
+        Матчи без ссылки с id_partido пропускаем — их не с чем связать.
+        """
+        page = self.fetch_page(url, max_age=self.cache.policy.revalidate_after if self.cache else 0.0, kind="calendar")
+        if page.parsed is not None and page.parsed.get("season_year") == season_year:
+            return [CalendarEntry.from_json(e) for e in page.parsed["entries"]]
+
+        entries = self.parse_calendar_html(page.text, season_year)
+        self._remember_parsed(page, {"season_year": season_year, "entries": [e.to_json() for e in entries]})
+        return entries
+
+    def parse_calendar_html(self, html: str, season_year: Optional[int] = None) -> List[CalendarEntry]:
+        """Разбор тела календаря без запроса (нужен и reparse_ffcv_archive)."""
+        entries: List[CalendarEntry] = []
+        with self.metrics.stage("parse"):
+            raws = list(self.html.calendar_rows(html))
+        for raw in raws:
+            id_partido = self._extract_query_param(urljoin(self.base_url + "/", raw.match_href), "id_partido")
+            if not id_partido:
+                continue
+
+            # дата: у строки (если своя) или у заголовка jornada; время — только у строки
+            row_date = self._parse_ffcv_date(raw.row_text, season_year)
+            round_date = self._parse_ffcv_date(raw.round_text, season_year)
+            match_date = row_date or round_date
+
+            entries.append(CalendarEntry(
+                external_key=f"isquad:{id_partido}",
+                round_number=raw.round_number,
+                round_date=round_date or row_date,
+                kickoff_at=self._build_kickoff_datetime(match_date, raw.row_text),
+                venue_name=raw.venue_name or None,
+                home_name=raw.home_name,
+                away_name=raw.away_name,
+            ))
+        return entries
 
     def _is_target_match(self, home: str, away: str) -> bool:
-        t = self.target_team_name.lower()
-        return t in home.lower() or t in away.lower()
+        """Одна из сторон — целевая команда: по нормализованному названию или его алиасу (target_aliases)."""
+        keys = {normalize_team_name(self.target_team_name), *self.target_aliases}
+        return normalize_team_name(home) in keys or normalize_team_name(away) in keys
 
     def _extract_query_param(self, url: str, key: str) -> Optional[str]:
         try:
@@ -204,37 +649,60 @@ class FFCVParser:
         except Exception:
             return None
 
-    def _build_kickoff_datetime(self, date_text: Optional[str], time_text: Optional[str]) -> Optional[datetime]:
+    MONTHS = {
+        "enero": 1, "febrero": 2, "marzo": 3, "abril": 4, "mayo": 5, "junio": 6,
+        "julio": 7, "agosto": 8, "septiembre": 9, "setiembre": 9, "octubre": 10,
+        "noviembre": 11, "diciembre": 12,
+    }
+    # сезон FFCV начинается летом: месяцы с августа — год начала сезона, остальные — следующий
+    SEASON_FIRST_MONTH = 8
+
+    @classmethod
+    def _parse_ffcv_date(cls, text: Optional[str], season_year: Optional[int] = None) -> Optional[date]:
         """
-        isquad даёт дату без года: 'miércoles, 31 De diciembre'
-        и время: '12:00'
-        Год лучше брать из id_temp/сезона, но для первого запуска:
-        - если год не определён, вернём None (чтобы не ломать данные).
-        Позже сделаем маппинг id_temp -> сезонный год.
+        Дата из текста FFCV:
+        - полная 'dd-mm-yyyy' / 'dd/mm/yyyy' (календарь, partido.php);
+        - isquad без года: 'miércoles, 31 De diciembre' — год по season_year (год начала сезона).
         """
-        if not date_text or not time_text:
+        if not text:
             return None
 
+        m = re.search(r"\b(\d{1,2})[-/](\d{1,2})[-/](\d{4})\b", text)
+        if m:
+            try:
+                return date(int(m.group(3)), int(m.group(2)), int(m.group(1)))
+            except ValueError:
+                return None
+
         # извлекаем день и месяц (исп. 'De diciembre' и т.п.)
-        m = re.search(r"(\d{1,2})\s+De\s+([A-Za-záéíóúñ]+)", date_text, flags=re.IGNORECASE)
-        if not m:
+        m = re.search(r"(\d{1,2})\s+De\s+([A-Za-záéíóúñ]+)", text, flags=re.IGNORECASE)
+        if not m or season_year is None:
             return None
-        day = int(m.group(1))
-        month_name = m.group(2).lower()
-
-        month_map = {
-            "enero": 1, "febrero": 2, "marzo": 3, "abril": 4, "mayo": 5, "junio": 6,
-            "julio": 7, "agosto": 8, "septiembre": 9, "setiembre": 9, "octubre": 10,
-            "noviembre": 11, "diciembre": 12,
-        }
-        month = month_map.get(month_name)
+        month = cls.MONTHS.get(m.group(2).lower())
         if not month:
             return None
+        year = season_year if month >= cls.SEASON_FIRST_MONTH else season_year + 1
+        try:
+            return date(year, month, int(m.group(1)))
+        except ValueError:
+            return None
 
-        tm = re.search(r"(\d{1,2}):(\d{2})", time_text)
+    def _build_kickoff_datetime(self, day: Optional[date], time_text: Optional[str]) -> Optional[datetime]:
+        """
+        day — из _parse_ffcv_date (год уже известен), time_text — любой текст с 'HH:MM'.
+        Без даты или времени — None (чтобы не ломать данные): такие матчи дозаполняет partido.php.
+        """
+        if not day or not time_text:
+            return None
+
+        tm = re.search(r"\b(\d{1,2}):(\d{2})\b", time_text)
         if not tm:
             return None
         hh, mm = int(tm.group(1)), int(tm.group(2))
+        if hh > 23 or mm > 59:
+            return None
 
-        # Временно: без года (вернём None). Если хочешь — поставим год сезона вручную в конфиге.
-        return None
+        return timezone.make_aware(
+            datetime(day.year, day.month, day.day, hh, mm),
+            timezone.get_current_timezone()
+        )
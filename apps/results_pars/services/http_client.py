@@ -0,0 +1,132 @@
+# results_pars/services/http_client.py
+from __future__ import annotations
+
+import random
+import threading
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .metrics import RunMetrics
+from .rate_limit import HostRateLimiter
+
+
+@dataclass
+class HttpStats:
+    requests: int = 0
+    retries: int = 0
+    failures: int = 0
+    bytes_downloaded: int = 0  # байты "по проводу" (до распаковки gzip)
+
+
+class HttpClient:
+    """
+    Общий HTTP-клиент для скрейпера FFCV:
+    - один requests.Session с keep-alive пулом (соединение переиспользуется между partido.php);
+    - gzip/deflate;
+    - отдельные таймауты на connect/read;
+    - повторы с экспоненциальной задержкой и jitter на 5xx, таймауты и обрывы соединения;
+    - счётчики запросов и байт (stats);
+    - timing (RunMetrics прогона) в get(): время самого запроса по сети — отдельно от ожидания
+      слота rate limiter и пауз между повторами (RunMetrics.wait).
+    Потокобезопасен для GET из пула потоков FFCVParser.
+    """
+
+    RETRY_STATUSES = frozenset({500, 502, 503, 504})
+
+    DEFAULT_CONNECT_TIMEOUT = 5.0
+    DEFAULT_READ_TIMEOUT = 20.0
+    DEFAULT_MAX_RETRIES = 3
+    DEFAULT_BACKOFF_BASE = 0.5
+    DEFAULT_BACKOFF_MAX = 8.0
+
+    def __init__(
+        self,
+        user_agent: str,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_max: float = DEFAULT_BACKOFF_MAX,
+        pool_size: int = 10,
+        rate_limiter: Optional[HostRateLimiter] = None,
+    ):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max(0, int(max_retries))
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.rate_limiter = rate_limiter
+        self.stats = HttpStats()
+        self._stats_lock = threading.Lock()
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            "User-Agent": user_agent,
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        })
+        # повторы делаем сами (ниже), адаптеру — только размер пула
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, url: str, headers: Optional[dict] = None, timing: Optional[RunMetrics] = None) -> requests.Response:
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                waited = self.rate_limiter.wait(url)
+                if timing and waited:
+                    timing.wait(waited)
+
+            try:
+                with timing.request(url) if timing else nullcontext():
+                    r = self.session.get(url, headers=headers, timeout=self.timeout)
+            except (requests.Timeout, requests.ConnectionError):
+                self._count(failed=True)
+                if attempt >= self.max_retries:
+                    raise
+            else:
+                self._count(nbytes=self.wire_bytes(r))
+                if r.status_code not in self.RETRY_STATUSES or attempt >= self.max_retries:
+                    r.raise_for_status()
+                    return r
+
+            attempt += 1
+            with self._stats_lock:
+                self.stats.retries += 1
+            delay = self._backoff(attempt)
+            time.sleep(delay)
+            if timing:
+                timing.wait(delay)
+
+    def get_text(self, url: str, headers: Optional[dict] = None) -> str:
+        return self.get(url, headers=headers).text
+
+    def close(self) -> None:
+        self.session.close()
+
+    def _backoff(self, attempt: int) -> float:
+        # "full jitter": случайная задержка в [0, base * 2^attempt], не больше backoff_max
+        cap = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, cap)
+
+    def _count(self, nbytes: int = 0, failed: bool = False) -> None:
+        with self._stats_lock:
+            self.stats.requests += 1
+            self.stats.bytes_downloaded += nbytes
+            if failed:
+                self.stats.failures += 1
+
+    @staticmethod
+    def wire_bytes(r: requests.Response) -> int:
+        # urllib3 считает прочитанные из сокета байты (сжатые); fallback — размер тела
+        tell = getattr(r.raw, "tell", None)
+        try:
+            n = tell() if tell else 0
+        except Exception:
+            n = 0
+        return n or len(r.content)
@@ -0,0 +1,112 @@
+# results_pars/services/lease.py
+"""
+Аренда прогона в БД: одновременно идёт не больше одного IngestionRun на ключ (целевую команду).
+Держатель — строка IngestionRun с lease_key = ключ (уникальное поле, NULL — свободно);
+пока прогон жив, фоновый поток обновляет heartbeat_at. Аренду, у которой heartbeat старше ttl
+(процесс упал или завис), забирает следующий прогон.
+"""
+from __future__ import annotations
+
+import threading
+from datetime import timedelta
+from typing import Optional
+
+from django.db import DatabaseError, IntegrityError, connection, transaction
+from django.utils import timezone
+
+from results_pars.models import IngestionRun
+
+DEFAULT_TTL = timedelta(minutes=10)
+
+
+class LeaseHeld(Exception):
+    """Ключ занят живым прогоном. holder=None — аренду так и не удалось взять: её всё время перехватывали."""
+
+    def __init__(self, holder: Optional[IngestionRun]):
+        self.holder = holder
+        if holder is None:
+            super().__init__("ingestion lease is contended: another run took it on every attempt")
+            return
+        heartbeat = timezone.localtime(holder.heartbeat_at) if holder.heartbeat_at else None
+        super().__init__(
+            f"ingestion already running (run #{holder.pk}, last heartbeat {heartbeat:%Y-%m-%d %H:%M:%S})"
+            if heartbeat else f"ingestion already running (run #{holder.pk})"
+        )
+
+
+class LeaseLost(Exception):
+    """Аренду забрали (heartbeat не успел): прогон должен остановиться, не дописывая."""
+
+
+def acquire_run(key: str, ttl: timedelta = DEFAULT_TTL, **fields) -> IngestionRun:
+    """
+    Создаёт IngestionRun(RUNNING) с арендой key. Занято живым прогоном — LeaseHeld;
+    занято протухшим — тот помечается ERROR, аренда освобождается и берётся заново.
+    Три неудачные попытки подряд — LeaseHeld с последним держателем (или None, если его уже нет).
+    """
+    holder = None
+    for _ in range(3):
+        now = timezone.now()
+        try:
+            with transaction.atomic():
+                return IngestionRun.objects.create(
+                    lease_key=key, heartbeat_at=now, status=IngestionRun.RunStatus.RUNNING, **fields
+                )
+        except IntegrityError:
+            holder = IngestionRun.objects.filter(lease_key=key).first()
+            if holder is None:
+                continue  # держатель успел закончить
+            if holder.heartbeat_at and holder.heartbeat_at > now - ttl:
+                raise LeaseHeld(holder)
+            # compare-and-set по heartbeat: если держатель ожил или аренду уже забрали — не трогаем
+            IngestionRun.objects.filter(pk=holder.pk, lease_key=key, heartbeat_at=holder.heartbeat_at).update(
+                lease_key=None,
+                status=IngestionRun.RunStatus.ERROR,
+                finished_at=now,
+                errors=f"Lease expired: no heartbeat since {holder.heartbeat_at}, reclaimed by a later run.",
+            )
+    raise LeaseHeld(holder)
+
+
+class LeaseHeartbeat:
+    """
+    Фоновый поток: каждые interval обновляет heartbeat_at своей аренды.
+    Если строка аренды больше не наша (забрали как протухшую) — выставляет lost; check() бросает LeaseLost.
+    """
+
+    def __init__(self, run: IngestionRun, ttl: timedelta = DEFAULT_TTL, interval: Optional[timedelta] = None):
+        self.run = run
+        self.interval = (interval or ttl / 3).total_seconds()
+        self.lost = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._beat, name=f"lease-{run.pk}", daemon=True)
+
+    def __enter__(self) -> "LeaseHeartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def check(self) -> None:
+        if self.lost.is_set():
+            raise LeaseLost(f"Lease {self.run.lease_key} was reclaimed by another run.")
+
+    def _beat(self) -> None:
+        try:
+            while not self._stop.wait(self.interval):
+                try:
+                    alive = IngestionRun.objects.filter(pk=self.run.pk, lease_key=self.run.lease_key).update(
+                        heartbeat_at=timezone.now()
+                    )
+                except DatabaseError:
+                    # БД моргнула — попробуем в следующий раз, ttl с запасом на пропуск
+                    connection.close()
+                    continue
+                if not alive:
+                    self.lost.set()
+                    return
+        finally:
+            # у потока своё соединение
+            connection.close()
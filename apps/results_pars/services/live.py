@@ -0,0 +1,110 @@
+# results_pars/services/live.py
+"""
+Live-режим: во время матча опрашиваем только страницы идущих матчей (Match.source_url),
+а не всю страницу команды. Стоимость опроса — по запросу на идущий матч.
+Окно игры — то же, что у планировщика (PollPolicy.lead / window).
+"""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from results_pars.models import Match
+
+from .ffcv_parser import FFCVParser, LiveScore
+from .match_changes import MatchChangeLog
+from .page_cache import PageCache
+from .scheduler import PollPolicy
+
+
+def live_matches(now: datetime, policy: PollPolicy) -> List[Match]:
+    """Целевые матчи, чей kickoff попадает в окно игры [now - window, now + lead] — один запрос."""
+    return list(
+        Match.objects.filter(
+            is_target_match=True,
+            kickoff_at__gte=now - policy.window,
+            kickoff_at__lte=now + policy.lead,
+        )
+        .exclude(status=Match.Status.CANCELLED)
+        .order_by("kickoff_at")
+    )
+
+
+@dataclass
+class ScoreChange:
+    match: Match
+    old: tuple
+    new: LiveScore
+
+
+class LivePoller:
+    """
+    Один проход опроса: табло всех идущих матчей (пулом потоков), изменившийся счёт — сразу в БД,
+    кешированные страницы команд, где этот счёт виден, — из кеша вон (их перечитает обычный прогон).
+    Пока табло не показало finished, матч — LIVE (не финальный статус: планировщик и разбор
+    страницы команды считают его неоконченным); PLAYED — только по finished. Завершённые матчи
+    запоминаются и больше не опрашиваются этим процессом.
+    """
+
+    def __init__(self, parser: FFCVParser, team_pages: Optional[Dict[int, List[str]]] = None):
+        self.parser = parser
+        # Team.pk целевой команды -> URL её страниц (equipo_p_partidos.php) для сброса кеша
+        self.team_pages = team_pages or {}
+        self.finished: set = set()
+
+    def poll(self, matches: Iterable[Match]) -> List[ScoreChange]:
+        matches = [m for m in matches if m.pk not in self.finished]
+        if not matches:
+            return []
+
+        workers = min(self.parser.max_workers, len(matches))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ffcv-live") as pool:
+            scores = list(pool.map(lambda m: self.parser.fetch_live_score(m.source_url), matches))
+
+        changes = []
+        for match, score in zip(matches, scores):
+            if score is None:
+                continue
+            if score.finished:
+                self.finished.add(match.pk)
+            old = (match.home_score, match.away_score)
+            if old != (score.home_score, score.away_score) or match.status != self.status_for(match, score):
+                changes.append(ScoreChange(match, old, score))
+        return changes
+
+    @staticmethod
+    def status_for(match: Match, score: LiveScore) -> str:
+        # PLAYED, уже записанный обычным прогоном, назад в LIVE не откатываем
+        if score.finished or match.status == Match.Status.PLAYED:
+            return Match.Status.PLAYED
+        return Match.Status.LIVE
+
+    def apply(self, changes: List[ScoreChange]) -> int:
+        """Счёт — одним bulk_update; возвращает число сброшенных страниц кеша."""
+        if not changes:
+            return 0
+
+        log = MatchChangeLog("live")
+        for change in changes:
+            before = log.before(change.match)
+            change.match.home_score = change.new.home_score
+            change.match.away_score = change.new.away_score
+            change.match.status = self.status_for(change.match, change.new)
+            log.track(change.match, before)
+        Match.objects.bulk_update([c.match for c in changes], ["home_score", "away_score", "status", "content_hash"])
+        log.flush()
+
+        cache: Optional[PageCache] = self.parser.cache
+        if cache is None:
+            return 0
+        stale = {
+            url
+            for c in changes
+            for team_id in (c.match.home_team_id, c.match.away_team_id)
+            for url in self.team_pages.get(team_id, ())
+        }
+        for url in stale:
+            cache.drop(url)
+        return len(stale)
@@ -0,0 +1,96 @@
+# results_pars/services/match_changes.py
+"""
+Отпечаток содержимого матча (Match.content_hash) и журнал изменений (MatchChange).
+Все, кто пишет в Match (MatchWriter, CalendarWriter, live-режим), сверяют отпечаток до записи:
+совпал — строку не трогаем; нет — пишем и кладём в журнал только реально изменившиеся поля.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import datetime, timezone as dt_timezone
+from typing import Dict, List, Optional
+
+from results_pars.models import IngestionRun, Match, MatchChange
+
+# поля, из которых складывается отпечаток (FK — по id)
+FINGERPRINT_FIELDS = (
+    "competition", "round", "kickoff_at", "home_team", "away_team",
+    "home_score", "away_score", "status", "result_note", "venue",
+    "source_url", "is_target_match",
+)
+_ATTNAMES = {name: Match._meta.get_field(name).attname for name in FINGERPRINT_FIELDS}
+
+
+def _plain(value):
+    # одно и то же время в разных зонах (из БД — UTC, из парсера — локальное) даёт один отпечаток
+    if isinstance(value, datetime):
+        return value.astimezone(dt_timezone.utc).isoformat() if value.tzinfo else value.isoformat()
+    return value
+
+
+def match_values(match: Match) -> Dict[str, object]:
+    """Поля отпечатка в json-совместимом виде: поле -> значение (FK — id)."""
+    return {name: _plain(getattr(match, attname)) for name, attname in _ATTNAMES.items()}
+
+
+def match_fingerprint(match: Match) -> str:
+    data = json.dumps(list(match_values(match).values()), separators=(",", ":"), default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class MatchChangeLog:
+    """
+    Сбор изменений пачки матчей: before() до изменения полей, track() после.
+    track() обновляет match.content_hash и говорит, нужна ли запись; flush() — один bulk_create журнала.
+    """
+
+    def __init__(self, source: str, run: Optional[IngestionRun] = None):
+        self.source = source
+        self.run = run
+        self.pending: List[MatchChange] = []
+
+    @staticmethod
+    def before(match: Match) -> Dict[str, object]:
+        return match_values(match)
+
+    def created(self, match: Match) -> None:
+        """Новый матч (до bulk_create): отпечаток ставим сразу, запись в журнал — в flush_created."""
+        match.content_hash = match_fingerprint(match)
+
+    def track(self, match: Match, before: Dict[str, object]) -> bool:
+        """
+        True — поля матча изменились (запись в журнал добавлена, content_hash обновлён).
+        False — изменений нет; content_hash при этом мог быть пустым/устаревшим и обновлён.
+        """
+        fingerprint = match_fingerprint(match)
+        if fingerprint == match.content_hash:
+            return False
+
+        after = match_values(match)
+        fields = {name: [before[name], after[name]] for name in FINGERPRINT_FIELDS if before[name] != after[name]}
+        match.content_hash = fingerprint
+        if not fields:
+            return False
+        self.pending.append(MatchChange(match=match, run=self.run, source=self.source, fields=fields))
+        return True
+
+    def flush_created(self, matches: List[Match]) -> None:
+        """Журнал для созданных bulk_create матчей: pk перечитываем (MySQL их не возвращает)."""
+        if not matches:
+            return
+        pks = dict(
+            Match.objects.filter(external_key__in=[m.external_key for m in matches]).values_list("external_key", "pk")
+        )
+        for m in matches:
+            m.pk = m.pk or pks.get(m.external_key)
+            fields = {name: [None, value] for name, value in match_values(m).items() if value not in (None, "")}
+            self.pending.append(
+                MatchChange(match_id=m.pk, run=self.run, source=self.source, kind=MatchChange.Kind.CREATED, fields=fields)
+            )
+
+    def flush(self) -> int:
+        pending, self.pending = self.pending, []
+        if pending:
+            MatchChange.objects.bulk_create(pending)
+        return len(pending)
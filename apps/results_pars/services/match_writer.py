@@ -0,0 +1,296 @@
+# results_pars/services/match_writer.py
+from __future__ import annotations
+
+from typing import Dict, Hashable, Iterable, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from django.db import transaction
+from django.db.models import Model, QuerySet
+
+from results_pars.models import CompetitionContext, IngestionRun, Match, Round, TargetConfig, TargetTeam, Team, Venue
+
+from .ffcv_parser import KnownMatch, ParsedMatch
+from .match_changes import FINGERPRINT_FIELDS, MatchChangeLog
+from .team_index import TeamIndex
+from .team_names import normalize_team_name
+
+
+class MatchWriter:
+    """
+    Пакетная запись ParsedMatch в БД.
+    Справочники (соревнования, туры, команды, поля) и существующие матчи грузятся в словари
+    по одному запросу на модель, недостающее создаётся bulk_create, матчи — bulk_create/bulk_update.
+    Число запросов на write() не зависит от количества матчей: 16 на вставку, 6 на обновление.
+    Исключение — бэкенды с лимитом параметров: SQLite режет bulk-операции по 999 параметров,
+    это плюс запрос на каждые ~70 матчей (бюджет и его проверка — results_pars/tests.py).
+    parse_ffcv_results пишет пачками по --batch-size: на прогон это ceil(N / batch size) вызовов write().
+    Строки, чей отпечаток (Match.content_hash) не изменился, не пишутся; изменения — в MatchChange.
+    """
+
+    MATCH_FIELDS = [*FINGERPRINT_FIELDS, "content_hash"]
+
+    def __init__(
+        self,
+        target_team: Team,
+        target_team_name: str,
+        index: Optional[TeamIndex] = None,
+        run: Optional[IngestionRun] = None,
+    ):
+        self.run = run  # прогон, к которому относятся записи MatchChange
+        self.target_team = target_team
+        self.target_key = normalize_team_name(target_team_name)
+        # имена соперников (и других команд клуба) -> Team без запросов; один индекс на прогон
+        self.index = index if index is not None else TeamIndex.load()
+        self.index.add(target_team)
+
+    @classmethod
+    def for_config(cls, cfg: TargetConfig) -> "MatchWriter":
+        """Writer для первой целевой команды TargetConfig."""
+        targets = cfg.targets()
+        if not targets:
+            raise ValueError("TargetConfig has no target team.")
+        return cls.for_target(targets[0])
+
+    @classmethod
+    def for_target(cls, target: TargetTeam, index: Optional[TeamIndex] = None) -> "MatchWriter":
+        """Writer для целевой команды; её Team (ffcv id из конфига) создаётся при необходимости."""
+        return cls(cls.target_team_for(target), target.name, index)
+
+    @staticmethod
+    def target_team_for(target: TargetTeam) -> Team:
+        with transaction.atomic():
+            team, _ = Team.objects.get_or_create(
+                ffcv_team_id=str(target.ffcv_team_id),
+                defaults={"name": target.name, "is_target": True},
+            )
+            if not team.is_target:
+                team.is_target = True
+                team.save(update_fields=["is_target"])
+        return team
+
+    def is_target_name(self, name: str) -> bool:
+        """Название — наша команда: ключ совпал с её именем в конфиге или индекс (алиас) указывает на неё."""
+        if normalize_team_name(name) == self.target_key:
+            return True
+        team = self.index.get(name)
+        return team is not None and team.pk == self.target_team.pk
+
+    def write(self, parsed: Iterable[ParsedMatch]) -> tuple[int, int]:
+        """Возвращает (создано, реально изменено)."""
+        # один external_key — одна строка (последняя побеждает, как и при update_or_create)
+        parsed = list({pm.external_key: pm for pm in parsed}.values())
+        if not parsed:
+            return 0, 0
+
+        self._sync_target_team_name(parsed)
+
+        comps = self._competitions(parsed)
+        rounds = self._rounds(parsed, comps)
+        teams = self.resolve_teams(n for pm in parsed for n in (pm.home_name, pm.away_name))
+        venues = self._venues(parsed)
+        existing = Match.objects.in_bulk([pm.external_key for pm in parsed], field_name="external_key")
+
+        log = MatchChangeLog("ingest", self.run)
+        to_create: List[Match] = []
+        to_update: List[Match] = []
+        hash_only: List[Match] = []  # поля те же, но отпечаток был пустой/устаревший
+        for pm in parsed:
+            comp = comps[(pm.competition_name, pm.season_name)]
+            values = {
+                "competition": comp,
+                "round": rounds.get((comp.pk, pm.round_number)),
+                "kickoff_at": pm.kickoff_at,
+                "home_team": self.team(pm.home_name, teams),
+                "away_team": self.team(pm.away_name, teams),
+                "home_score": pm.home_score,
+                "away_score": pm.away_score,
+                "status": pm.status,
+                "result_note": pm.result_note,
+                "venue": venues.get(pm.venue_name),
+                "source_url": pm.source_url,
+                "is_target_match": True,
+            }
+
+            obj = existing.get(pm.external_key)
+            if obj is not None and self._keeps_live_score(obj, pm):
+                # страница команды отстаёт от табло (run_ffcv_live): счёт без счёта не затираем
+                for field in ("home_score", "away_score", "status"):
+                    values[field] = getattr(obj, field)
+            if obj is None:
+                obj = Match(external_key=pm.external_key, **values)
+                log.created(obj)
+                to_create.append(obj)
+                continue
+
+            before, old_hash = log.before(obj), obj.content_hash
+            for field, value in values.items():
+                setattr(obj, field, value)
+            if log.track(obj, before):
+                to_update.append(obj)
+            elif obj.content_hash != old_hash:
+                hash_only.append(obj)
+
+        if to_create:
+            Match.objects.bulk_create(to_create)
+            log.flush_created(to_create)
+        if to_update:
+            Match.objects.bulk_update(to_update, self.MATCH_FIELDS)
+        if hash_only:
+            Match.objects.bulk_update(hash_only, ["content_hash"])
+        log.flush()
+
+        return len(to_create), len(to_update)
+
+    @staticmethod
+    def _keeps_live_score(obj: Match, pm: ParsedMatch) -> bool:
+        return (
+            obj.status in (Match.Status.LIVE, Match.Status.PLAYED)
+            and obj.home_score is not None
+            and pm.home_score is None
+            and pm.status == Match.Status.SCHEDULED
+        )
+
+    def _sync_target_team_name(self, parsed: List[ParsedMatch]) -> None:
+        # имя целевой команды берём из последней строки, где она встречается; сохраняем один раз
+        name = None
+        for pm in parsed:
+            for side in (pm.home_name, pm.away_name):
+                if self.is_target_name(side):
+                    name = side
+        if name and name != self.target_team.name:
+            self.target_team.name = name
+            self.target_team.save(update_fields=["name"])
+            self.index.add(self.target_team)
+
+    def team(self, name: str, teams: Dict[str, Team]) -> Team:
+        """Team для названия со страницы; teams — результат resolve_teams для этих названий."""
+        if self.is_target_name(name):
+            return self.target_team
+        return teams[normalize_team_name(name)]
+
+    def _competitions(self, parsed: List[ParsedMatch]) -> Dict[tuple, CompetitionContext]:
+        wanted = {}
+        for pm in parsed:
+            wanted.setdefault(
+                (pm.competition_name, pm.season_name),
+                CompetitionContext(
+                    name=pm.competition_name,
+                    season_name=pm.season_name,
+                    source_url=pm.source_url,
+                    is_active=True,
+                    **self._competition_ids(pm.source_url),
+                ),
+            )
+        qs = CompetitionContext.objects.filter(name__in={name for name, _ in wanted})
+        return self._get_or_create_many(qs, lambda c: (c.name, c.season_name), wanted)
+
+    @staticmethod
+    def _competition_ids(url: str) -> Dict[str, str]:
+        """id_temp/id_modalidad/... из ссылки на матч — для calendar/standings_url_template новых соревнований."""
+        qs = parse_qs(urlparse(url).query)
+        return {
+            field: qs[param][0]
+            for param, field in (
+                ("id_temp", "ffcv_temp_id"),
+                ("id_modalidad", "ffcv_modalidad_id"),
+                ("id_competicion", "ffcv_competicion_id"),
+                ("id_torneo", "ffcv_torneo_id"),
+            )
+            if qs.get(param)
+        }
+
+    def _rounds(self, parsed: List[ParsedMatch], comps: Dict[tuple, CompetitionContext]) -> Dict[tuple, Round]:
+        wanted = {}
+        for pm in parsed:
+            if pm.round_number is None:
+                continue
+            comp = comps[(pm.competition_name, pm.season_name)]
+            wanted.setdefault(
+                (comp.pk, pm.round_number),
+                Round(
+                    competition=comp,
+                    round_number=pm.round_number,
+                    round_date=pm.kickoff_at.date() if pm.kickoff_at else None,
+                ),
+            )
+        if not wanted:
+            return {}
+        qs = Round.objects.filter(
+            competition_id__in={comp_id for comp_id, _ in wanted},
+            round_number__in={number for _, number in wanted},
+        )
+        return self._get_or_create_many(qs, lambda r: (r.competition_id, r.round_number), wanted)
+
+    def resolve_teams(self, names: Iterable[str]) -> Dict[str, Team]:
+        """
+        Команды соперников для набора имён (ключ — нормализованное имя); для использования вместе с team().
+        Известные берутся из индекса без запросов; новые создаются пачкой с ffcv_team_id "auto:<ключ>",
+        так что разные написания одной команды не плодят строк.
+        """
+        found: Dict[str, Team] = {}
+        wanted: Dict[str, Team] = {}
+        with self.index.lock:
+            for name in names:
+                if self.is_target_name(name):
+                    continue
+                key = normalize_team_name(name)
+                team = self.index.get(name)
+                if team is not None:
+                    found[key] = team
+                else:
+                    wanted.setdefault(f"auto:{key}", Team(ffcv_team_id=f"auto:{key}", name=name, is_target=False))
+
+            if wanted:
+                qs = Team.objects.filter(ffcv_team_id__in=list(wanted))
+                for ffcv_id, team in self._get_or_create_many(qs, lambda t: t.ffcv_team_id, wanted).items():
+                    self.index.add(team)
+                    found[ffcv_id[len("auto:"):]] = team
+        return found
+
+    def _venues(self, parsed: List[ParsedMatch]) -> Dict[Optional[str], Venue]:
+        wanted = {pm.venue_name: Venue(name=pm.venue_name) for pm in parsed if pm.venue_name}
+        if not wanted:
+            return {}
+        qs = Venue.objects.filter(name__in=list(wanted))
+        return self._get_or_create_many(qs, lambda v: v.name, wanted)
+
+    @staticmethod
+    def _get_or_create_many(qs: QuerySet, key_of, wanted: Dict[Hashable, Model]) -> Dict[Hashable, Model]:
+        """
+        get_or_create для множества ключей: один SELECT, недостающее — одним bulk_create
+        и повторный SELECT (MySQL не возвращает pk из bulk_create).
+        При дублях в БД берётся запись с меньшим pk — как раньше get_or_create на первой.
+        ignore_conflicts: ту же команду/тур мог только что создать параллельный прогон другой
+        целевой команды — его строка найдётся повторным SELECT.
+        """
+        qs = qs.order_by("pk")
+
+        found: Dict[Hashable, Model] = {}
+        for obj in qs:
+            found.setdefault(key_of(obj), obj)
+
+        missing = [obj for key, obj in wanted.items() if key not in found]
+        if missing:
+            qs.model.objects.bulk_create(missing, ignore_conflicts=True)
+            for obj in qs.all():
+                found.setdefault(key_of(obj), obj)
+
+        return {key: found[key] for key in wanted}
+
+
+def load_known_matches() -> Dict[str, KnownMatch]:
+    """external_key -> KnownMatch по всем целевым матчам, одним запросом."""
+    rows = Match.objects.filter(is_target_match=True).values_list(
+        "external_key", "status", "kickoff_at", "venue__name", "home_score", "away_score", "round__round_number",
+    )
+    return {
+        key: KnownMatch(
+            status=status,
+            kickoff_at=kickoff_at,
+            venue_name=venue_name,
+            home_score=home_score,
+            away_score=away_score,
+            round_number=round_number,
+        )
+        for key, status, kickoff_at, venue_name, home_score, away_score, round_number in rows
+    }
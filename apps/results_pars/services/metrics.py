@@ -0,0 +1,83 @@
+# results_pars/services/metrics.py
+from __future__ import annotations
+
+import heapq
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+
+class RunMetrics:
+    """
+    Замеры одного прогона по стадиям: fetch (HTTP-запрос по сети), wait (ожидание rate limiter
+    и пауз между повторами HttpClient — это не время сервера), parse (HTML), db (SQL).
+    Время — сумма по всем потокам (partido.php тянутся пулом, так что fetch может быть больше
+    длительности прогона). Плюс top-N самых медленных URL. Потокобезопасен.
+    """
+
+    SLOWEST_KEEP = 10
+
+    def __init__(self):
+        self.ms: Dict[str, float] = defaultdict(float)
+        self.db_queries = 0
+        self.http_requests = 0
+        self.bytes_downloaded = 0
+        self._slowest: List[tuple[float, str]] = []  # min-heap (ms, url)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add(name, (time.perf_counter() - t0) * 1000)
+
+    @contextmanager
+    def request(self, url: str) -> Iterator[None]:
+        """
+        Одна попытка запроса по сети (HttpClient.get): stage("fetch") + учёт URL в списке самых
+        медленных (ответ с ошибкой тоже считается).
+        """
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            ms = (time.perf_counter() - t0) * 1000
+            self._add("fetch", ms)
+            with self._lock:
+                if len(self._slowest) < self.SLOWEST_KEEP:
+                    heapq.heappush(self._slowest, (ms, url))
+                elif ms > self._slowest[0][0]:
+                    heapq.heapreplace(self._slowest, (ms, url))
+
+    def wait(self, seconds: float) -> None:
+        """Сон rate limiter или пауза перед повтором: в fetch и slowest не попадает."""
+        self._add("wait", seconds * 1000)
+
+    def response(self, nbytes: int) -> None:
+        """Ответ получен (в т.ч. 304): считаем запросы и байты прогона отдельно от общего HttpClient."""
+        with self._lock:
+            self.http_requests += 1
+            self.bytes_downloaded += nbytes
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        """Для connection.execute_wrapper(): время и число SQL-запросов."""
+        t0 = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self._add("db", (time.perf_counter() - t0) * 1000)
+            with self._lock:
+                self.db_queries += 1
+
+    @property
+    def slowest(self) -> List[dict]:
+        with self._lock:
+            return [{"url": url, "ms": round(ms, 1)} for ms, url in sorted(self._slowest, reverse=True)]
+
+    def _add(self, name: str, ms: float) -> None:
+        with self._lock:
+            self.ms[name] += ms
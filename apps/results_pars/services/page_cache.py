@@ -0,0 +1,144 @@
+# results_pars/services/page_cache.py
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Optional
+
+
+@dataclass
+class CachedPage:
+    url: str
+    text: str
+    body_sha256: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float = 0.0  # time.time() последней успешной проверки
+    # результат разбора этой версии тела (json-совместимый), чтобы не парсить повторно
+    parsed: Any = None
+    parsed_sha256: Optional[str] = None
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def parsed_for_body(self) -> Any:
+        return self.parsed if self.parsed_sha256 == self.body_sha256 else None
+
+
+@dataclass
+class CachePolicy:
+    """
+    revalidate_after — сколько секунд страница считается свежей без запроса (0 = всегда conditional GET).
+    settled_after — partido.php матча, сыгранного раньше этого срока, больше не запрашиваем вовсе.
+    """
+    revalidate_after: float = 0.0
+    settled_after: timedelta = timedelta(days=7)
+
+
+@dataclass
+class CacheStats:
+    fresh_hits: int = 0      # отдали из кеша без запроса (TTL)
+    not_modified: int = 0    # 304
+    unchanged: int = 0       # 200, но тело совпало по хешу
+    changed: int = 0         # новое или изменившееся тело
+
+
+class PageCache:
+    """
+    Дисковый кеш ответов FFCV, ключ — URL.
+    На каждую страницу два файла в root/<xx>/<sha(url)>: .json (метаданные + parsed) и .html.gz (тело).
+    Запись атомарная (tmp + os.replace), так что параллельные потоки парсера не видят полуфайлов.
+    """
+
+    def __init__(self, root: Path | str, policy: Optional[CachePolicy] = None):
+        self.root = Path(root)
+        self.policy = policy or CachePolicy()
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def body_hash(content: bytes) -> str:
+        return hashlib.sha256(content).hexdigest()
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        meta_path, body_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            text = gzip.decompress(body_path.read_bytes()).decode("utf-8")
+        except (OSError, ValueError):
+            return None
+        return CachedPage(text=text, **meta)
+
+    def put(self, page: CachedPage) -> None:
+        meta_path, body_path = self._paths(page.url)
+        meta_path.parent.mkdir(parents=True, exist_ok=True)
+
+        meta = {
+            "url": page.url,
+            "body_sha256": page.body_sha256,
+            "etag": page.etag,
+            "last_modified": page.last_modified,
+            "fetched_at": page.fetched_at,
+            "parsed": page.parsed,
+            "parsed_sha256": page.parsed_sha256,
+        }
+        # тело пишем первым: метаданные без тела хуже, чем тело без метаданных
+        self._atomic_write(body_path, gzip.compress(page.text.encode("utf-8")))
+        self._atomic_write(meta_path, json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+
+    def touch(self, url: str, fetched_at: float) -> None:
+        """304: тело не изменилось, обновляем только время проверки."""
+        self._update_meta(url, fetched_at=fetched_at)
+
+    def drop(self, url: str) -> None:
+        """Забыть страницу: следующий запрос будет полным GET без If-None-Match."""
+        for path in self._paths(url):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def set_parsed(self, url: str, body_sha256: str, parsed: Any) -> None:
+        self._update_meta(url, expect_sha256=body_sha256, parsed=parsed, parsed_sha256=body_sha256)
+
+    def count(self, outcome: str) -> None:
+        with self._lock:
+            setattr(self.stats, outcome, getattr(self.stats, outcome) + 1)
+
+    def _update_meta(self, url: str, expect_sha256: Optional[str] = None, **fields) -> None:
+        meta_path, _ = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        # тело успели перезаписать другой версией — разбор к ней не относится
+        if expect_sha256 and meta.get("body_sha256") != expect_sha256:
+            return
+        meta.update(fields)
+        self._atomic_write(meta_path, json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = self.root / key[:2] / key
+        return base.with_suffix(".json"), base.with_suffix(".html.gz")
+
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes) -> None:
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
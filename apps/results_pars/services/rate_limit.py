@@ -0,0 +1,38 @@
+# results_pars/services/rate_limit.py
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict
+from urllib.parse import urlparse
+
+
+class HostRateLimiter:
+    """
+    Ограничение частоты запросов на один хост (потокобезопасно).
+    Каждый вызов wait() резервирует следующий свободный слот для хоста
+    и спит до него, так что N потоков вместе не превышают requests_per_second.
+    requests_per_second <= 0 — без ограничения.
+    """
+
+    def __init__(self, requests_per_second: float):
+        self.min_interval = 1.0 / requests_per_second if requests_per_second and requests_per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot: Dict[str, float] = {}
+
+    def wait(self, url: str) -> float:
+        """Ждёт слота хоста; возвращает, сколько секунд проспал."""
+        if not self.min_interval:
+            return 0.0
+
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self.min_interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+            return delay
+        return 0.0
@@ -0,0 +1,143 @@
+# results_pars/services/replay.py
+"""
+Корпус сохранённых страниц FFCV и транспорт для работы FFCVParser без сети.
+
+Корпус — каталог с manifest.json и .html-файлами:
+    {"target": {...параметры FFCVParser...}, "pages": {"<url>": {"file": "...", "kind": "team|detail"}}}
+и expected.json — разбор этих страниц на момент записи (parse_snapshot), с ним сверяются тесты.
+Корпусов может быть несколько (по одному на целевую команду): corpus/ и его подкаталоги, см. corpus_dirs().
+RecordingHttpClient пишет страницы в корпус при живом прогоне, ReplayHttpClient отдаёт их обратно
+(тот же интерфейс, что у HttpClient: get / get_text / close / stats).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+import requests
+
+from .http_client import HttpClient, HttpStats
+from .metrics import RunMetrics
+
+DEFAULT_CORPUS_DIR = Path(__file__).resolve().parent.parent / "corpus"
+
+
+def corpus_dirs(root: Path | str = DEFAULT_CORPUS_DIR) -> Iterator[Path]:
+    """Каталоги корпусов: root и любые подкаталоги с manifest.json."""
+    for manifest in sorted(Path(root).glob(f"**/{Corpus.MANIFEST}")):
+        yield manifest.parent
+
+
+def parse_snapshot(parser) -> dict:
+    """Разбор всех страниц корпуса в json-совместимом виде: матчи страницы команды и детали partido.php."""
+    def plain(value):
+        return value.isoformat() if hasattr(value, "isoformat") else value
+
+    corpus = parser.http.corpus
+    return {
+        "team_matches": [
+            {field: plain(value) for field, value in asdict(pm).items()} for pm in parser.parse_team_matches()
+        ],
+        "details": {
+            url: [plain(value) for value in parser.fetch_match_detail(url)]
+            for url in sorted(corpus.pages_of_kind("detail"))
+        },
+    }
+
+
+class Corpus:
+    MANIFEST = "manifest.json"
+    EXPECTED = "expected.json"
+
+    def __init__(self, root: Path | str = DEFAULT_CORPUS_DIR):
+        self.root = Path(root)
+        self.target: Dict[str, str] = {}
+        self.pages: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+        manifest = self.root / self.MANIFEST
+        if manifest.exists():
+            data = json.loads(manifest.read_text(encoding="utf-8"))
+            self.target = data.get("target", {})
+            self.pages = data.get("pages", {})
+
+    def read(self, url: str) -> Optional[str]:
+        entry = self.pages.get(url)
+        if not entry:
+            return None
+        return (self.root / entry["file"]).read_text(encoding="utf-8")
+
+    def pages_of_kind(self, kind: str) -> Dict[str, str]:
+        return {url: self.read(url) for url, entry in self.pages.items() if entry["kind"] == kind}
+
+    def add(self, url: str, text: str) -> None:
+        kind = "detail" if "partido.php" in url else "team"
+        name = f"{kind}-{hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]}.html"
+        self.root.mkdir(parents=True, exist_ok=True)
+        (self.root / name).write_text(text, encoding="utf-8")
+        with self._lock:
+            self.pages[url] = {"file": name, "kind": kind}
+
+    def save(self, target: Optional[Dict[str, str]] = None) -> None:
+        if target is not None:
+            self.target = target
+        data = {"target": self.target, "pages": dict(sorted(self.pages.items()))}
+        (self.root / self.MANIFEST).write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    def expected(self) -> Optional[dict]:
+        path = self.root / self.EXPECTED
+        return json.loads(path.read_text(encoding="utf-8")) if path.exists() else None
+
+    def save_expected(self, snapshot: dict) -> None:
+        (self.root / self.EXPECTED).write_text(
+            json.dumps(snapshot, ensure_ascii=False, indent=2, sort_keys=True), encoding="utf-8"
+        )
+
+
+class ReplayHttpClient:
+    """Отдаёт страницы из корпуса; URL, которого нет в корпусе, — 404 (HTTPError), как у живого клиента."""
+
+    def __init__(self, corpus: Corpus):
+        self.corpus = corpus
+        self.stats = HttpStats()
+        self._lock = threading.Lock()
+
+    def get(self, url: str, headers: Optional[dict] = None, timing: Optional[RunMetrics] = None) -> requests.Response:
+        text = self.corpus.read(url)
+
+        r = requests.Response()
+        r.url = url
+        r.encoding = "utf-8"
+        r.status_code = 200 if text is not None else 404
+        r._content = (text or "").encode("utf-8")
+
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.bytes_downloaded += len(r._content)
+
+        r.raise_for_status()
+        return r
+
+    def get_text(self, url: str, headers: Optional[dict] = None) -> str:
+        return self.get(url, headers=headers).text
+
+    def close(self) -> None:
+        pass
+
+
+class RecordingHttpClient(HttpClient):
+    """Живой HttpClient, который сохраняет каждый успешный ответ 200 в корпус."""
+
+    def __init__(self, *args, corpus: Corpus, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.corpus = corpus
+
+    def get(self, url: str, headers: Optional[dict] = None, timing: Optional[RunMetrics] = None) -> requests.Response:
+        r = super().get(url, headers=headers, timing=timing)
+        if r.status_code == 200:
+            self.corpus.add(url, r.text)
+        return r
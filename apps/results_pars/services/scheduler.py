@@ -0,0 +1,71 @@
+# results_pars/services/scheduler.py
+"""
+Расписание опроса FFCV вокруг матчей (для run_ffcv_scheduler):
+- идёт матч (от kickoff - lead до появления финального счёта, не дольше window) — часто, live_interval;
+- в день матча — обычный TargetConfig.poll_interval_minutes;
+- в остальные дни — редко (idle_interval), но просыпаемся к ближайшему kickoff - lead.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from django.utils import timezone
+
+from results_pars.models import Match
+
+
+@dataclass
+class PollPolicy:
+    live_interval: timedelta = timedelta(minutes=5)
+    idle_interval: timedelta = timedelta(hours=6)
+    lead: timedelta = timedelta(minutes=15)     # начинаем частый опрос чуть до начала
+    window: timedelta = timedelta(minutes=150)  # дольше матч без счёта не ждём
+
+
+@dataclass
+class PollPlan:
+    delay: timedelta
+    mode: str  # live | matchday | idle
+    kickoff_at: Optional[datetime] = None  # матч, из-за которого выбран режим
+
+    @property
+    def seconds(self) -> float:
+        return max(0.0, self.delay.total_seconds())
+
+
+FINAL_STATUSES = (Match.Status.PLAYED, Match.Status.CANCELLED)
+
+
+def next_pending_kickoff(now: datetime, policy: PollPolicy) -> Optional[datetime]:
+    """Ближайший kickoff целевого матча без финального статуса (ещё идущий или будущий) — один запрос."""
+    return (
+        Match.objects.filter(is_target_match=True, kickoff_at__gte=now - policy.window)
+        .exclude(status__in=FINAL_STATUSES)
+        .order_by("kickoff_at")
+        .values_list("kickoff_at", flat=True)
+        .first()
+    )
+
+
+def plan_next_poll(
+    now: datetime,
+    kickoff_at: Optional[datetime],
+    base_interval: timedelta,
+    policy: PollPolicy,
+) -> PollPlan:
+    """Через сколько опрашивать снова, если ближайший незавершённый матч начинается в kickoff_at."""
+    base_interval = max(base_interval, policy.live_interval)
+
+    if kickoff_at is not None and kickoff_at - policy.lead <= now:
+        return PollPlan(policy.live_interval, "live", kickoff_at)
+
+    same_day = kickoff_at is not None and timezone.localdate(kickoff_at) == timezone.localdate(now)
+    delay = base_interval if same_day else max(base_interval, policy.idle_interval)
+    mode = "matchday" if same_day else "idle"
+
+    if kickoff_at is not None:
+        # не проспать начало: просыпаемся к kickoff - lead
+        delay = min(delay, kickoff_at - policy.lead - now)
+    return PollPlan(delay, mode, kickoff_at)
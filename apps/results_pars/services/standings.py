@@ -0,0 +1,79 @@
+# results_pars/services/standings.py
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import List
+
+from django.db import transaction
+
+from results_pars.models import CompetitionContext, StandingsRow, StandingsSnapshot
+
+from .ffcv_parser import ParsedStanding
+from .match_writer import MatchWriter
+
+
+def standings_hash(rows: List[ParsedStanding]) -> str:
+    """Хеш содержимого таблицы (позиции, команды, очки и показатели), не зависит от порядка строк."""
+    payload = sorted(
+        (r.position, r.team_name.strip().lower(), r.played, r.wins, r.draws, r.losses,
+         r.goals_for, r.goals_against, r.goal_diff, r.points)
+        for r in rows
+    )
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class StandingsWriter:
+    """
+    Пишет StandingsSnapshot + StandingsRow (bulk_create), только если таблица изменилась
+    относительно текущего (is_current) снимка соревнования. Команды — как у MatchWriter.
+    """
+
+    def __init__(self, team_writer: MatchWriter):
+        self.team_writer = team_writer
+
+    def write(self, competition: CompetitionContext, source_url: str, rows: List[ParsedStanding]) -> tuple[StandingsSnapshot, bool]:
+        digest = standings_hash(rows)
+        current = (
+            StandingsSnapshot.objects.filter(competition=competition, is_current=True)
+            .order_by("-captured_at")
+            .first()
+        )
+        if current and current.content_hash == digest:
+            return current, False
+
+        with transaction.atomic():
+            teams = self.team_writer.resolve_teams(r.team_name for r in rows)
+
+            StandingsSnapshot.objects.filter(competition=competition, is_current=True).update(is_current=False)
+            snapshot = StandingsSnapshot.objects.create(
+                competition=competition,
+                source_url=source_url,
+                content_hash=digest,
+                is_current=True,
+            )
+
+            objs = []
+            seen_teams = set()
+            for r in sorted(rows, key=lambda r: r.position):
+                team = self.team_writer.team(r.team_name, teams)
+                # uniq(snapshot, team): если два названия свелись к одной команде — оставляем верхнюю строку
+                if team.pk in seen_teams:
+                    continue
+                seen_teams.add(team.pk)
+                objs.append(StandingsRow(
+                    snapshot=snapshot,
+                    team=team,
+                    position=r.position,
+                    played=r.played,
+                    wins=r.wins,
+                    draws=r.draws,
+                    losses=r.losses,
+                    goals_for=r.goals_for,
+                    goals_against=r.goals_against,
+                    goal_diff=r.goal_diff,
+                    points=r.points,
+                ))
+            StandingsRow.objects.bulk_create(objs)
+
+        return snapshot, True
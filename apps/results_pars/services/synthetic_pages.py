@@ -0,0 +1,161 @@
+# results_pars/services/synthetic_pages.py
+"""
+Синтетические страницы в разметке FFCV (isquad) — для замеров и тестов
+без обращения к ffcv.es. Разметка повторяет ровно то, что читает FFCVParser.
+"""
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Optional
+
+
+def filler_html(kb: int) -> str:
+    """Посторонняя разметка (меню, блоки новостей) примерно на kb килобайт — как на живых страницах."""
+    block = (
+        '<div class="tg-widget"><ul class="tg-menu">'
+        + "".join(f'<li class="menu-item"><a href="/noticia.php?id={i}">Noticia {i}</a></li>' for i in range(10))
+        + '</ul><p class="tg-text">Lorem ipsum dolor sit amet, consectetur adipiscing elit.</p></div>'
+    )
+    return block * max(0, (kb * 1024) // len(block))
+
+
+def team_matches_html(
+    team_name: str,
+    fixtures: int,
+    opponent_prefix: str = "Rival",
+    played: Optional[int] = None,
+    filler_kb: int = 0,
+    id_base: int = 1000,
+) -> str:
+    """
+    equipo_p_partidos.php: table.sobrestante, по строке-дате и строке-матчу на каждый тур.
+    Первые played матчей (по умолчанию половина) — со счётом. id_partido = id_base + номер тура.
+    """
+    if played is None:
+        played = fixtures // 2
+
+    rows = []
+    for i in range(1, fixtures + 1):
+        home, away = (team_name, f"{opponent_prefix} {i}") if i % 2 else (f"{opponent_prefix} {i}", team_name)
+        marker = f"{i % 4} - {i % 3}" if i <= played else "12:00"
+        rows.append(
+            f'<tr><td colspan="5"><div class="fecha">sábado, {(i % 28) + 1} De octubre</div></td></tr>'
+            f"<tr>"
+            f'<td class="td_nombre_partidos"><a href="equipo.php?id_equipo=h{i}">{home}</a></td>'
+            f'<td><a href="partido_estadisticas.php?id_partido={id_base + i}&amp;id_temp=21">'
+            f'<span class="hora_marcador">{marker}</span></a></td>'
+            f"<td></td><td></td>"
+            f'<td class="td_nombre_partidos"><a href="equipo.php?id_equipo=a{i}">{away}</a></td>'
+            f"</tr>"
+        )
+
+    return (
+        "<html><head><title>Partidos</title></head><body>"
+        + filler_html(filler_kb)
+        + '<table class="sobrestante"><tbody>' + "".join(rows) + "</tbody></table>"
+        + filler_html(filler_kb // 2)
+        + "</body></html>"
+    )
+
+
+def partido_html(
+    id_partido: int,
+    kickoff: Optional[date] = None,
+    venue_name: str = "Camp Municipal",
+    filler_kb: int = 0,
+) -> str:
+    """partido.php: input#fecha (dd-mm-yyyy), input#hora (HH:MM), p.nombre_campo."""
+    kickoff = kickoff or (date(2025, 9, 6) + timedelta(days=7 * (id_partido % 30)))
+    return (
+        "<html><body>"
+        + filler_html(filler_kb)
+        + f'<input type="hidden" id="fecha" value="{kickoff:%d-%m-%Y}">'
+        '<input type="hidden" id="hora" value="12:00">'
+        f'<p class="nombre_campo">{venue_name} {id_partido % 5} |</p>'
+        + filler_html(filler_kb // 2)
+        + "</body></html>"
+    )
+
+
+def partido_estadisticas_html(
+    id_partido: int,
+    home_score: Optional[int] = None,
+    away_score: Optional[int] = None,
+    finished: bool = False,
+    filler_kb: int = 0,
+) -> str:
+    """partido_estadisticas.php: табло div.marcador ("N - M" или время до начала), отметка "Finalizado"."""
+    marker = f"{home_score} - {away_score}" if home_score is not None and away_score is not None else "12:00"
+    return (
+        "<html><body>"
+        + filler_html(filler_kb)
+        + f'<div class="marcador" data-partido="{id_partido}">{marker}</div>'
+        + ('<p class="estado">Finalizado</p>' if finished else '<p class="estado">En juego</p>')
+        + filler_html(filler_kb // 2)
+        + "</body></html>"
+    )
+
+
+def standings_html(team_names: list, filler_kb: int = 0, round_number: int = 10) -> str:
+    """Классификация: table с заголовками Pos/Equipo/Pts/J/G/E/P/GF/GC, команды ссылками."""
+    rows = []
+    for pos, name in enumerate(team_names, start=1):
+        wins = max(0, round_number - pos)
+        draws = pos % 3
+        losses = max(0, round_number - wins - draws)
+        gf, gc = 2 * wins + draws, losses + pos
+        rows.append(
+            f"<tr><td>{pos}</td>"
+            f'<td><a href="equipo.php?id_equipo=s{pos}">{name}</a></td>'
+            f"<td>{3 * wins + draws}</td><td>{wins + draws + losses}</td>"
+            f"<td>{wins}</td><td>{draws}</td><td>{losses}</td><td>{gf}</td><td>{gc}</td></tr>"
+        )
+    return (
+        "<html><body>"
+        + filler_html(filler_kb)
+        + '<table class="tabla_clasificacion"><thead><tr>'
+        "<th>Pos</th><th>Equipo</th><th>Pts</th><th>J</th><th>G</th><th>E</th><th>P</th><th>GF</th><th>GC</th>"
+        "</tr></thead><tbody>" + "".join(rows) + "</tbody></table>"
+        + "</body></html>"
+    )
+
+
+def calendar_html(
+    team_name: str,
+    fixtures: int,
+    opponent_prefix: str = "Rival",
+    pairs_per_round: int = 4,
+    first_round: date = date(2025, 9, 6),
+    filler_kb: int = 0,
+) -> str:
+    """
+    calendario.php: на каждую jornada заголовок "Jornada N (dd-mm-yyyy)" и строки матчей
+    (время HH:MM, поле td.estadio). id_partido матчей целевой команды совпадают с team_matches_html.
+    """
+    tables = []
+    for i in range(1, fixtures + 1):
+        day = first_round + timedelta(days=7 * (i - 1))
+        home, away = (team_name, f"{opponent_prefix} {i}") if i % 2 else (f"{opponent_prefix} {i}", team_name)
+        pairs = [(1000 + i, home, away)] + [
+            (100000 + i * 100 + p, f"{opponent_prefix} {i}-{p}a", f"{opponent_prefix} {i}-{p}b")
+            for p in range(1, pairs_per_round)
+        ]
+        rows = "".join(
+            "<tr>"
+            f'<td><a href="equipo.php?id_equipo=h{id_partido}">{h}</a></td>'
+            f'<td><a href="partido_estadisticas.php?id_partido={id_partido}&amp;id_temp=21">{10 + p}:30</a></td>'
+            f'<td><a href="equipo.php?id_equipo=a{id_partido}">{a}</a></td>'
+            f'<td class="estadio">Camp Municipal {id_partido % 5}</td>'
+            "</tr>"
+            for p, (id_partido, h, a) in enumerate(pairs)
+        )
+        tables.append(
+            f'<table class="calendario"><tr><th colspan="4">Jornada {i} ({day:%d-%m-%Y})</th></tr>{rows}</table>'
+        )
+
+    return (
+        "<html><body>"
+        + filler_html(filler_kb)
+        + "".join(tables)
+        + "</body></html>"
+    )
@@ -0,0 +1,59 @@
+# results_pars/services/team_index.py
+"""
+Индекс команд по нормализованному названию (services.team_names) и алиасам (TeamAlias).
+Строится один раз на прогон (два запроса), дальше имена со страниц FFCV разрешаются без запросов.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Dict, Iterable, Optional, Set
+
+from results_pars.models import Team, TeamAlias
+
+from .team_names import normalize_team_name
+
+
+class TeamIndex:
+    """
+    ключ названия -> Team. Алиас важнее совпадения по имени; при нескольких командах с одним
+    ключом (дубли до merge_duplicate_teams) — целевая, затем с настоящим ffcv id, затем меньший pk.
+    Потокобезопасен: один индекс на все целевые команды прогона.
+    """
+
+    def __init__(self, teams: Iterable[Team] = (), aliases: Iterable[TeamAlias] = ()):
+        self._by_key: Dict[str, Team] = {}
+        self._aliased: Set[str] = set()
+        self.lock = threading.RLock()
+        for team in sorted(teams, key=self.preference):
+            self._by_key.setdefault(normalize_team_name(team.name), team)
+        for alias in aliases:
+            self._by_key[alias.normalized] = alias.team
+            self._aliased.add(alias.normalized)
+
+    @classmethod
+    def load(cls) -> "TeamIndex":
+        return cls(
+            Team.objects.only("id", "name", "ffcv_team_id", "is_target"),
+            TeamAlias.objects.select_related("team"),
+        )
+
+    @staticmethod
+    def preference(team: Team) -> tuple:
+        return (not team.is_target, team.ffcv_team_id.startswith("auto:"), team.pk or 0)
+
+    def get(self, name: str) -> Optional[Team]:
+        with self.lock:
+            return self._by_key.get(normalize_team_name(name))
+
+    def add(self, team: Team) -> None:
+        """Новая или переименованная команда; алиасы и уже занятые ключи не перетираются."""
+        key = normalize_team_name(team.name)
+        with self.lock:
+            current = self._by_key.get(key)
+            if current is None or (key not in self._aliased and self.preference(team) < self.preference(current)):
+                self._by_key[key] = team
+
+    def keys_for(self, team: Team) -> Set[str]:
+        """Все ключи, под которыми команда есть в индексе (имя + алиасы)."""
+        with self.lock:
+            return {key for key, t in self._by_key.items() if t.pk == team.pk} | {normalize_team_name(team.name)}
@@ -0,0 +1,22 @@
+# results_pars/services/team_names.py
+"""Нормализация названий команд FFCV: одна команда в разных написаниях -> один ключ."""
+from __future__ import annotations
+
+import re
+import unicodedata
+
+# 'A' в конце — основной состав: "CD X 'A'" и "CD X" — одна команда ('B', 'C' — другие)
+_DEFAULT_SQUAD_RE = re.compile(r"""\s*["'`´‘’]\s*a\s*["'`´‘’]\s*$""")
+_NON_WORD_RE = re.compile(r"[^\w]+")
+
+
+def normalize_team_name(name: str) -> str:
+    """
+    Ключ названия: без регистра и диакритики, точки аббревиатур склеиваются ("C.D." -> "cd"),
+    прочая пунктуация и кавычки — пробел, суффикс основного состава 'A' отбрасывается.
+    """
+    text = unicodedata.normalize("NFKD", name or "")
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    text = _DEFAULT_SQUAD_RE.sub("", text)
+    text = text.replace(".", "")
+    return _NON_WORD_RE.sub(" ", text).strip()
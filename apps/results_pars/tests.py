@@ -0,0 +1,198 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from math import ceil
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from .models import (
+    CompetitionContext, Match, MatchChange, StandingsRow, StandingsSnapshot, TargetConfig, TargetTeam, Team,
+)
+from .services.ffcv_html import backend_names, get_backend
+from .services.ffcv_parser import FFCVParser, ParsedMatch
+from .services.match_writer import MatchWriter
+from .services.replay import Corpus, ReplayHttpClient, corpus_dirs, parse_snapshot
+from .services.synthetic_pages import team_matches_html
+
+
+def synthetic_matches(n: int, team_name: str = "AT Gilet") -> list:
+    start = timezone.make_aware(datetime(2025, 9, 6, 12, 0))
+    return [
+        ParsedMatch(
+            external_key=f"bench:{i}",
+            source_url=f"https://www.ffcv.es/partido_estadisticas.php?id_partido={i}",
+            competition_name="FFCV (bench)",
+            season_name=None,
+            round_number=i % 30 + 1,
+            kickoff_at=start + timedelta(days=7 * (i % 30)),
+            home_name=team_name if i % 2 else f"Rival {i}",
+            away_name=f"Rival {i}" if i % 2 else team_name,
+            home_score=i % 4,
+            away_score=i % 3,
+            status="PLAYED",
+            result_note=None,
+            venue_name=f"Camp {i % 50}",
+        )
+        for i in range(n)
+    ]
+
+
+def extra_batches(n: int, fields) -> int:
+    """
+    Сколько лишних запросов даст bulk-операция на n строк: Django режет её по лимиту параметров
+    бэкенда (SQLite — 999 на запрос). На MySQL лимита нет — 0.
+    """
+    return ceil(n / max(connection.ops.bulk_batch_size(fields, [None] * n), 1)) - 1
+
+
+def insert_fields(model):
+    return [f for f in model._meta.concrete_fields if not f.primary_key]
+
+
+def in_bulk_extra(n: int) -> int:
+    limit = connection.features.max_query_params
+    return ceil(n / limit) - 1 if limit else 0
+
+
+class MatchWriterQueryBudgetTests(TestCase):
+    """
+    Бюджет запросов MatchWriter.write(): INSERT_QUERIES / UPDATE_QUERIES на вызов, независимо от числа матчей.
+    Единственная добавка — нарезка bulk-операций по лимиту параметров бэкенда (extra_batches):
+    на MySQL она нулевая, на SQLite — по запросу на каждые ~70 матчей.
+    """
+
+    # справочники: SELECT + INSERT + повторный SELECT на соревнования, туры, команды, поля (12),
+    # матчи: in_bulk, bulk_create, перечитать pk, журнал MatchChange (4)
+    INSERT_QUERIES = 16
+    # справочники уже есть: SELECT соревнований, туров, полей (команды — из TeamIndex),
+    # in_bulk, bulk_update, журнал MatchChange
+    UPDATE_QUERIES = 6
+    # ничего не изменилось: только чтение
+    UNCHANGED_QUERIES = 4
+
+    def setUp(self):
+        self.target = Team.objects.create(ffcv_team_id="bench:target", name="AT Gilet", is_target=True)
+
+    @contextmanager
+    def assertMaxNumQueries(self, num):
+        with CaptureQueriesContext(connection) as ctx:
+            yield ctx
+        self.assertLessEqual(
+            len(ctx), num, f"{len(ctx)} queries executed, at most {num} expected ({connection.vendor})"
+        )
+
+    def insert_budget(self, n: int) -> int:
+        return (
+            self.INSERT_QUERIES
+            + in_bulk_extra(n)
+            + extra_batches(n, insert_fields(Team))
+            + extra_batches(n, insert_fields(Match))
+            + extra_batches(n, insert_fields(MatchChange))
+        )
+
+    def update_budget(self, n: int) -> int:
+        return (
+            self.UPDATE_QUERIES
+            + in_bulk_extra(n)
+            + extra_batches(n, ["pk", "pk", *MatchWriter.MATCH_FIELDS])
+            + extra_batches(n, insert_fields(MatchChange))
+        )
+
+    def write_twice(self, n: int):
+        writer = MatchWriter(target_team=self.target, target_team_name="AT Gilet")
+        parsed = synthetic_matches(n)
+        with self.assertMaxNumQueries(self.insert_budget(n)):
+            self.assertEqual(writer.write(parsed), (n, 0))
+        for pm in parsed:
+            pm.home_score += 1
+        with self.assertMaxNumQueries(self.update_budget(n)):
+            self.assertEqual(writer.write(parsed), (0, n))
+        with self.assertNumQueries(self.UNCHANGED_QUERIES + in_bulk_extra(n)):
+            self.assertEqual(writer.write(parsed), (0, 0))
+
+    def test_budget_at_10_matches(self):
+        # 10 строк ни один бэкенд не режет — бюджет точный
+        writer = MatchWriter(target_team=self.target, target_team_name="AT Gilet")
+        parsed = synthetic_matches(10)
+        with self.assertNumQueries(self.INSERT_QUERIES):
+            writer.write(parsed)
+        for pm in parsed:
+            pm.home_score += 1
+        with self.assertNumQueries(self.UPDATE_QUERIES):
+            writer.write(parsed)
+
+    def test_batched_run_budget(self):
+        # parse_ffcv_results: пачки по --batch-size, каждая — свой write(); бюджет прогона растёт с числом пачек
+        n, batch_size = 100, 25
+        parsed = synthetic_matches(n)
+        writer = MatchWriter(target_team=self.target, target_team_name="AT Gilet")
+        with CaptureQueriesContext(connection) as ctx:
+            for start in range(0, n, batch_size):
+                writer.write(parsed[start:start + batch_size])
+        self.assertLessEqual(len(ctx), ceil(n / batch_size) * self.insert_budget(batch_size))
+        # --batch-size 0: весь прогон одним write() — бюджет одного вызова
+        with self.assertNumQueries(self.UNCHANGED_QUERIES):
+            writer.write(parsed)
+
+    def test_budget_at_1000_matches(self):
+        self.write_twice(1000)
+        self.assertEqual(Match.objects.count(), 1000)
+        self.assertEqual(MatchChange.objects.count(), 2000)
+
+
+class HtmlBackendTests(TestCase):
+    def test_backends_agree_on_team_rows(self):
+        html = team_matches_html("AT Gilet", 12)
+        # вложенная таблица внутри строки и чужая таблица перед нужной не должны сбивать вырезку фрагмента
+        html = html.replace("<body>", "<body><table class='sobrestante-menu'><tr><td>x</td></tr></table>", 1)
+        html = html.replace("</td>", "<table><tr><td></td></tr></table></td>", 1)
+        rows = {name: list(get_backend(name).team_rows(html)) for name in backend_names()}
+        self.assertEqual(len(rows["lxml"]), 12)
+        for name, backend_rows in rows.items():
+            self.assertEqual(backend_rows, rows["lxml"], name)
+
+
+class CorpusReplayTests(TestCase):
+    """Разбор каждого сохранённого корпуса (results_pars/corpus/**) офлайн — тот же, что в expected.json."""
+
+    def test_parse_output_matches_expected(self):
+        dirs = list(corpus_dirs())
+        self.assertTrue(dirs)
+        for root in dirs:
+            corpus = Corpus(root)
+            for backend in backend_names():
+                with self.subTest(corpus=root.name, backend=backend):
+                    parser = FFCVParser(
+                        **corpus.target, max_workers=1, rate_limit=0,
+                        http=ReplayHttpClient(corpus), html_backend=backend,
+                    )
+                    self.assertEqual(parse_snapshot(parser), corpus.expected())
+
+
+class MainTeamStandingsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.config = TargetConfig.objects.create(target_ffcv_team_id="1")
+        TargetTeam.objects.create(config=cls.config, name="AT Gilet", ffcv_team_id="1")
+        TargetTeam.objects.create(config=cls.config, name="AT Gilet B", ffcv_team_id="2")
+        cls.snapshots = {}
+        # таблица второй команды записана последней — на главной её быть не должно
+        for team_id in ("1", "2"):
+            team = Team.objects.create(ffcv_team_id=team_id, name=f"team {team_id}", is_target=True)
+            snapshot = StandingsSnapshot.objects.create(
+                competition=CompetitionContext.objects.create(name=f"league {team_id}"),
+                source_url=f"https://www.ffcv.es/clasificacion.php?id_equipo={team_id}",
+            )
+            StandingsRow.objects.create(snapshot=snapshot, team=team, position=1)
+            cls.snapshots[team_id] = snapshot
+
+    def test_snapshot_of_main_team_in_one_query(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(StandingsSnapshot.current_for_main_team(), self.snapshots["1"])
+
+    def test_falls_back_to_first_target_team(self):
+        TargetConfig.objects.update(target_ffcv_team_id=None)
+        TargetTeam.objects.filter(ffcv_team_id="1").update(is_active=False)
+        self.assertEqual(StandingsSnapshot.current_for_main_team(), self.snapshots["2"])
@@ -1,7 +1,14 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from .models import SettingsConfig, Menu, MenuItem
 
 
+def warn_broken_named_urls(request, items):
+    """Битый named_url на сайте молча превращается в '#' (или url) — предупреждаем при сохранении."""
+    for item in items:
+        if item.named_url_error:
+            messages.warning(request, f"{item}: {item.named_url_error}")
+
+
 @admin.register(SettingsConfig)
 class SettingsConfigAdmin(admin.ModelAdmin):
     list_display = ("maintenance_mode",)
@@ -40,10 +47,22 @@ class MenuAdmin(admin.ModelAdmin):
     list_filter = ("location", "is_active")
     inlines = [MenuItemInline]
 
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        warn_broken_named_urls(request, form.instance.items.all())
+
 
 @admin.register(MenuItem)
 class MenuItemAdmin(admin.ModelAdmin):
-    list_display = ("title_es", "menu", "parent", "order", "is_active")
+    list_display = ("title_es", "menu", "parent", "order", "is_active", "url_check")
     list_filter = ("menu", "is_active")
     search_fields = ("title_es", "title_val", "title_en", "url", "named_url")
     ordering = ("menu", "order")
+
+    @admin.display(description="URL")
+    def url_check(self, obj):
+        return f"⚠ {obj.named_url_error}" if obj.named_url_error else obj.get_url()
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        warn_broken_named_urls(request, [obj])
@@ -1,23 +1,32 @@
-from .models import Menu
+from django.utils.functional import SimpleLazyObject
 from django.utils.translation import get_language
 
+from .menus import MENU_LOCATIONS, cached_menus
+
+
+def lazy_context_value(request, name, load):
+    """
+    Значение контекста, которое считается при первом чтении в шаблоне.
+    Прочитанные имена копятся в request.context_evaluated (см. ContextUsageMiddleware).
+    """
+    def evaluate():
+        evaluated = request.__dict__.setdefault("context_evaluated", [])
+        if name not in evaluated:
+            evaluated.append(name)
+        return load()
+
+    return SimpleLazyObject(evaluate)
+
 
 def header_footer_menus(request):
-    locations = [
-        Menu.HEADER_MAIN_LEFT,
-        Menu.HEADER_MAIN_RIGHT,
-        Menu.HEADER_TOP_AUTH,
-        Menu.HEADER_TOP_SOCIAL,
-        Menu.MOBILE_MAIN_LEFT,
-        Menu.MOBILE_MAIN_RIGHT,
-        Menu.FOOTER_TAGS,
-        Menu.FOOTER_BOTTOM,
-    ]
-    menus = (
-        Menu.objects.filter(location__in=locations, is_active=True)
-        .prefetch_related("items__children")
-    )
+    # menu_<location> ленивые: кеш/БД трогаются, только если шаблон выводит меню
+    # (админка, AJAX-фрагменты и страницы без хедера за меню не платят)
+    lang = (get_language() or "es").lower()
+    menus = SimpleLazyObject(lambda: cached_menus(lang))
 
-    ctx = {f"menu_{m.location}": m for m in menus}
-    ctx["request_lang"] = (get_language() or "es").lower()
-    return ctx
\ No newline at end of file
+    ctx = {}
+    for location in MENU_LOCATIONS:
+        name = f"menu_{location}"
+        ctx[name] = lazy_context_value(request, name, lambda location=location: menus.get(location))
+    ctx["request_lang"] = lang
+    return ctx
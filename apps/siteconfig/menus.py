@@ -0,0 +1,148 @@
+"""
+Загрузка меню для шаблонов: активные меню нужных зон и их активные пункты — двумя запросами,
+деревья из MenuNode (заголовок и URL уже посчитаны) собираются в Python.
+Шаблон получает готовые списки и ORM не трогает.
+
+Готовые деревья кешируются по языку: в памяти процесса и в общем кеше (settings.CACHES).
+Ключ содержит версию; сигналы Menu/MenuItem меняют версию — все воркеры видят правку
+со следующего запроса, без перезапуска.
+"""
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import get_language
+
+from .models import Menu, MenuItem
+
+MENU_LOCATIONS = [code for code, _ in Menu.LOCATION_CHOICES]
+MENU_LANGUAGES = [code for code, _ in settings.LANGUAGES]
+
+MENU_VERSION_KEY = "siteconfig:menus:version"
+MENU_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+# язык -> (версия, деревья); живёт до перезапуска процесса
+_local_menus: dict = {}
+
+
+@dataclass
+class MenuNode:
+    """Пункт меню для шаблона: заголовок на одном языке и уже разрешённый URL."""
+
+    title: str
+    url: str
+    icon_class: str = ""
+    css_class: str = ""
+    html_attributes: str = ""
+    open_in_new_tab: bool = False
+    children: list = field(default_factory=list)
+
+
+@dataclass
+class MenuTree:
+    """Меню одной зоны: root_items — корневые пункты по order, у каждого — активные children."""
+
+    name: str
+    location: str
+    root_items: list = field(default_factory=list)
+
+
+def _order_key(item: MenuItem):
+    return item.order, item.pk
+
+
+def menu_language(lang: str | None) -> str:
+    """Код языка из LANGUAGES для lang ("es-es" -> "es"); неизвестный — LANGUAGE_CODE."""
+    lang = (lang or "").lower()
+    if lang in MENU_LANGUAGES:
+        return lang
+    for code in MENU_LANGUAGES:
+        if lang.startswith(code):
+            return code
+    return settings.LANGUAGE_CODE
+
+
+def build_menus(locations=MENU_LOCATIONS, languages=MENU_LANGUAGES) -> dict[str, dict[str, MenuTree]]:
+    """
+    язык -> location -> MenuTree. Два запроса (меню и пункты) на все языки:
+    reverse() для named_url и заголовки считаются здесь, а не при каждом рендере.
+    Неактивный пункт прячет и свою ветку. Активное меню без активных пунктов даёт пустой MenuTree,
+    как и раньше Menu без пунктов: шаблон не переходит на запасную разметку {% else %}.
+    """
+    menus_by_pk = {
+        menu.pk: menu
+        for menu in Menu.objects.filter(location__in=locations, is_active=True).order_by("pk")
+    }
+    items = list(MenuItem.objects.filter(menu_id__in=list(menus_by_pk), is_active=True))
+
+    by_parent = defaultdict(list)
+    for item in items:
+        by_parent[item.parent_id].append(item)
+    urls = {item.pk: item.get_url() for item in items}
+
+    def node(item: MenuItem, lang: str) -> MenuNode:
+        return MenuNode(
+            title=item.get_title(lang),
+            url=urls[item.pk],
+            icon_class=item.icon_class,
+            css_class=item.css_class,
+            html_attributes=item.html_attributes,
+            open_in_new_tab=item.open_in_new_tab,
+            children=[node(child, lang) for child in sorted(by_parent.get(item.pk, ()), key=_order_key)],
+        )
+
+    roots = sorted(by_parent.get(None, ()), key=_order_key)
+    result = {}
+    for lang in languages:
+        # несколько активных меню в одной зоне — одно дерево с именем первого
+        menus = result[lang] = {}
+        for menu in menus_by_pk.values():
+            menus.setdefault(menu.location, MenuTree(name=menu.name, location=menu.location))
+        for item in roots:
+            menus[menus_by_pk[item.menu_id].location].root_items.append(node(item, lang))
+    return result
+
+
+def load_menus(lang: str | None = None, locations=MENU_LOCATIONS) -> dict[str, MenuTree]:
+    """location -> MenuTree на одном языке (по умолчанию — текущем), без кеша."""
+    lang = menu_language(lang or get_language())
+    return build_menus(locations, [lang])[lang]
+
+
+def menu_version() -> str:
+    version = cache.get(MENU_VERSION_KEY)
+    if version is None:
+        cache.add(MENU_VERSION_KEY, str(time.time_ns()), None)
+        version = cache.get(MENU_VERSION_KEY)
+    return version
+
+
+def bump_menu_version(**kwargs) -> None:
+    """Сбросить кеш меню во всех процессах (обработчик post_save/post_delete)."""
+    # новое значение, а не incr: файловый кеш не умеет атомарный incr
+    cache.set(MENU_VERSION_KEY, str(time.time_ns()), None)
+
+
+def cached_menus(lang: str | None = None) -> dict[str, MenuTree]:
+    """
+    load_menus() через кеш. Тёплый кеш — ни одного запроса к БД:
+    версия из общего кеша, деревья из памяти процесса (или из общего кеша после правки в другом воркере).
+    """
+    lang = menu_language(lang or get_language())
+    version = menu_version()
+
+    local = _local_menus.get(lang)
+    if local is not None and local[0] == version:
+        return local[1]
+
+    key = f"siteconfig:menus:{version}:{lang}"
+    menus = cache.get(key)
+    if menus is None:
+        # промах — собираем сразу все языки теми же двумя запросами
+        built = build_menus()
+        cache.set_many({f"siteconfig:menus:{version}:{code}": trees for code, trees in built.items()}, MENU_CACHE_TIMEOUT)
+        menus = built[lang]
+    _local_menus[lang] = (version, menus)
+    return menus
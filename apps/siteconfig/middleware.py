@@ -1,6 +1,13 @@
+from functools import cache
+
 from django.conf import settings
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.urls import reverse
 from django.utils import translation
 
+from .models import SettingsConfig
+
 SUPPORTED = {code for code, _ in settings.LANGUAGES}
 DEFAULT = settings.LANGUAGE_CODE
 
@@ -21,3 +28,70 @@ class ForceDefaultLanguageMiddleware:
             request.LANGUAGE_CODE = DEFAULT
 
         return self.get_response(request)
+
+
+@cache
+def maintenance_page() -> bytes:
+    # шаблон без контекста (только static) — рендерим один раз на процесс
+    return render_to_string("maintenance/index.html").encode()
+
+
+@cache
+def maintenance_exempt_prefixes() -> tuple:
+    return tuple(p for p in (reverse("admin:index"), settings.STATIC_URL, settings.MEDIA_URL) if p)
+
+
+class MaintenanceModeMiddleware:
+    """
+    Режим "сайт в разработке" (SettingsConfig.maintenance_mode) для всех, кроме staff:
+    503 с Retry-After, чтобы поисковики не индексировали заглушку вместо сайта.
+    Ставится первым: запрос без cookie сессии не может быть от админа — сразу отдаём
+    заранее отрендеренную страницу, без сессий, auth, контекст-процессоров и запросов к БД
+    (флаг режима — из кеша). С cookie решаем в process_view, когда request.user уже есть,
+    и ещё раз по готовому ответу: для URL, который не разрешился (404), process_view не вызывается.
+    Админка и статика не закрываются.
+    """
+
+    RETRY_AFTER = 60 * 60
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not self.applies(request):
+            return self.get_response(request)
+        if settings.SESSION_COOKIE_NAME not in request.COOKIES:
+            return self.page()
+        response = self.get_response(request)
+        if not request.user.is_staff:
+            return self.page()
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if self.applies(request) and not request.user.is_staff:
+            return self.page()
+        return None
+
+    @staticmethod
+    def applies(request) -> bool:
+        return not request.path.startswith(maintenance_exempt_prefixes()) and SettingsConfig.maintenance_enabled()
+
+    @classmethod
+    def page(cls) -> HttpResponse:
+        return HttpResponse(maintenance_page(), status=503, headers={"Retry-After": str(cls.RETRY_AFTER)})
+
+
+class ContextUsageMiddleware:
+    """
+    При DEBUG добавляет заголовок X-Context-Evaluated: какие ленивые значения контекста
+    (menu_<location> и т.п.) шаблоны этого запроса реально прочитали.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if settings.DEBUG:
+            response["X-Context-Evaluated"] = ", ".join(getattr(request, "context_evaluated", ())) or "-"
+        return response
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.9 on 2026-10-18 15:55
+
+from django.db import migrations, models
+
+
+def keep_site_open(apps, schema_editor):
+    # до MaintenanceModeMiddleware флаг ни на что не влиял (front_router недостижим): сайт был открыт,
+    # поэтому включённый по умолчанию флаг у существующей записи выключаем
+    SettingsConfig = apps.get_model("siteconfig", "SettingsConfig")
+    SettingsConfig.objects.update(maintenance_mode=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('siteconfig', '0004_alter_menuitem_title_es'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='settingsconfig',
+            name='maintenance_mode',
+            field=models.BooleanField(default=False, help_text="Если включено, всем пользователям показывается страница 'сайт в разработке', кроме администраторов.", verbose_name='Сайт в разработке'),
+        ),
+        migrations.RunPython(keep_site_open, migrations.RunPython.noop),
+    ]
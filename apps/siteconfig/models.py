@@ -1,4 +1,6 @@
+from django.core.cache import cache
 from django.db import models
+from django.urls import NoReverseMatch, reverse
 from django.utils.translation import gettext_lazy as _
 from django.utils.translation import get_language
 
@@ -6,13 +8,17 @@ from django.utils.translation import get_language
 class SettingsConfig(models.Model):
     maintenance_mode = models.BooleanField(
         "Сайт в разработке",
-        default=True,
+        default=False,
         help_text=(
             "Если включено, всем пользователям показывается страница "
             "'сайт в разработке', кроме администраторов."
         ),
     )
 
+    CACHE_KEY = "siteconfig:settings"
+    # сигналы сбрасывают кеш при правке через ORM; таймаут — на случай правки мимо них (update(), SQL)
+    CACHE_TIMEOUT = 60 * 5
+
     def __str__(self):
         return "Настройки сайта"
 
@@ -20,6 +26,29 @@ class SettingsConfig(models.Model):
         verbose_name = "настройки сайта"
         verbose_name_plural = "настройки сайта"
 
+    @classmethod
+    def load(cls) -> "SettingsConfig | None":
+        """
+        Единственная запись настроек через общий кеш (в БД — только после правки).
+        None — записи нет. Кеш сбрасывают сигналы post_save/post_delete, иначе он живёт CACHE_TIMEOUT.
+        """
+        cached = cache.get(cls.CACHE_KEY)
+        if cached is None:
+            # "нет записи" тоже кешируем, иначе каждый запрос шёл бы в БД
+            cached = cls.objects.first() or False
+            cache.set(cls.CACHE_KEY, cached, cls.CACHE_TIMEOUT)
+        return cached or None
+
+    @classmethod
+    def maintenance_enabled(cls) -> bool:
+        # если настроек нет — сайт открыт, режим включают только явно
+        config = cls.load()
+        return config.maintenance_mode if config else False
+
+    @classmethod
+    def clear_cache(cls, **kwargs) -> None:
+        cache.delete(cls.CACHE_KEY)
+
 
 class Menu(models.Model):
     """Набор пунктов меню для определённой зоны (хедер, футер и т.п.)."""
@@ -161,16 +190,24 @@ class MenuItem(models.Model):
         """Удобно для шаблонов: {{ item.title }}"""
         return self.get_title()
 
+    def resolve_named_url(self) -> str | None:
+        """reverse(named_url); None — имя не задано или не разрешается."""
+        if not self.named_url:
+            return None
+        try:
+            return reverse(self.named_url)
+        except NoReverseMatch:
+            return None
+
     def get_url(self) -> str:
-        from django.urls import reverse, NoReverseMatch
-
-        if self.named_url:
-            try:
-                return reverse(self.named_url)
-            except NoReverseMatch:
-                # оставляем fallback, чтобы не падало в шаблонах
-                pass
-        return self.url or "#"
+        # битый named_url не роняет шаблон (fallback), но подсвечивается в админке
+        return self.resolve_named_url() or self.url or "#"
+
+    @property
+    def named_url_error(self) -> str:
+        if self.named_url and self.resolve_named_url() is None:
+            return f"named_url '{self.named_url}' не разрешается через reverse(), используется '{self.url or '#'}'"
+        return ""
 
     @property
     def has_children(self) -> bool:
@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete, post_save
+
+from .menus import bump_menu_version
+from .models import Menu, MenuItem, SettingsConfig
+
+
+def connect_signals():
+    for model in (Menu, MenuItem):
+        post_save.connect(bump_menu_version, sender=model, dispatch_uid=f"menus-{model.__name__}-save")
+        post_delete.connect(bump_menu_version, sender=model, dispatch_uid=f"menus-{model.__name__}-delete")
+
+    post_save.connect(SettingsConfig.clear_cache, sender=SettingsConfig, dispatch_uid="settings-save")
+    post_delete.connect(SettingsConfig.clear_cache, sender=SettingsConfig, dispatch_uid="settings-delete")
@@ -1,3 +1,167 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 
-# Create your tests here.
+from . import menus as menus_module
+from .menus import cached_menus, load_menus
+from .middleware import MaintenanceModeMiddleware
+from .models import Menu, MenuItem, SettingsConfig
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class MenuLoaderTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        SettingsConfig.objects.create(maintenance_mode=False)
+        # несколько зон с вложенными пунктами: число запросов не должно от них зависеть
+        for location in (Menu.HEADER_MAIN_LEFT, Menu.MOBILE_MAIN_LEFT, Menu.FOOTER_BOTTOM):
+            menu = Menu.objects.create(name=location, location=location)
+            for i in range(3):
+                parent = MenuItem.objects.create(menu=menu, title_es=f"{location} {i}", url=f"/{i}/", order=3 - i)
+                for j in range(2):
+                    MenuItem.objects.create(
+                        menu=menu, parent=parent, title_es=f"{location} {i}.{j}", url=f"/{i}/{j}/", order=j
+                    )
+                MenuItem.objects.create(menu=menu, parent=parent, title_es="inactive child", is_active=False)
+        MenuItem.objects.create(menu=menu, title_es="inactive root", is_active=False)
+        Menu.objects.create(name="off", location=Menu.FOOTER_TAGS, is_active=False)
+        Menu.objects.create(name="empty", location=Menu.HEADER_MAIN_RIGHT)
+
+    def setUp(self):
+        cache.clear()
+        menus_module._local_menus.clear()
+
+    def test_two_queries_sorted_active_trees(self):
+        with self.assertNumQueries(2):
+            menus = load_menus()
+            # дальше — только Python, без ленивых запросов
+            tree = menus[Menu.HEADER_MAIN_LEFT]
+            titles = [(item.title, [c.title for c in item.children]) for item in tree.root_items]
+            urls = [item.url for item in tree.root_items]
+
+        self.assertEqual(
+            set(menus), {Menu.HEADER_MAIN_LEFT, Menu.HEADER_MAIN_RIGHT, Menu.MOBILE_MAIN_LEFT, Menu.FOOTER_BOTTOM}
+        )
+        # активное меню без пунктов — пустое дерево, а не None
+        self.assertEqual(menus[Menu.HEADER_MAIN_RIGHT].root_items, [])
+        self.assertEqual([t for t, _ in titles], [f"header_main_left {i}" for i in (2, 1, 0)])
+        self.assertEqual(titles[0][1], ["header_main_left 2.0", "header_main_left 2.1"])
+        self.assertEqual(urls, ["/2/", "/1/", "/0/"])
+
+    def test_home_page_query_count(self):
+        # настройки + HomePage + снимок таблицы + меню и пункты всех зон (кеш холодный)
+        with self.assertNumQueries(5):
+            response = self.client.get("/")
+        self.assertEqual(response.status_code, 200)
+        # тёплый кеш: меню и настройки не трогают БД
+        with self.assertNumQueries(2):
+            response = self.client.get("/")
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "header_main_left 2.1")
+        self.assertContains(response, "footer_bottom 0")
+        self.assertNotContains(response, "inactive")
+
+    def test_cache_is_per_language_and_dropped_on_edit(self):
+        with self.assertNumQueries(2):
+            cached_menus("es")
+        with self.assertNumQueries(0):
+            cached_menus("es")
+        # другой воркер: памяти процесса нет, деревья из общего кеша
+        menus_module._local_menus.clear()
+        with self.assertNumQueries(0):
+            cached_menus("es")
+        # промах собрал сразу все языки
+        with self.assertNumQueries(0):
+            cached_menus("en")
+
+        item = MenuItem.objects.get(title_es="header_main_left 0")
+        item.title_es = "renamed"
+        item.save()
+        with self.assertNumQueries(2):
+            tree = cached_menus("es")[Menu.HEADER_MAIN_LEFT]
+        self.assertEqual(tree.root_items[-1].title, "renamed")
+
+        Menu.objects.get(location=Menu.FOOTER_BOTTOM).delete()
+        self.assertNotIn(Menu.FOOTER_BOTTOM, cached_menus("es"))
+
+    def test_titles_and_urls_resolved_per_language(self):
+        menu = Menu.objects.create(name="top", location=Menu.HEADER_TOP_AUTH)
+        MenuItem.objects.create(menu=menu, title_es="Inicio", title_en="Home", named_url="web:home", order=0)
+        broken = MenuItem.objects.create(menu=menu, title_es="Roto", named_url="web:nope", url="/fallback/", order=1)
+
+        with self.assertNumQueries(2):
+            by_lang = {lang: cached_menus(lang)[Menu.HEADER_TOP_AUTH] for lang in ("es", "val", "en")}
+        self.assertEqual([n.title for n in by_lang["es"].root_items], ["Inicio", "Roto"])
+        self.assertEqual([n.title for n in by_lang["val"].root_items], ["Inicio", "Roto"])
+        self.assertEqual([n.title for n in by_lang["en"].root_items], ["Home", "Roto"])
+        self.assertEqual([n.url for n in by_lang["en"].root_items], ["/", "/fallback/"])
+        self.assertIn("web:nope", broken.named_url_error)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class MaintenanceModeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.config = SettingsConfig.objects.create(maintenance_mode=True)
+        cls.staff = User.objects.create_user("staff", password="x", is_staff=True)
+        cls.user = User.objects.create_user("user", password="x")
+
+    def setUp(self):
+        cache.clear()
+        menus_module._local_menus.clear()
+
+    def test_anonymous_gets_prerendered_page_without_queries(self):
+        self.client.get("/")  # прогрев кеша настроек
+        for path in ("/", "/news/", "/no-such-page/"):
+            with self.assertNumQueries(0):
+                response = self.client.get(path)
+            self.assertContains(response, "Sitio en desarrollo", status_code=503)
+            self.assertEqual(response["Retry-After"], str(MaintenanceModeMiddleware.RETRY_AFTER))
+
+    def test_staff_sees_site_and_users_do_not(self):
+        self.client.force_login(self.user)
+        for path in ("/", "/no-such-page/"):
+            # 404 тоже закрыт: для неразрешённого URL process_view не вызывается
+            self.assertContains(self.client.get(path), "Sitio en desarrollo", status_code=503)
+        self.client.force_login(self.staff)
+        self.assertNotContains(self.client.get("/"), "Sitio en desarrollo")
+        self.assertEqual(self.client.get("/no-such-page/").status_code, 404)
+        self.assertEqual(self.client.get("/admin/").status_code, 200)
+
+    def test_settings_cache_dropped_on_save(self):
+        self.assertEqual(self.client.get("/").status_code, 503)
+        self.config.maintenance_mode = False
+        self.config.save()
+        self.assertNotContains(self.client.get("/"), "Sitio en desarrollo")
+        # без записи настроек сайт открыт
+        self.config.delete()
+        self.assertFalse(SettingsConfig.maintenance_enabled())
+        self.assertEqual(SettingsConfig().maintenance_mode, False)
+
+
+@override_settings(CACHES=LOCMEM_CACHE, DEBUG=True)
+class LazyMenuContextTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        SettingsConfig.objects.create(maintenance_mode=False)
+        menu = Menu.objects.create(name="main", location=Menu.HEADER_MAIN_LEFT)
+        MenuItem.objects.create(menu=menu, title_es="Inicio", url="/")
+        cls.staff = User.objects.create_user("staff", password="x", is_staff=True, is_superuser=True)
+
+    def setUp(self):
+        cache.clear()
+        menus_module._local_menus.clear()
+
+    def test_menus_load_only_when_template_reads_them(self):
+        self.client.force_login(self.staff)
+        # админка меню не выводит: ни кеша, ни запроса к Menu/MenuItem
+        response = self.client.get("/admin/")
+        self.assertEqual(response["X-Context-Evaluated"], "-")
+        self.assertIsNone(cache.get(menus_module.MENU_VERSION_KEY))
+
+        response = self.client.get("/")
+        self.assertContains(response, "Inicio")
+        self.assertIn("menu_header_main_left", response["X-Context-Evaluated"].split(", "))
+        self.assertIn("menu_footer_bottom", response["X-Context-Evaluated"].split(", "))
@@ -1,4 +1,5 @@
 from django.shortcuts import render
+from results_pars.models import StandingsSnapshot
 from .models import HomePage
 
 
@@ -15,10 +16,17 @@ def home(request):
         slides = [s for s in home_cfg.slides.all() if s.is_active]
         stats = list(home_cfg.stats.all())
 
+    # блок "таблица": актуальная классификация главной команды (пишет parse_ffcv_results)
+    standings_rows = []
+    snapshot = StandingsSnapshot.current_for_main_team()
+    if snapshot:
+        standings_rows = list(snapshot.rows.select_related("team").order_by("position"))
+
     return render(request, "web/index.html", {
         "home_cfg": home_cfg,
         "slides": slides,
         "stats": stats,
+        "standings_rows": standings_rows,
     })
     
 def history(request):